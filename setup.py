@@ -22,5 +22,6 @@ setuptools.setup(
         'Operating System :: OS Independent',
     ],
     python_requires='>=3.5',
-    install_requires=['aiohttp==3.6.*', 'ujson==3.0.*']
+    install_requires=['aiohttp==3.6.*', 'ujson==3.0.*'],
+    extras_require={'brotli': ['brotli']}
 )
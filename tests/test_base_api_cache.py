@@ -1,9 +1,16 @@
 # -*- coding: utf-8 -*-
 """Base cache test cases."""
+import asyncio
+import copy
+import time
+from uuid import uuid4
 
 import pytest
 
-from veil_api_client import VeilCacheAbstractClient, VeilCacheConfiguration
+from veil_api_client import (VeilCacheAbstractClient, VeilCacheConfiguration,
+                             VeilCacheMemoryClient)
+from veil_api_client.api_objects import VeilDomainExt
+from veil_api_client.base import VeilApiResponse
 
 pytestmark = [pytest.mark.base]
 
@@ -108,3 +115,139 @@ class TestVeilCacheConfiguration:
             assert True
         else:
             raise AssertionError()
+
+
+class TestVeilCacheMemoryClient:
+    """VeilCacheMemoryClient test cases."""
+
+    @pytest.mark.asyncio
+    async def test_get_from_cache(self):
+        """Only successful GET responses are cached."""
+        calls = list()
+
+        async def request_cor(client, method_name, *args, **kwargs):
+            calls.append(method_name)
+            return dict(status_code=200, headers=dict(), data={'count': len(calls)})
+
+        cache = VeilCacheConfiguration(cache_client=VeilCacheMemoryClient(), ttl=60)
+        for _ in range(3):
+            result = await cache.get_from_cache(request_cor, 'client', 'get', 'url',
+                                                {'Accept': 'json'}, {'async': 1}, True)
+            assert result['data'] == {'count': 1}
+        await cache.get_from_cache(request_cor, 'client', 'post', 'url',
+                                   {'Accept': 'json'}, {'async': 1}, True)
+        await cache.get_from_cache(request_cor, 'client', 'post', 'url',
+                                   {'Accept': 'json'}, {'async': 1}, True)
+        assert calls == ['get', 'post', 'post']
+        stats = cache.cache_client.stats
+        assert stats['hits'] == 2
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+
+    def test_lru_eviction(self):
+        """Least recently used values are evicted first."""
+        cache = VeilCacheMemoryClient(max_entries=2)
+        cache.set('a', {'data': 'a'}, ttl=60)
+        cache.set('b', {'data': 'b'}, ttl=60)
+        assert cache.lookup('a') == ({'data': 'a'}, False)
+        cache.set('c', {'data': 'c'}, ttl=60)
+        assert cache.lookup('b') == (None, False)
+        assert cache.lookup('a') == ({'data': 'a'}, False)
+        assert cache.lookup('c') == ({'data': 'c'}, False)
+        assert cache.stats['evictions'] == 1
+
+    def test_size_limit(self):
+        """Cache size is bounded."""
+        value = {'data': 'x' * 100}
+        cache = VeilCacheMemoryClient(max_size=VeilCacheMemoryClient.value_size(value) * 2)
+        for key in range(5):
+            cache.set(key, value, ttl=60)
+        assert cache.stats['entries'] == 2
+        assert cache.stats['evictions'] == 3
+        cache.set('big', {'data': 'x' * 1000}, ttl=60)
+        assert cache.lookup('big') == (None, False)
+
+    def test_value_size(self):
+        """Size of VeilClient response data is its body length."""
+        value = {'status_code': 200, 'headers': dict(), 'data': {'data': 'x' * 100}}
+        assert VeilCacheMemoryClient.value_size(value) > 100
+        value['body_size'] = 10
+        assert VeilCacheMemoryClient.value_size(value) == 10
+
+    @pytest.mark.asyncio
+    async def test_shared_value(self):
+        """Cached data is shared by responses and isn`t changed by entities."""
+        results = [{'id': str(uuid4()), 'verbose_name': 'domain', 'tags': [{'id': 1}]}]
+
+        async def request_cor(*args, **kwargs):
+            return dict(status_code=200, headers=dict(),
+                        data={'count': 1, 'results': copy.deepcopy(results)})
+
+        cache = VeilCacheConfiguration(cache_client=VeilCacheMemoryClient(), ttl=60)
+        args = ('client', 'get', 'url', dict(), dict(), True)
+        responses = list()
+        for _ in range(2):
+            result = await cache.get_from_cache(request_cor, *args)
+            response = VeilApiResponse(status_code=result['status_code'], data=result['data'],
+                                       headers=result['headers'],
+                                       api_object=VeilDomainExt(client=None))
+            domain = response.response[0]
+            domain.verbose_name = 'changed'
+            responses.append(response)
+        assert responses[0].data is responses[1].data
+        assert responses[1].paginator_results == results
+
+    def test_ttl(self, monkeypatch):
+        """Expired values are not returned."""
+        cache = VeilCacheMemoryClient()
+        cache.set('a', {'data': 'a'}, ttl=1)
+        assert cache.lookup('a') == ({'data': 'a'}, False)
+        monotonic = time.monotonic() + 2
+        monkeypatch.setattr(time, 'monotonic', lambda: monotonic)
+        assert cache.lookup('a') == (None, False)
+        assert cache.stats['entries'] == 0
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self, monkeypatch):
+        """Stale value is returned while a single background task refreshes it."""
+        calls = list()
+        release = asyncio.Event()
+
+        async def request_cor(*args, **kwargs):
+            calls.append(1)
+            if len(calls) > 1:
+                await release.wait()
+            return dict(status_code=200, headers=dict(), data={'count': len(calls)})
+
+        cache = VeilCacheConfiguration(cache_client=VeilCacheMemoryClient(), ttl=1,
+                                       stale_ttl=10)
+        args = ('client', 'get', 'url', dict(), dict(), True)
+        assert (await cache.get_from_cache(request_cor, *args))['data'] == {'count': 1}
+        monotonic = time.monotonic() + 2
+        monkeypatch.setattr(time, 'monotonic', lambda: monotonic)
+        for _ in range(3):
+            assert (await cache.get_from_cache(request_cor, *args))['data'] == {'count': 1}
+        assert cache.cache_client.stats['refreshes'] == 1
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert (await cache.get_from_cache(request_cor, *args))['data'] == {'count': 2}
+        assert len(calls) == 2
+        # max stale bound is exceeded - value is requested synchronously
+        monotonic += 20
+        assert (await cache.get_from_cache(request_cor, *args))['data'] == {'count': 3}
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        """Entity and collection responses are removed."""
+        cache = VeilCacheMemoryClient()
+        base_url = 'https://veil/api/domains/'
+        object_url = base_url + '48ee71d9-20f0-41fc-a99f-c518121a880e/'
+        other_url = base_url + 'eafc39f3-ce6e-4db2-9d4e-1d93babcbe26/'
+        for url in (base_url, object_url, object_url + 'spice/', other_url):
+            cache.set(cache.cache_key('get', url, dict(), dict()), {'data': url}, ttl=60)
+        await cache.invalidate(urls=[base_url], url_prefixes=[object_url])
+        assert cache.stats['entries'] == 1
+        assert cache.stats['invalidations'] == 3
+        value, _ = cache.lookup(cache.cache_key('get', other_url, dict(), dict()))
+        assert value == {'data': other_url}
@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 """Base api object test cases."""
+import asyncio
 import uuid
 
 import pytest
 
-from veil_api_client.base.api_object import VeilApiObject, VeilRestPaginator
+from veil_api_client.base.api_object import (VeilApiObject, VeilListPageError,
+                                             VeilRestPaginator, VeilTag)
+from veil_api_client.base.api_response import VeilApiResponse
+from veil_api_client.base.utils import VeilEntityConfiguration, VeilTimeoutConfiguration
 
 pytestmark = [pytest.mark.base]
 
@@ -176,6 +180,28 @@ class TestVeilApiObject:
         else:
             raise AssertionError
 
+    def test_update_or_set_public_attr_trusted(self, api_object):
+        """Trusted values are set without descriptors checking."""
+        with pytest.raises(TypeError):
+            api_object.update_or_set_public_attrs({'id': 'badUUID'})
+        api_object.update_or_set_public_attrs({'id': 'badUUID', 'status': 'ACTIVE'}, trusted=True)  # noqa: E501
+        assert api_object.api_object_id == 'badUUID'
+        assert api_object.status == 'ACTIVE'
+
+    @pytest.mark.asyncio
+    async def test_trusted_converting_descriptors(self, veil_cli):
+        """Trusted values are still converted by converting descriptors."""
+        entity = {'entity_uuid': str(uuid.UUID(int=1)), 'entity_class': 'domain'}
+        result = {'id': str(uuid.UUID(int=2)), 'ui_entities': [entity]}
+        data = {'count': 1, 'results': [result]}
+        tag = VeilTag(client=veil_cli)
+        response = VeilApiResponse(status_code=200, data=data, headers=dict(), api_object=tag)
+        for listed_tag in (response.response[0], response.lazy_response[0]):
+            assert isinstance(listed_tag.ui_entities[0], VeilEntityConfiguration)
+            assert listed_tag.ui_entities[0].entity_class == 'domain'
+        tag.update_or_set_public_attrs(result, trusted=True)
+        assert isinstance(tag.ui_entities[0], VeilEntityConfiguration)
+
     def test_update_or_set_public_attr(self, api_object):
         """Test case for update_or_set_public_attr method."""
         attrs_dict = dict(status='SERVICE', not_in_init='secret', _private='secret')
@@ -193,3 +219,226 @@ class TestVeilApiObject:
             assert True
         else:
             raise AssertionError
+
+
+class TestVeilApiObjectTimeouts:
+    """VeilApiObject.set_timeouts test cases."""
+
+    class FakeClient:
+        """Client that records request timeouts."""
+
+        base_url = 'https://127.0.0.1/api/'
+
+        def __init__(self):
+            """Please see help(FakeClient) for more info."""
+            self.timeouts = list()
+
+        async def get(self, timeout_opts=None, **_):
+            """Record GET request timeouts."""
+            self.timeouts.append(timeout_opts)
+
+        async def post(self, timeout_opts=None, **_):
+            """Record POST request timeouts."""
+            self.timeouts.append(timeout_opts)
+
+    class CheckedObject(VeilApiObject):
+        """VeilApiObject with a health check method."""
+
+        async def check(self):
+            """Send a cheap request."""
+            return await self._get(self.base_url + 'check/', method_name='check')
+
+        async def check_twice(self):
+            """Send the health check request through a helper."""
+            return await self.__check()
+
+        async def __check(self):
+            """Private helper sending the health check request."""
+            return await self._get(self.base_url + 'check/', method_name='check_twice')
+
+    @pytest.mark.asyncio
+    async def test_set_timeouts(self):
+        """Method timeouts override entity timeouts, call timeouts override both."""
+        client = self.FakeClient()
+        default_opts = VeilTimeoutConfiguration(total=600)
+        check_opts = VeilTimeoutConfiguration(total=1, connect=0.5)
+        call_opts = VeilTimeoutConfiguration(read=5)
+        api_object = self.CheckedObject(client=client, api_object_prefix='domains/')
+        await api_object.check()
+        assert api_object.set_timeouts(default_opts, check=check_opts) is api_object
+        await api_object.check()
+        await api_object.list()
+        await api_object._get(api_object.base_url, timeout_opts=call_opts)
+        await api_object._post(api_object.base_url)
+        assert client.timeouts == [None, check_opts, default_opts, call_opts, default_opts]
+        assert '_VeilApiObject__timeout_opts' not in api_object.public_attrs
+        # method called through a private helper
+        api_object.set_timeouts(check_twice=check_opts)
+        await api_object.check_twice()
+        await api_object.check()
+        assert client.timeouts[-2:] == [check_opts, None]
+        with pytest.raises(TypeError):
+            api_object.set_timeouts(check=1)
+        for method_name in ('chek', '_get', 'api_object_url'):
+            with pytest.raises(TypeError):
+                api_object.set_timeouts(**{method_name: check_opts})
+
+
+class TestVeilListIterator:
+    """VeilApiObject.iter_all test cases."""
+
+    class PagedObject(VeilApiObject):
+        """VeilApiObject with a fake paginated list."""
+
+        total = 25
+
+        def __init__(self, client=None, api_object_id=None, **_):
+            """Please see help(VeilApiObject) for more info."""
+            super().__init__(client=client, api_object_prefix='domains/',
+                             api_object_id=api_object_id)
+            self.requested = list()
+
+        async def list(self, paginator=None, status_code=200, fail_from=None):  # noqa: A003
+            """Return a page of fake entities."""
+            self.requested.append(paginator.offset)
+            if fail_from is not None and paginator.offset >= fail_from:
+                status_code = 500
+            await asyncio.sleep(0)
+            stop = min(paginator.offset + paginator.limit, self.total)
+            results = [{'id': str(uuid.UUID(int=idx)), 'verbose_name': str(idx)}
+                       for idx in range(paginator.offset, stop)]
+            data = {'count': self.total, 'next': stop < self.total or None,
+                    'results': results}
+            return VeilApiResponse(status_code=status_code, data=data, headers=dict(),
+                                   api_object=self)
+
+    @staticmethod
+    async def collect(iterator) -> list:
+        """Collect verbose names of all iterated entities."""
+        names = list()
+        async for obj in iterator:
+            names.append(obj.verbose_name)
+        return names
+
+    @pytest.mark.asyncio
+    async def test_iter_all(self):
+        """All pages are requested by offset and entities are yielded one by one."""
+        api_object = self.PagedObject()
+        names = await self.collect(api_object.iter_all(page_size=10))
+        assert names == [str(idx) for idx in range(25)]
+        assert api_object.requested == [0, 10, 20]
+
+    @pytest.mark.asyncio
+    async def test_iter_all_offset(self):
+        """Paginator offset is used as a start."""
+        api_object = self.PagedObject()
+        iterator = api_object.iter_all(paginator=VeilRestPaginator(offset=20), page_size=3)
+        names = await self.collect(iterator)
+        assert names == [str(idx) for idx in range(20, 25)]
+        assert iterator.response.paginator_count == 25
+
+    @pytest.mark.asyncio
+    async def test_iter_all_prefetch(self):
+        """Next page is requested before the current page is processed."""
+        api_object = self.PagedObject()
+        iterator = api_object.iter_all(page_size=10)
+        await iterator.__anext__()
+        await asyncio.sleep(0)
+        assert api_object.requested == [0, 10]
+        await iterator.aclose()
+        with pytest.raises(StopAsyncIteration):
+            await iterator.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_iter_all_error(self):
+        """Unsuccessful page response raises VeilListPageError."""
+        api_object = self.PagedObject()
+        iterator = api_object.iter_all(page_size=10, status_code=500)
+        with pytest.raises(VeilListPageError) as exc_info:
+            await self.collect(iterator)
+        assert exc_info.value.response is iterator.response
+        assert not iterator.response.success
+        # a page after the first one is failed
+        api_object.total = 10
+        iterator = api_object.iter_all(page_size=2, fail_from=4)
+        names = list()
+        with pytest.raises(VeilListPageError) as exc_info:
+            async for obj in iterator:
+                names.append(obj.verbose_name)
+        assert names == ['0', '1', '2', '3']
+        assert exc_info.value.response.status_code == 500
+        with pytest.raises(TypeError):
+            api_object.iter_all(page_size=0)
+
+    @pytest.mark.asyncio
+    async def test_list_all(self):
+        """All pages are merged in order."""
+        api_object = self.PagedObject()
+        response = await api_object.list_all(page_size=4, concurrency=2)
+        assert response.success
+        assert response.paginator_count == 25
+        names = [obj.verbose_name for obj in response.response]
+        assert names == [str(idx) for idx in range(25)]
+        assert sorted(api_object.requested) == list(range(0, 25, 4))
+
+    @pytest.mark.asyncio
+    async def test_list_all_shifted(self):
+        """Entities shifted between pages are deduplicated by id."""
+        api_object = self.PagedObject()
+        original_list = api_object.list
+
+        async def shifted_list(paginator=None, **kwargs):
+            # an entity was added before the page, so the page starts 1 entity earlier
+            if paginator.offset:
+                paginator.offset -= 1
+            return await original_list(paginator=paginator, **kwargs)
+
+        api_object.list = shifted_list
+        response = await api_object.list_all(page_size=10)
+        names = [obj.verbose_name for obj in response.response]
+        assert names == [str(idx) for idx in range(25)]
+
+    @pytest.mark.asyncio
+    async def test_list_all_cancel(self):
+        """The first failed page cancels other page requests."""
+        api_object = self.PagedObject()
+        original_list = api_object.list
+        cancelled = list()
+
+        async def failing_list(paginator=None, **kwargs):
+            if paginator.offset == 10:
+                return await original_list(paginator=paginator, status_code=500)
+            if paginator.offset:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(paginator.offset)
+                    raise
+            return await original_list(paginator=paginator, **kwargs)
+
+        api_object.list = failing_list
+        response = await asyncio.wait_for(api_object.list_all(page_size=5), timeout=5)
+        assert response.status_code == 500
+        await asyncio.sleep(0)
+        assert sorted(cancelled) == [5, 15, 20]
+
+        async def raising_list(paginator=None, **kwargs):
+            if paginator.offset == 10:
+                raise asyncio.TimeoutError()
+            return await failing_list(paginator=paginator, **kwargs)
+
+        api_object.list = raising_list
+        cancelled.clear()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(api_object.list_all(page_size=5), timeout=5)
+        await asyncio.sleep(0)
+        assert sorted(cancelled) == [5, 15, 20]
+
+    @pytest.mark.asyncio
+    async def test_list_all_error(self):
+        """Failed page response is returned."""
+        api_object = self.PagedObject()
+        response = await api_object.list_all(page_size=10, status_code=500)
+        assert not response.success
+        with pytest.raises(TypeError):
+            await api_object.list_all(concurrency=0)
@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 """Base api response test cases."""
+from array import array
+from types import SimpleNamespace
 from uuid import uuid4
 
 from aiohttp import web
 
 import pytest
 
+from veil_api_client.api_objects.node import VeilNode
 from veil_api_client.api_objects.vdisk import VeilVDisk
-from veil_api_client.base.api_object import VeilTask
+from veil_api_client.base import api_response
+from veil_api_client.base.api_object import VeilTag, VeilTask
+from veil_api_client.base.api_record import VeilApiObjectRecord
 from veil_api_client.base.api_response import VeilApiResponse
 from veil_api_client.base.utils import veil_api_response
 
@@ -115,6 +120,109 @@ class TestVeilApiResponse:
         assert bad_response.paginator_results == list()
         assert bad_response.error_code == 50000
 
+    async def test_response_memoized(self):
+        """Response list is built once."""
+        data = {'results': [{'id': str(uuid4())} for _ in range(3)], 'count': 3}
+        response = VeilApiResponse(status_code=200, data=data, headers=None,
+                                   api_object=VeilVDisk(client=None, api_object_id=None))
+        assert response.response is response.response
+        assert len(response.response) == 3
+        response.data = {'results': data['results'][:1], 'count': 1}
+        assert len(response.response) == 1
+
+    async def test_lazy_response(self):
+        """Entities are materialized on first access only."""
+        results = [{'id': str(uuid4())} for _ in range(5)]
+        response = VeilApiResponse(status_code=200, data={'results': results, 'count': 5},
+                                   headers=None,
+                                   api_object=VeilVDisk(client=None, api_object_id=None))
+        lazy = response.lazy_response
+        assert len(lazy) == 5
+        assert lazy.materialized == 0
+        assert lazy[1].api_object_id == results[1]['id']
+        assert lazy[1] is lazy[1]
+        assert lazy.materialized == 1
+        assert [inst.api_object_id for inst in lazy[-2:]] == [results[3]['id'], results[4]['id']]  # noqa: E501
+        assert lazy.materialized == 3
+        assert response.response[1] is lazy[1]
+        assert lazy.materialized == 5
+        assert len(VeilApiResponse(status_code=400, data={}, headers=None,
+                                   api_object=None).lazy_response) == 0
+
+    async def test_compact_response(self):
+        """Records have the same attributes as entities and can be upgraded."""
+        results = [{'id': str(uuid4()), 'verbose_name': 'node', 'cpu_count': 4,
+                    'extra_field': 'extra', '_private': 'secret'}]
+        response = VeilApiResponse(status_code=200, data={'results': results, 'count': 1},
+                                   headers=None,
+                                   api_object=VeilNode(client=None, cluster_id=str(uuid4())))
+        records = response.compact_response
+        assert records is response.compact_response
+        record = records[0]
+        assert not hasattr(record, '__dict__')
+        assert not hasattr(record, '_private')
+        node = response.response[0]
+        for field in record._fields:
+            assert getattr(record, field) == getattr(node, field)
+        assert record.extra_field == 'extra'
+        with pytest.raises(AttributeError):
+            record.verbose_name = 'new'
+        upgraded = record.upgrade()
+        assert isinstance(upgraded, VeilNode)
+        assert upgraded.public_attrs == node.public_attrs
+        assert VeilApiResponse(status_code=400, data={}, headers=None,
+                               api_object=None).compact_response == list()
+
+    def test_compact_response_fields(self):
+        """Records are upgraded as trusted and don`t shadow record attributes by fields."""
+        results = [{'id': 'not-uuid', 'verbose_name': 'tag',
+                    'upgrade': 1, 'as_dict': 2, '_fields': 3}]
+        response = VeilApiResponse(status_code=200, data={'results': results, 'count': 1},
+                                   headers=None, api_object=VeilTag(client=None))
+        record = response.compact_response[0]
+        assert 'upgrade' not in record._fields
+        assert record.as_dict()['verbose_name'] == 'tag'
+        upgraded = record.upgrade()
+        tag = response.response[0]
+        for field in record._fields:
+            assert getattr(upgraded, field) == getattr(tag, field)
+        # not checked by descriptor as the response value
+        assert upgraded.api_object_id == 'not-uuid'
+
+    def test_record_types(self):
+        """Record classes are shared by field sets in any order and their num is limited."""
+        record_type = VeilApiObjectRecord.record_type
+        assert record_type(VeilNode, ('b', 'a')) is record_type(VeilNode, ('a', 'b'))
+        assert record_type(VeilNode, ('b', 'a'))._fields == ('a', 'b')
+        for idx in range(300):
+            record_type(VeilNode, ('field_{}'.format(idx),))
+        assert len(VeilApiObjectRecord._VeilApiObjectRecord__record_types) == 256
+
+    def test_columns(self, monkeypatch):
+        """Columns are typed arrays built from paginator results."""
+        # numpy is imported on the first call
+        monkeypatch.setattr(api_response, 'numpy', None)
+        numpy = api_response._numpy()
+        assert api_response.numpy is (numpy or False)
+        monkeypatch.setattr(api_response, 'numpy', False)
+        results = [{'memory_count': 1024, 'used_space': 1.5, 'free_space': None, 'status': 'ACTIVE'},  # noqa: E501
+                   {'memory_count': 2048, 'used_space': 2, 'free_space': 3, 'status': 'FAILED'}]  # noqa: E501
+        response = VeilApiResponse(status_code=200, data={'results': results, 'count': 2},
+                                   headers=None, api_object=None)
+        columns = response.columns(['memory_count', 'used_space', 'free_space', 'status'])
+        assert columns['memory_count'] == array('q', [1024, 2048])
+        assert columns['used_space'] == array('d', [1.5, 2.0])
+        assert columns['free_space'].typecode == 'd'
+        assert columns['free_space'][1] == 3.0
+        assert columns['free_space'][0] != columns['free_space'][0]
+        assert columns['status'] == ['ACTIVE', 'FAILED']
+        assert VeilApiResponse(status_code=400, data={}, headers=None,
+                               api_object=None).columns(['cpu_count'])['cpu_count'] == array('q')  # noqa: E501
+        fake_numpy = SimpleNamespace(int64='int64', float64='float64',
+                                     array=lambda values, dtype: (dtype, values))
+        monkeypatch.setattr(api_response, 'numpy', fake_numpy)
+        assert response.columns(['memory_count']) == {'memory_count': ('int64', [1024, 2048])}  # noqa: E501
+
     @staticmethod
     async def api_response_200(request):
         """Fake VeiL ECP response."""
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""Base api stream test cases."""
+import asyncio
+import json
+from uuid import UUID
+
+from aiohttp import web
+
+import pytest
+
+from veil_api_client import (VeilCircuitBreakerConfiguration, VeilClient,
+                             VeilConcurrencyConfiguration, VeilRetryConfiguration)
+from veil_api_client.api_objects import VeilDomainExt
+from veil_api_client.base import VeilApiObject, VeilApiResponseStream
+from veil_api_client.base.api_stream import VeilResultsParser
+
+pytestmark = [pytest.mark.base]
+
+
+def list_data(rows: int) -> dict:
+    """Response data of VeiL ECP list() with hard to parse values."""
+    results = [{'id': str(UUID(int=idx + 1)), 'verbose_name': 'домен-{}'.format(idx),
+                'description': 'quote \\" and ],{} brackets', 'tags': [{'id': idx}]}
+               for idx in range(rows)]
+    return {'count': rows, 'results': results, 'next': None, 'previous': None}
+
+
+class TestVeilResultsParser:
+    """VeilResultsParser test cases."""
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 5, 64, 100000])
+    def test_feed(self, chunk_size):
+        """Results are parsed from any chunks, other data is available on close."""
+        data = list_data(rows=5)
+        raw_data = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        parser = VeilResultsParser()
+        results = list()
+        for idx in range(0, len(raw_data), chunk_size):
+            results.extend(parser.feed(raw_data[idx:idx + chunk_size]))
+        assert results == data['results']
+        assert parser.close() == {'count': 5, 'results': [], 'next': None, 'previous': None}
+
+    def test_feed_incremental(self):
+        """Element is returned as soon as it is complete."""
+        parser = VeilResultsParser()
+        assert parser.feed(b'{"count": 2, "results": [{"id": 1}, {"id"') == [{'id': 1}]
+        assert parser.feed(b': 2}]}') == [{'id': 2}]
+        assert parser.close() == {'count': 2, 'results': []}
+
+    def test_no_results(self):
+        """Response without results is returned on close."""
+        parser = VeilResultsParser()
+        assert parser.feed(b'{"errors": [{"code": "50004", "detail": "results"}]}') == []
+        assert parser.close() == {'errors': [{'code': '50004', 'detail': 'results'}]}
+
+
+class TestVeilApiResponseStream:
+    """VeilApiResponseStream test cases."""
+
+    async def test_stream(self, loop, aiohttp_client, server_address):
+        """Entities are yielded before the response is finished."""
+        data = list_data(rows=3)
+        raw_data = json.dumps(data).encode('utf-8')
+        middle = raw_data.index(b'}, {') + 3
+        first_received = asyncio.Event()
+
+        async def stream_handler(request):
+            response = web.StreamResponse(headers={'Content-Type': 'application/json'})
+            await response.prepare(request)
+            await response.write(raw_data[:middle])
+            await first_received.wait()
+            await response.write(raw_data[middle:])
+            await response.write_eof()
+            return response
+
+        app = web.Application()
+        app.router.add_get(path='/stream', handler=stream_handler)
+        test_client = await aiohttp_client(app)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address)
+        stream = await client.stream(api_object=VeilDomainExt(client=client),
+                                     url=str(test_client.make_url('/stream')), chunk_size=16)
+        names = list()
+
+        async def consume():
+            async with stream:
+                async for domain in stream:
+                    assert isinstance(domain, VeilDomainExt)
+                    names.append(domain.verbose_name)
+                    first_received.set()
+                    assert stream.paginator_count == 0
+
+        # server sends the rest of response only after the first entity is received
+        await asyncio.wait_for(consume(), timeout=5)
+        assert names == [result['verbose_name'] for result in data['results']]
+        assert stream.finished
+        assert stream.success
+        assert stream.paginator_count == 3
+        assert stream.response.paginator_results == list()
+        assert client.pool_stats['in_use'] == 0
+        await client.close()
+
+    async def test_stream_error(self, loop, aiohttp_client, server_address):
+        """Failed response is not streamed."""
+        async def error_handler(request):
+            return web.json_response({'errors': [{'code': '50004', 'detail': 'Not found.'}]},
+                                     status=404)
+
+        app = web.Application()
+        app.router.add_get(path='/error', handler=error_handler)
+        test_client = await aiohttp_client(app)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address)
+        stream = await client.stream(api_object=VeilDomainExt(client=client),
+                                     url=str(test_client.make_url('/error')))
+        assert stream.finished
+        assert not stream.success
+        assert stream.response.error_code == 50004
+        async for _ in stream:
+            raise AssertionError()
+        await client.close()
+
+    async def test_stream_guarded(self, loop, aiohttp_client, server_address):
+        """Stream request is sent within concurrency limit and circuit breaker."""
+        requests = list()
+
+        async def unavailable_handler(request):
+            requests.append(request.path)
+            return web.json_response(dict(), status=503)
+
+        app = web.Application()
+        app.router.add_get(path='/unavailable', handler=unavailable_handler)
+        test_client = await aiohttp_client(app)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            retry_opts=VeilRetryConfiguration(num_of_attempts=1),
+                            concurrency_opts=VeilConcurrencyConfiguration(initial_limit=4),
+                            circuit_breaker_opts=VeilCircuitBreakerConfiguration(
+                                failure_threshold=1))
+        url = str(test_client.make_url('/unavailable'))
+        for _ in range(2):
+            stream = await client.stream(api_object=VeilDomainExt(client=client), url=url)
+            assert stream.status_code == 503
+        # the second request is rejected by open circuit breaker
+        assert requests == ['/unavailable']
+        assert client.circuit_breaker_stats[server_address]['rejected'] == 1
+        assert client.concurrency_stats['decreases'] == 1
+        assert client.concurrency_stats['in_flight'] == 0
+        await client.close()
+
+    async def test_list_stream(self, loop):
+        """Entity list() GET request is sent as stream request."""
+        calls = list()
+
+        class FakeClient:
+            base_url = 'https://127.0.0.1/api/'
+
+            async def stream(self, **kwargs):
+                calls.append(kwargs)
+                return VeilApiResponseStream(api_object=kwargs['api_object'], status_code=200,
+                                             headers=dict(), data=dict())
+
+            async def get(self, **kwargs):
+                calls.append(kwargs)
+
+        api_object = VeilApiObject(client=FakeClient(), api_object_prefix='domains/')
+        stream = await api_object.list_stream(extra_params={'fields': 'id'})
+        assert isinstance(stream, VeilApiResponseStream)
+        assert calls[0]['extra_params'] == {'fields': 'id'}
+        assert calls[0]['url'] == api_object.base_url
+        # list() of the same entity is not streamed
+        assert await api_object.list() is None
+        domain = VeilDomainExt(client=FakeClient(), node_id=str(UUID(int=1)))
+        stream = await domain.list_stream(fields=['id'])
+        assert isinstance(stream, VeilApiResponseStream)
+        assert calls[2]['extra_params']['node'] == str(UUID(int=1))
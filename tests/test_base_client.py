@@ -1,14 +1,28 @@
 # -*- coding: utf-8 -*-
 """VeilClient base test cases."""
-from aiohttp import ClientTimeout
+import asyncio
+import gzip
+import json
+import time
+import zlib
+from types import SimpleNamespace
+from uuid import uuid4
+
+from aiohttp import ClientTimeout, web
 
 import pytest
 
-from veil_api_client import VeilClient, VeilClientSingleton, VeilRetryConfiguration
+from veil_api_client import (VeilCacheAbstractClient, VeilCacheConfiguration,
+                             VeilCacheMemoryClient, VeilCircuitBreakerConfiguration,
+                             VeilClient, VeilClientSingleton,
+                             VeilCompressionConfiguration, VeilConcurrencyConfiguration,
+                             VeilHedgingConfiguration, VeilPoolConfiguration,
+                             VeilRateLimitConfiguration, VeilRetryBudgetConfiguration,
+                             VeilRetryConfiguration, VeilTimeoutConfiguration, https_client)
 from veil_api_client.api_objects import (VeilCluster, VeilController, VeilDataPool,
                                          VeilDomainExt, VeilEvent,
                                          VeilLibrary, VeilNode, VeilResourcePool, VeilVDisk)
-from veil_api_client.base import VeilTag, VeilTask
+from veil_api_client.base import VeilTag, VeilTask, api_cache
 
 pytestmark = [pytest.mark.base]
 
@@ -138,6 +152,795 @@ class TestVeilClient:
         assert 'query-key' in resp.data['query_args']
         assert 'query-value' == resp.data['query_args']['query-key']
 
+    async def test_pool_stats(self, loop, cli, server_address, api_object_domain):
+        """Connection pool statistics."""
+        client = VeilClient(server_address=server_address, token='jwt eyJ0')
+        await client.get(url=str(cli.make_url('/cli-test')), api_object=api_object_domain)
+        stats = client.pool_stats
+        assert stats['in_use'] == 0
+        assert stats['idle'] == 1
+        assert stats['waiting'] == 0
+        await client.close()
+
+    async def test_coalesce_requests(self, loop, aiohttp_client, server_address,
+                                     api_object_domain, known_domain_data):
+        """Identical concurrent GET requests share one request."""
+        hits = list()
+
+        async def slow_handler(request):
+            hits.append(request.method)
+            await asyncio.sleep(0.05)
+            return web.json_response(known_domain_data)
+
+        app = web.Application()
+        app.router.add_get(path='/slow', handler=slow_handler)
+        app.router.add_post(path='/slow', handler=slow_handler)
+        url = str((await aiohttp_client(app)).make_url('/slow'))
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            coalesce_requests=True)
+        responses = await asyncio.gather(
+            *[client.get(url=url, api_object=api_object_domain) for _ in range(5)])
+        assert len(hits) == 1
+        assert all(resp.data == known_domain_data for resp in responses)
+        assert client.coalescing_stats == dict(requests=5, deduplicated=4, in_flight=0)
+        # POST requests are never coalesced
+        await asyncio.gather(
+            *[client.post(url=url, api_object=api_object_domain) for _ in range(2)])
+        assert len(hits) == 3
+        assert client.coalescing_stats['requests'] == 5
+        await client.close()
+
+    async def test_coalesce_requests_timeout(self, loop, aiohttp_client, server_address,
+                                             api_object_domain, known_domain_data):
+        """GET with a shorter deadline doesn`t join and inherit in-flight request timeout."""
+        async def slow_handler(request):
+            await asyncio.sleep(0.5)
+            return web.json_response(known_domain_data)
+
+        app = web.Application()
+        app.router.add_get(path='/slow', handler=slow_handler)
+        url = str((await aiohttp_client(app)).make_url('/slow'))
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            coalesce_requests=True)
+        leader = asyncio.ensure_future(client.get(url=url, api_object=api_object_domain))
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get(url=url, api_object=api_object_domain,
+                             timeout_opts=VeilTimeoutConfiguration(total=0.1))
+        assert time.monotonic() - started < 0.3
+        assert (await leader).status_code == 200
+        assert client.coalescing_stats['deduplicated'] == 0
+        # equal options are still joined
+        responses = await asyncio.gather(
+            *[client.get(url=url, api_object=api_object_domain,
+                         timeout_opts=VeilTimeoutConfiguration(total=2)) for _ in range(2)])
+        assert all(resp.status_code == 200 for resp in responses)
+        assert client.coalescing_stats['deduplicated'] == 1
+        await client.close()
+
+    async def test_cache_invalidation(self, loop, veil_cli, api_object_domain):
+        """POST and PUT requests invalidate cached responses of the entity."""
+        invalidated = list()
+
+        class UserCache(VeilCacheAbstractClient):
+            async def get_from_cache(self, request_cor, *args, ttl=0, **kwargs):
+                return await request_cor(*args, **kwargs)
+
+            async def invalidate(self, urls, url_prefixes):
+                invalidated.append((urls, url_prefixes))
+
+        cache_opts = VeilCacheConfiguration(cache_client=UserCache(), ttl=60)
+        await veil_cli.get(url='/cli-test', api_object=api_object_domain,
+                           cache_opts=cache_opts)
+        assert not invalidated
+        await veil_cli.post(url='/cli-test', api_object=api_object_domain,
+                            json_data=dict(), cache_opts=cache_opts)
+        await veil_cli.put(url='/cli-test', api_object=api_object_domain,
+                           json_data=dict(), cache_opts=cache_opts)
+        expected = ([api_object_domain.base_url], [api_object_domain.api_object_url])
+        assert invalidated == [expected, expected]
+
+    async def test_precomputed_headers(self, loop, aiohttp_client, server_address,
+                                       api_object_domain):
+        """Headers and params are built once and per-call extras are not shared."""
+        requests = list()
+
+        async def echo_handler(request):
+            requests.append((request.headers.get('Authorization'),
+                             request.headers.get('X-Extra'), dict(request.query)))
+            return web.json_response(dict())
+
+        app = web.Application()
+        app.router.add_get(path='/echo', handler=echo_handler)
+        url = str((await aiohttp_client(app)).make_url('/echo'))
+        extra_params = {'fields': 'id,'}
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            extra_params=extra_params)
+        headers = client._VeilClient__headers
+        params = client._VeilClient__params
+        assert client._VeilClient__headers is headers
+        await client.get(url=url, api_object=api_object_domain,
+                         extra_headers={'X-Extra': '1'}, extra_params={'page': '1'})
+        await client.get(url=url, api_object=api_object_domain)
+        assert 'X-Extra' not in headers
+        assert params == {'async': 1, 'fields': 'id,'}
+        client.token = 'jwt eyJ1'
+        assert client._VeilClient__headers['Authorization'] == 'jwt eyJ1'
+        await client.get(url=url, api_object=api_object_domain)
+        # extra values changed in place
+        extra_headers = {'X-Extra': '2'}
+        client._VeilClient__extra_headers = extra_headers
+        await client.get(url=url, api_object=api_object_domain)
+        extra_headers['X-Extra'] = '3'
+        extra_params['fields'] = 'name'
+        await client.get(url=url, api_object=api_object_domain)
+        assert requests == [('jwt eyJ0', '1', {'async': '1', 'fields': 'id', 'page': '1'}),
+                            ('jwt eyJ0', None, {'async': '1', 'fields': 'id'}),
+                            ('jwt eyJ1', None, {'async': '1', 'fields': 'id'}),
+                            ('jwt eyJ1', '2', {'async': '1', 'fields': 'id'}),
+                            ('jwt eyJ1', '3', {'async': '1', 'fields': 'name'})]
+        await client.close()
+
+    @pytest.mark.parametrize('json_codec', ['orjson', 'ujson', 'json'])
+    async def test_json_codec(self, loop, aiohttp_client, server_address, api_object_domain,
+                              json_codec):
+        """Request and response json are processed by selected codec."""
+        if json_codec == 'orjson':
+            pytest.importorskip('orjson')
+
+        async def echo_handler(request):
+            return web.json_response(await request.json())
+
+        async def text_handler(request):
+            return web.Response(text='{"k": "v"}')
+
+        app = web.Application()
+        app.router.add_post(path='/echo', handler=echo_handler)
+        app.router.add_get(path='/text', handler=text_handler)
+        test_client = await aiohttp_client(app)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            json_codec=json_codec)
+        response = await client.post(url=str(test_client.make_url('/echo')),
+                                     api_object=api_object_domain,
+                                     json_data={'verbose_name': 'домен', 'count': 1})
+        assert response.data['verbose_name'] == 'домен'
+        assert response.data['count'] == 1
+        response = await client.get(url=str(test_client.make_url('/text')),
+                                    api_object=api_object_domain)
+        assert response.data == dict()
+        await client.close()
+        with pytest.raises(ValueError):
+            VeilClient(token='jwt eyJ0', server_address=server_address, json_codec='pickle')
+
+    @pytest.mark.parametrize('ujson_', [True, False])
+    async def test_default_json_codec(self, loop, server_address, ujson_):
+        """Responses are parsed by json if json_codec is not set."""
+        client = VeilClient(token='jwt eyJ0', server_address=server_address, ujson_=ujson_)
+        codec = client._VeilClient__json_codec
+        assert codec.name == 'json'
+        assert codec.loads(b'{"k": 1.5}') == {'k': 1.5}
+        assert codec.dumps is (https_client.ujson.dumps if ujson_ else json.dumps)
+        await client.close()
+
+    async def test_compression(self, loop, aiohttp_client, server_address, api_object_domain):
+        """Compressed responses are decoded and large request bodies are compressed."""
+        requests = list()
+        data = {'results': [{'verbose_name': 'domain', 'status': 'ACTIVE'}] * 200}
+
+        async def gzip_handler(request):
+            requests.append(request.headers.get('Accept-Encoding'))
+            return web.Response(body=gzip.compress(json.dumps(data).encode('utf-8')),
+                                headers={'Content-Type': 'application/json',
+                                         'Content-Encoding': 'gzip'})
+
+        async def echo_handler(request):
+            requests.append(request.headers.get('Content-Encoding'))
+            return web.json_response(await request.json())
+
+        app = web.Application()
+        app.router.add_get(path='/gzip', handler=gzip_handler)
+        app.router.add_post(path='/echo', handler=echo_handler)
+        test_client = await aiohttp_client(app)
+        compression_opts = VeilCompressionConfiguration(compress_requests=True,
+                                                        compress_threshold=100)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            compression_opts=compression_opts)
+        response = await client.get(url=str(test_client.make_url('/gzip')),
+                                    api_object=api_object_domain)
+        assert response.data == data
+        stats = client.compression_stats
+        assert stats['response_bytes'] == len(json.dumps(data))
+        assert stats['response_wire_bytes'] * 10 < stats['response_bytes']
+        stream = await client.stream(url=str(test_client.make_url('/gzip')),
+                                     api_object=api_object_domain, chunk_size=16)
+        async for _ in stream:
+            pass
+        assert stream.paginator_count == 0
+        assert client.compression_stats['response_bytes'] == 2 * stats['response_bytes']
+        for json_data in ({'small': 1}, {'entity_ids': [str(uuid4()) for _ in range(10)]}):
+            response = await client.post(url=str(test_client.make_url('/echo')),
+                                         api_object=api_object_domain, json_data=json_data)
+            assert response.data == json_data
+        stats = client.compression_stats
+        assert stats['compressed_requests'] == 1
+        assert stats['request_wire_bytes'] < stats['request_bytes']
+        assert requests == ['gzip, deflate', 'gzip, deflate', None, 'gzip']
+        await client.close()
+        with pytest.raises(ValueError):
+            VeilCompressionConfiguration(accept_encodings=['zstd'])
+        assert VeilCompressionConfiguration(accept_encodings=[]).accept_encoding == 'identity'
+
+    async def test_deflate(self, loop, aiohttp_client, server_address, api_object_domain):
+        """Both zlib wrapped and raw deflate responses are decoded."""
+        data = {'results': [{'verbose_name': 'domain', 'status': 'ACTIVE'}] * 200}
+
+        async def deflate_handler(request):
+            compressor = zlib.compressobj(wbits=int(request.query['wbits']))
+            body = compressor.compress(json.dumps(data).encode('utf-8')) + compressor.flush()
+            return web.Response(body=body, headers={'Content-Type': 'application/json',
+                                                    'Content-Encoding': 'deflate'})
+
+        app = web.Application()
+        app.router.add_get(path='/deflate', handler=deflate_handler)
+        test_client = await aiohttp_client(app)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address)
+        for wbits in (zlib.MAX_WBITS, -zlib.MAX_WBITS):
+            url = str(test_client.make_url('/deflate'))
+            response = await client.get(url=url, api_object=api_object_domain,
+                                        extra_params={'wbits': wbits})
+            assert response.data == data
+            stream = await client.stream(url=url, api_object=api_object_domain,
+                                         extra_params={'wbits': wbits}, chunk_size=1)
+            names = list()
+            async for entity in stream:
+                names.append(entity.verbose_name)
+            assert names == ['domain'] * 200
+        await client.close()
+
+    async def test_content_encoding(self, loop, aiohttp_client, server_address,
+                                    api_object_domain):
+        """Content-Encoding is normalized, unsupported encoding is never parsed as json."""
+        data = {'results': [{'verbose_name': 'domain'}] * 10}
+
+        async def handler(request):
+            return web.Response(body=gzip.compress(json.dumps(data).encode('utf-8')),
+                                headers={'Content-Type': 'application/json',
+                                         'Content-Encoding': request.query['encoding']})
+
+        app = web.Application()
+        app.router.add_get(path='/encoded', handler=handler)
+        url = str((await aiohttp_client(app)).make_url('/encoded'))
+        client = VeilClient(token='jwt eyJ0', server_address=server_address)
+        for encoding in ('GZIP', 'gzip ', 'x-gzip'):
+            response = await client.get(url=url, api_object=api_object_domain,
+                                        extra_params={'encoding': encoding})
+            assert response.data == data
+        with pytest.raises(ValueError):
+            await client.get(url=url, api_object=api_object_domain,
+                             extra_params={'encoding': 'zstd'})
+        with pytest.raises(ValueError):
+            await client.stream(url=url, api_object=api_object_domain,
+                                extra_params={'encoding': 'zstd'})
+        assert client.pool_stats['in_use'] == 0
+        await client.close()
+        assert VeilCompressionConfiguration.decompressor(None) is None
+        assert VeilCompressionConfiguration.decompressor('identity') is None
+
+    async def test_brotli(self, loop, aiohttp_client, server_address, api_object_domain):
+        """Brotli responses are decoded with brotli extra installed."""
+        brotli = pytest.importorskip('brotli')
+        data = {'results': [{'verbose_name': 'domain', 'status': 'ACTIVE'}] * 200}
+        requests = list()
+
+        async def handler(request):
+            requests.append(request.headers.get('Accept-Encoding'))
+            return web.Response(body=brotli.compress(json.dumps(data).encode('utf-8')),
+                                headers={'Content-Type': 'application/json',
+                                         'Content-Encoding': 'br'})
+
+        app = web.Application()
+        app.router.add_get(path='/br', handler=handler)
+        url = str((await aiohttp_client(app)).make_url('/br'))
+        compression_opts = VeilCompressionConfiguration(accept_encodings=['br'])
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            compression_opts=compression_opts)
+        response = await client.get(url=url, api_object=api_object_domain)
+        assert response.data == data
+        stream = await client.stream(url=url, api_object=api_object_domain, chunk_size=16)
+        names = list()
+        async for entity in stream:
+            names.append(entity.verbose_name)
+        assert names == ['domain'] * 200
+        assert requests == ['br', 'br']
+        stats = client.compression_stats
+        assert stats['response_wire_bytes'] * 10 < stats['response_bytes']
+        await client.close()
+
+    async def test_rate_limit(self, loop, aiohttp_client, server_address, api_object_domain):
+        """Read and write requests over the burst wait for tokens."""
+        async def handler(request):
+            return web.json_response(dict())
+
+        app = web.Application()
+        app.router.add_get(path='/read', handler=handler)
+        app.router.add_post(path='/write', handler=handler)
+        test_client = await aiohttp_client(app)
+        rate_limit_opts = VeilRateLimitConfiguration(read_rate=50, read_burst=2)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            rate_limit_opts=rate_limit_opts)
+        assert client.rate_limit_stats['write'] is None
+        url = str(test_client.make_url('/read'))
+        started = time.monotonic()
+        tasks = [asyncio.ensure_future(client.get(url=url, api_object=api_object_domain))
+                 for _ in range(5)]
+        await asyncio.sleep(0.01)
+        assert client.rate_limit_stats['read']['queue_depth'] > 0
+        await asyncio.gather(*tasks)
+        # 2 requests of the burst and 3 more with 50 requests per second
+        assert time.monotonic() - started >= 0.05
+        read_stats = client.rate_limit_stats['read']
+        assert read_stats['acquired'] == 5
+        assert read_stats['delayed'] == 3
+        assert read_stats['queue_depth'] == 0
+        assert 0.04 < read_stats['max_wait_time'] <= read_stats['wait_time']
+        await client.post(url=str(test_client.make_url('/write')),
+                          api_object=api_object_domain)
+        await client.close()
+        with pytest.raises(ValueError):
+            VeilRateLimitConfiguration(write_rate=0)
+
+    async def test_concurrency_limit(self, loop, aiohttp_client, server_address,
+                                     api_object_domain):
+        """Concurrency limit grows on healthy controller and shrinks on overload."""
+        state = dict(delay=0, status=200, running=0, max_running=0)
+
+        async def handler(request):
+            state['running'] += 1
+            state['max_running'] = max(state['max_running'], state['running'])
+            await asyncio.sleep(state['delay'])
+            state['running'] -= 1
+            return web.json_response(dict(), status=state['status'])
+
+        app = web.Application()
+        app.router.add_get(path='/x', handler=handler)
+        test_client = await aiohttp_client(app)
+        concurrency_opts = VeilConcurrencyConfiguration(initial_limit=1, max_limit=4,
+                                                        latency_tolerance=50)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            concurrency_opts=concurrency_opts)
+        url = str(test_client.make_url('/x'))
+        tasks = [asyncio.ensure_future(client.get(url=url, api_object=api_object_domain))
+                 for _ in range(3)]
+        await asyncio.sleep(0)
+        assert client.concurrency_stats['in_flight'] == 1
+        assert client.concurrency_stats['queued'] == 2
+        await asyncio.gather(*tasks)
+        assert state['max_running'] == 1
+        # 1 request per limit increases the limit by 1
+        assert client.concurrency_stats['limit'] == 2
+        for _ in range(5):
+            await asyncio.gather(*[client.get(url=url, api_object=api_object_domain)
+                                   for _ in range(8)])
+        stats = client.concurrency_stats
+        assert stats['limit'] == 4
+        assert state['max_running'] == 4
+        assert stats['in_flight'] == stats['queued'] == stats['decreases'] == 0
+        # controller latency growth
+        state['delay'] = stats['min_latency'] * 100
+        await client.get(url=url, api_object=api_object_domain)
+        assert client.concurrency_stats['limit'] == 2
+        # unavailable controller
+        state['delay'] = 0
+        state['status'] = 503
+        await client.get(url=url, api_object=api_object_domain)
+        assert client.concurrency_stats['limit'] == 1
+        assert client.concurrency_stats['decreases'] == 2
+        await client.close()
+        with pytest.raises(ValueError):
+            VeilConcurrencyConfiguration(initial_limit=10, max_limit=5)
+
+    async def test_concurrency_limit_latency(self, loop, aiohttp_client, server_address,
+                                             api_object_domain):
+        """Rate limiter waiting and cancelled requests don`t decrease concurrency limit."""
+        state = dict(delay=0)
+
+        async def handler(request):
+            await asyncio.sleep(state['delay'])
+            return web.json_response(dict())
+
+        app = web.Application()
+        app.router.add_get(path='/x', handler=handler)
+        test_client = await aiohttp_client(app)
+        concurrency_opts = VeilConcurrencyConfiguration(initial_limit=4, latency_tolerance=20)
+        rate_limit_opts = VeilRateLimitConfiguration(read_rate=10, read_burst=1)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            concurrency_opts=concurrency_opts, rate_limit_opts=rate_limit_opts)
+        url = str(test_client.make_url('/x'))
+        await client.get(url=url, api_object=api_object_domain)
+        # 3 requests wait for tokens up to 0.3 seconds
+        await asyncio.gather(*[client.get(url=url, api_object=api_object_domain)
+                               for _ in range(3)])
+        assert client.concurrency_stats['decreases'] == 0
+        # cancelled slow request
+        state['delay'] = 1
+        task = asyncio.ensure_future(client.get(url=url, api_object=api_object_domain))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        stats = client.concurrency_stats
+        assert stats['decreases'] == stats['in_flight'] == 0
+        assert stats['limit'] == 4
+        await client.close()
+
+    async def test_retry(self, loop, aiohttp_client, server_address, api_object_domain,
+                         monkeypatch):
+        """Retries respect jitter, Retry-After and deadline."""
+        responses = list()
+        requests = list()
+
+        async def handler(request):
+            requests.append(request.path)
+            status, headers = responses.pop(0) if responses else (500, None)
+            return web.json_response(dict(), status=status, headers=headers)
+
+        app = web.Application()
+        app.router.add_get(path='/x', handler=handler)
+        test_client = await aiohttp_client(app)
+        url = str(test_client.make_url('/x'))
+        backoffs = list()
+
+        def uniform(low, high):
+            backoffs.append((low, high))
+            return 0.2
+
+        monkeypatch.setattr(https_client.random, 'uniform', uniform)
+        retry_opts = VeilRetryConfiguration(num_of_attempts=10, max_timeout=5, deadline=0.5)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            retry_opts=retry_opts)
+        # Retry-After is used instead of backoff
+        responses.extend([(503, {'Retry-After': '0'}), (500, None), (200, None)])
+        response = await client.get(url=url, api_object=api_object_domain)
+        assert response.status_code == 200
+        assert len(requests) == 3
+        assert backoffs == [(0, 2)]
+        # 429 isn`t retried without Retry-After or with Retry-After over max_timeout
+        responses.extend([(429, None), (429, {'Retry-After': '10'})])
+        for _ in range(2):
+            response = await client.get(url=url, api_object=api_object_domain)
+            assert response.status_code == 429
+        assert len(requests) == 5
+        # attempts at 0, 0.2 and 0.4 seconds, the next one can`t be sent before deadline
+        del requests[:]
+        response = await client.get(url=url, api_object=api_object_domain)
+        assert response.status_code == 500
+        assert len(requests) == 3
+        assert client.pool_stats['in_use'] == 0
+        await client.close()
+        # the deadline is exceeded while waiting for a rate limiter token
+        retry_opts = VeilRetryConfiguration(deadline=0.05)
+        rate_limit_opts = VeilRateLimitConfiguration(read_rate=5, read_burst=1)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            retry_opts=retry_opts, rate_limit_opts=rate_limit_opts)
+        await client.get(url=url, api_object=api_object_domain)
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get(url=url, api_object=api_object_domain)
+        await client.close()
+        with pytest.raises(ValueError):
+            VeilRetryConfiguration(jitter='equal')
+
+    async def test_retry_budget(self, loop, aiohttp_client, server_address, api_object_domain):
+        """Retries over the budget fail fast."""
+        requests = list()
+
+        async def handler(request):
+            requests.append(request.path)
+            return web.json_response(dict(), status=500 if request.path == '/bad' else 200)
+
+        app = web.Application()
+        app.router.add_get(path='/bad', handler=handler)
+        app.router.add_get(path='/ok', handler=handler)
+        test_client = await aiohttp_client(app)
+        retry_opts = VeilRetryConfiguration(num_of_attempts=3, timeout=0, jitter=None)
+        retry_budget_opts = VeilRetryBudgetConfiguration(ratio=0.5, min_retries=1)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            retry_opts=retry_opts, retry_budget_opts=retry_budget_opts)
+        bad_url = str(test_client.make_url('/bad'))
+        ok_url = str(test_client.make_url('/ok'))
+        # 1 retry of min_retries
+        response = await client.get(url=bad_url, api_object=api_object_domain)
+        assert response.status_code == 500
+        assert len(requests) == 2
+        assert client.retry_budget_stats['balance'] == 0
+        assert client.retry_budget_stats['exhausted'] == 1
+        # retries are allowed by successful requests
+        for _ in range(4):
+            await client.get(url=ok_url, api_object=api_object_domain)
+        assert client.retry_budget_stats['balance'] == 2
+        del requests[:]
+        await client.get(url=bad_url, api_object=api_object_domain)
+        assert len(requests) == 3
+        stats = client.retry_budget_stats
+        assert stats['balance'] == 0
+        assert stats['successes'] == 4
+        assert stats['retries'] == stats['retried'] == 3
+        assert stats['exhausted'] == 1
+        await client.close()
+        assert VeilClient(token='jwt eyJ0', server_address=server_address).retry_budget_stats is None  # noqa: E501
+
+    async def test_circuit_breaker(self, loop, aiohttp_client, server_address, api_object_domain):  # noqa: E501
+        """Requests to unavailable entity prefix are rejected until probe succeeds."""
+        state = dict(status=418)
+        requests = list()
+
+        async def handler(request):
+            requests.append(request.path)
+            status = state['status'] if request.path.startswith('/api/domains/') else 200
+            return web.json_response(dict(), status=status)
+
+        app = web.Application()
+        app.router.add_get(path='/api/domains/', handler=handler)
+        app.router.add_get(path='/api/tasks/', handler=handler)
+        test_client = await aiohttp_client(app)
+        circuit_breaker_opts = VeilCircuitBreakerConfiguration(failure_threshold=2,
+                                                               recovery_timeout=0.1,
+                                                               per_entity=True)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            circuit_breaker_opts=circuit_breaker_opts)
+        domains_url = str(test_client.make_url('/api/domains/'))
+        tasks_url = str(test_client.make_url('/api/tasks/'))
+        for _ in range(2):
+            await client.get(url=domains_url, api_object=api_object_domain)
+        assert client.circuit_breaker_stats['domains/']['state'] == 'open'
+        response = await client.get(url=domains_url, api_object=api_object_domain)
+        assert response.status_code == 503
+        assert response.error_code == 50000
+        assert 'Circuit breaker is open' in response.error_detail
+        assert response.headers['Retry-After'] == '1'
+        assert len(requests) == 2
+        # other entities are available
+        response = await client.get(url=tasks_url, api_object=api_object_domain)
+        assert response.success
+        assert client.circuit_breaker_stats['tasks/']['state'] == 'closed'
+        # failed probe opens the circuit again
+        await asyncio.sleep(0.1)
+        await client.get(url=domains_url, api_object=api_object_domain)
+        stats = client.circuit_breaker_stats['domains/']
+        assert stats['state'] == 'open'
+        assert stats['opened'] == 2
+        assert stats['rejected'] == 1
+        await asyncio.sleep(0.1)
+        state['status'] = 200
+        response = await client.get(url=domains_url, api_object=api_object_domain)
+        assert response.success
+        assert client.circuit_breaker_stats['domains/']['state'] == 'closed'
+        assert len(requests) == 5
+        await client.close()
+
+    async def test_circuit_breaker_probes(self, loop, aiohttp_client, server_address,
+                                          api_object_domain):
+        """Only cancelled probes free half-open probe slots."""
+        requests = list()
+
+        async def handler(request):
+            requests.append(request.path)
+            if request.path == '/slow':
+                await asyncio.sleep(1)
+            return web.json_response(dict(), status=503 if request.path == '/fail' else 200)
+
+        app = web.Application()
+        for path in ('/slow', '/fail', '/ok'):
+            app.router.add_get(path=path, handler=handler)
+        test_client = await aiohttp_client(app)
+        circuit_breaker_opts = VeilCircuitBreakerConfiguration(failure_threshold=1,
+                                                               recovery_timeout=0.1)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            retry_opts=VeilRetryConfiguration(num_of_attempts=1),
+                            circuit_breaker_opts=circuit_breaker_opts)
+
+        def get(path):
+            url = str(test_client.make_url(path))
+            return client.get(url=url, api_object=api_object_domain)
+
+        closed_request = asyncio.ensure_future(get('/slow'))
+        await asyncio.sleep(0.05)
+        await get('/fail')
+        await asyncio.sleep(0.15)
+        probe = asyncio.ensure_future(get('/slow'))
+        await asyncio.sleep(0.05)
+        # request sent before the circuit was opened is not a probe
+        closed_request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await closed_request
+        response = await get('/fail')
+        assert response.error_code == 50000
+        assert requests == ['/slow', '/fail', '/slow']
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        response = await get('/ok')
+        assert response.success
+        assert client.circuit_breaker_stats[server_address]['state'] == 'closed'
+        await client.close()
+
+    async def test_circuit_breaker_late_success(self, loop, aiohttp_client, server_address,
+                                                api_object_domain):
+        """Success of the request sent before the breaker was opened doesn`t close it."""
+        async def handler(request):
+            if request.path == '/slow':
+                await asyncio.sleep(0.2)
+            return web.json_response(dict(), status=503 if request.path == '/fail' else 200)
+
+        app = web.Application()
+        for path in ('/slow', '/fail'):
+            app.router.add_get(path=path, handler=handler)
+        test_client = await aiohttp_client(app)
+        circuit_breaker_opts = VeilCircuitBreakerConfiguration(failure_threshold=1,
+                                                               recovery_timeout=10)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            retry_opts=VeilRetryConfiguration(num_of_attempts=1),
+                            circuit_breaker_opts=circuit_breaker_opts)
+        slow_request = asyncio.ensure_future(
+            client.get(url=str(test_client.make_url('/slow')), api_object=api_object_domain))
+        await asyncio.sleep(0.05)
+        await client.get(url=str(test_client.make_url('/fail')), api_object=api_object_domain)
+        assert client.circuit_breaker_stats[server_address]['state'] == 'open'
+        assert (await slow_request).success
+        assert client.circuit_breaker_stats[server_address]['state'] == 'open'
+        await client.close()
+
+    async def test_timeouts(self, loop, aiohttp_client, server_address, api_object_domain):
+        """Request and its retries are limited by timeout_opts."""
+        attempts = list()
+
+        async def handler(request):
+            attempts.append(request.path)
+            await asyncio.sleep(0.2)
+            return web.json_response(dict(), status=500)
+
+        app = web.Application()
+        app.router.add_get(path='/slow', handler=handler)
+        test_client = await aiohttp_client(app)
+        url = str(test_client.make_url('/slow'))
+        retry_opts = VeilRetryConfiguration(num_of_attempts=5, timeout=0, jitter=None,
+                                            exceptions={asyncio.TimeoutError})
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            retry_opts=retry_opts,
+                            timeout_opts=VeilTimeoutConfiguration(total=0.1))
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get(url=url, api_object=api_object_domain)
+        assert len(attempts) == 1
+        # per call timeout overrides client timeout, the 2nd attempt is limited by time left
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.get(url=url, api_object=api_object_domain,
+                             timeout_opts=VeilTimeoutConfiguration(total=0.3, connect=1))
+        assert 0.3 <= time.monotonic() - started < 0.45
+        assert len(attempts) == 3
+        await client.close()
+        with pytest.raises(ValueError):
+            VeilTimeoutConfiguration(read=0)
+
+    async def test_hedging(self, loop, aiohttp_client, server_address, api_object_domain):
+        """Late GET response is hedged by the second request within the budget."""
+        state = dict(slow=0)
+
+        async def handler(request):
+            if state['slow']:
+                state['slow'] -= 1
+                await asyncio.sleep(1)
+            return web.json_response({'id': 'x'})
+
+        app = web.Application()
+        app.router.add_get(path='/x', handler=handler)
+        test_client = await aiohttp_client(app)
+        url = str(test_client.make_url('/x'))
+        hedging_opts = VeilHedgingConfiguration(min_delay=0.05, budget=0.1, window=20,
+                                                min_samples=10)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            hedging_opts=hedging_opts)
+        for _ in range(10):
+            await client.get(url=url, api_object=api_object_domain)
+        assert client.hedging_stats['delay'] >= 0.05
+        # the first request is slow, the second one wins
+        state['slow'] = 1
+        started = time.monotonic()
+        response = await client.get(url=url, api_object=api_object_domain)
+        assert response.data == {'id': 'x'}
+        assert time.monotonic() - started < 0.5
+        # the late request is cancelled and its connection is released
+        await asyncio.sleep(0)
+        assert client.pool_stats['in_use'] == 0
+        # the budget allows only 1 hedged request of 11
+        state['slow'] = 1
+        started = time.monotonic()
+        await client.get(url=url, api_object=api_object_domain)
+        assert time.monotonic() - started >= 1
+        stats = client.hedging_stats
+        assert stats['requests'] == 12
+        assert stats['hedged'] == stats['hedge_wins'] == stats['rejected'] == 1
+        # POST requests are not hedged
+        await client.post(url=url, api_object=api_object_domain)
+        assert client.hedging_stats['requests'] == 12
+        await client.close()
+        with pytest.raises(ValueError):
+            VeilHedgingConfiguration(budget=0)
+
+    async def test_hedging_accounting(self, loop, server_address):
+        """Failed hedges are counted in the budget and latency includes the hedge delay."""
+        hedging_opts = VeilHedgingConfiguration(min_delay=0.05, budget=0.5, window=4,
+                                                min_samples=1)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            hedging_opts=hedging_opts)
+        hedger = client._VeilClient__hedger
+        hedger.record(0.05)
+        for _ in range(2):
+            hedger.register(hedged=False)
+        calls = list()
+
+        async def request_function(**_):
+            calls.append(len(calls))
+            # the primary request is late
+            await asyncio.sleep(0.1 if len(calls) == 1 else 0.01)
+            if state['fail']:
+                raise asyncio.TimeoutError
+            return dict(status_code=200)
+
+        state = dict(fail=True)
+        with pytest.raises(asyncio.TimeoutError):
+            await client._VeilClient__hedged_request(request_function, url='x')
+        assert hedger.stats['hedged'] == 1
+        assert hedger._hedges_count == 1
+        # the hedge won, but the caller waited for the hedge delay too
+        state['fail'] = False
+        calls.clear()
+        for _ in range(2):
+            hedger.register(hedged=False)
+        await client._VeilClient__hedged_request(request_function, url='x')
+        assert hedger.stats['hedge_wins'] == 1
+        assert hedger._latencies[-1] >= 0.05
+        await client.close()
+
+    async def test_conditional_requests(self, loop, aiohttp_client, server_address,
+                                        api_object_domain, known_domain_data, monkeypatch):
+        """Expired cached response is revalidated with ETag."""
+        requests = list()
+
+        async def etag_handler(request):
+            requests.append(request.headers.get('If-None-Match'))
+            if request.headers.get('If-None-Match') == '"v1"':
+                return web.Response(status=304, headers={'ETag': '"v1"'})
+            return web.json_response(known_domain_data, headers={'ETag': '"v1"'})
+
+        async def no_etag_handler(request):
+            requests.append(request.headers.get('If-None-Match'))
+            return web.json_response(known_domain_data)
+
+        app = web.Application()
+        app.router.add_get(path='/etag', handler=etag_handler)
+        app.router.add_get(path='/no-etag', handler=no_etag_handler)
+        test_client = await aiohttp_client(app)
+        cache_client = VeilCacheMemoryClient()
+        cache_opts = VeilCacheConfiguration(cache_client=cache_client, ttl=1)
+        client = VeilClient(token='jwt eyJ0', server_address=server_address,
+                            cache_opts=cache_opts)
+        monotonic = time.monotonic()
+        monkeypatch.setattr(api_cache, 'time', SimpleNamespace(monotonic=lambda: monotonic))
+        for path in ('/etag', '/no-etag'):
+            url = str(test_client.make_url(path))
+            first = await client.get(url=url, api_object=api_object_domain)
+            monotonic += 2
+            second = await client.get(url=url, api_object=api_object_domain)
+            assert second.status_code == 200
+            assert second.data == first.data == known_domain_data
+        assert requests == [None, '"v1"', None, None]
+        assert cache_client.stats['revalidations'] == 1
+        # cached responses size is a size of response bodies
+        body = json.dumps(known_domain_data).encode('utf-8')
+        assert cache_client.stats['size'] == len(body) * 2
+        await client.close()
+
     async def test_domain(self, loop, veil_cli, known_uid):
         """Basic domain __init__."""
         obj = veil_cli.domain(domain_id=known_uid)
@@ -256,3 +1059,89 @@ class TestVeilClientSingleton:
         assert client._VeilClient__retry_opts != ins._VeilClientSingleton__RETRY_OPTS
         assert client._VeilClient__cache_opts != ins._VeilClientSingleton__CACHE_OPTS
         await ins.remove_client('127.0.0.1')
+
+    @pytest.mark.asyncio
+    async def test_add_client_2(self):
+        """Connection pool options test."""
+        ins = VeilClientSingleton(pool_opts=VeilPoolConfiguration(limit=10, limit_per_host=5))
+        client = ins.add_client('127.0.0.1', 'jwt As')
+        connector = client._VeilClient__session.connector
+        assert connector.limit == 10
+        assert connector.limit_per_host == 5
+        assert client.pool_stats['limit'] == 10
+        await ins.remove_client('127.0.0.1')
+        assert client.pool_stats['in_use'] == 0
+
+    @pytest.mark.asyncio
+    async def test_add_client_3(self):
+        """Json codec test."""
+        pytest.importorskip('orjson')
+        ins = VeilClientSingleton(json_codec='orjson')
+        client = ins.add_client('127.0.0.1', 'jwt As')
+        assert client._VeilClient__json_codec.name == 'orjson'
+        await ins.remove_client('127.0.0.1')
+
+    @pytest.mark.asyncio
+    async def test_add_client_4(self):
+        """Rate limit options test."""
+        ins = VeilClientSingleton(rate_limit_opts=VeilRateLimitConfiguration(write_rate=1))
+        client = ins.add_client('127.0.0.1', 'jwt As')
+        assert client.rate_limit_stats['read'] is None
+        assert client.rate_limit_stats['write']['rate'] == 1
+        await ins.remove_client('127.0.0.1')
+
+    @pytest.mark.asyncio
+    async def test_add_client_5(self):
+        """Concurrency options test."""
+        concurrency_opts = VeilConcurrencyConfiguration(initial_limit=5)
+        ins = VeilClientSingleton(concurrency_opts=concurrency_opts)
+        client = ins.add_client('127.0.0.1', 'jwt As')
+        assert client.concurrency_stats['limit'] == 5
+        await ins.remove_client('127.0.0.1')
+        assert VeilClient(server_address='127.0.0.1', token='jwt As').concurrency_stats is None
+
+    @pytest.mark.asyncio
+    async def test_add_client_6(self):
+        """Retry budget options test."""
+        retry_budget_opts = VeilRetryBudgetConfiguration(min_retries=5)
+        ins = VeilClientSingleton(retry_budget_opts=retry_budget_opts)
+        client = ins.add_client('127.0.0.1', 'jwt As')
+        assert client.retry_budget_stats['balance'] == 5
+        await ins.remove_client('127.0.0.1')
+
+    @pytest.mark.asyncio
+    async def test_add_client_7(self):
+        """Circuit breaker options test."""
+        circuit_breaker_opts = VeilCircuitBreakerConfiguration(failure_threshold=1)
+        ins = VeilClientSingleton(circuit_breaker_opts=circuit_breaker_opts)
+        client = ins.add_client('127.0.0.1', 'jwt As')
+        assert client._VeilClient__circuit_breaker_opts.failure_threshold == 1
+        assert client.circuit_breaker_stats == dict()
+        await ins.remove_client('127.0.0.1')
+        with pytest.raises(ValueError):
+            VeilCircuitBreakerConfiguration(recovery_timeout=0)
+
+    @pytest.mark.asyncio
+    async def test_add_client_8(self):
+        """Hedging options test."""
+        ins = VeilClientSingleton(hedging_opts=VeilHedgingConfiguration(percentile=99))
+        client = ins.add_client('127.0.0.1', 'jwt As')
+        assert client.hedging_stats['delay'] is None
+        await ins.remove_client('127.0.0.1')
+        assert VeilClient(server_address='127.0.0.1', token='jwt As').hedging_stats is None
+
+    @pytest.mark.asyncio
+    async def test_add_client_9(self):
+        """Coalescing and compression options test."""
+        compression_opts = VeilCompressionConfiguration(accept_encodings=['gzip'])
+        ins = VeilClientSingleton(coalesce_requests=True, compression_opts=compression_opts)
+        client = ins.add_client('127.0.0.1', 'jwt As')
+        assert client._VeilClient__coalescer is not None
+        assert client._VeilClient__compression_opts is compression_opts
+        await ins.remove_client('127.0.0.1')
+        client_compression_opts = VeilCompressionConfiguration(compress_requests=True)
+        client = ins.add_client('127.0.0.1', 'jwt As', coalesce_requests=False,
+                                compression_opts=client_compression_opts)
+        assert client._VeilClient__coalescer is None
+        assert client._VeilClient__compression_opts is client_compression_opts
+        await ins.remove_client('127.0.0.1')
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Performance benchmarks.
+
+Benchmarks compare current implementation with the previous one and print results.
+They are deselected by default, run them with: pytest -m benchmark -s
+"""
+import functools
+import inspect
+import timeit
+import tracemalloc
+import typing
+from typing import Optional
+from uuid import UUID
+
+import pytest
+
+from veil_api_client.api_objects import VeilDomain
+from veil_api_client.base import VeilApiResponse, VeilRestPaginator
+from veil_api_client.base import utils
+
+pytestmark = [pytest.mark.benchmark]
+
+
+def domain_page(rows: int) -> dict:
+    """Response data of VeiL ECP domain.list() with all_content."""
+    results = list()
+    for idx in range(rows):
+        results.append({
+            'id': str(UUID(int=idx + 1)), 'verbose_name': 'domain-{}'.format(idx),
+            'status': 'ACTIVE', 'remote_access': True, 'node': {'id': str(UUID(int=1))},
+            'parent': None, 'remote_access_port': 5900, 'real_remote_access_port': 5900,
+            'graphics_password': 'password', 'template': False, 'os_type': 'Linux',
+            'os_version': 'Astra', 'user_power_state': 3, 'guest_utils': {'qemu_state': True},
+            'cpu_topology': {'cpu_count': 2}, 'cpu_count': 2, 'tags': [], 'owners': [],
+            'sound': {}, 'cpu_type': 'Default', 'memory_count': 1024, 'vdisks': [],
+            'video': {}, 'is_ova': False, 'cdroms': [], 'description': '', 'locked_by': None,
+            'created': '2021-01-01T00:00:00Z', 'hints': 0, 'ha_enabled': False,
+        })
+    return {'count': rows, 'next': None, 'previous': None, 'results': results}
+
+
+def legacy_public_attrs(api_object) -> dict:
+    """Previous dir() based VeilApiObject.public_attrs."""
+    result_dict = dict()
+    for attr in dir(api_object):
+        if attr.startswith('_'):
+            continue
+        if hasattr(api_object.__class__, attr) and callable(getattr(api_object.__class__, attr)):  # noqa: E501
+            continue
+        if hasattr(api_object.__class__, attr):
+            attr_value = getattr(api_object.__class__, attr)
+        else:
+            attr_value = api_object.__getattribute__(attr)
+        result_dict[attr] = attr_value
+    return result_dict
+
+
+def legacy_update_or_set_public_attrs(api_object, attrs_dict: dict) -> None:
+    """Previous dir() based VeilApiObject.update_or_set_public_attrs."""
+    for attr in attrs_dict:
+        if attr.startswith('_'):
+            continue
+        if hasattr(api_object.__class__, attr) and callable(getattr(api_object.__class__, attr)):  # noqa: E501
+            continue
+        if attr == 'id':
+            api_object.__setattr__('api_object_id', attrs_dict[attr])
+            continue
+        if attr in legacy_public_attrs(api_object) and isinstance(legacy_public_attrs(api_object)[attr], property):  # noqa: E501
+            continue
+        api_object.__setattr__(attr, attrs_dict[attr])
+
+
+def legacy_argument_type_checker_decorator(func):
+    """Previous argument_type_checker_decorator with per-call introspection."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments = inspect.getfullargspec(func).args
+        annotations = func.__annotations__
+
+        if annotations:
+            for idx, arg_name in enumerate(arguments):
+                arg_annotation = annotations.get(arg_name)
+                arg_value = args[idx] if len(args) > idx else None
+                if arg_annotation and arg_value and not isinstance(arg_value, arg_annotation):
+                    raise TypeError('{} is not a proper {}.'.format(arg_value, arg_annotation))
+
+            for kwarg in kwargs:
+                kwarg_annotation = annotations.get(kwarg)
+                kwarg_value = kwargs[kwarg]
+                if hasattr(kwarg_annotation, '__origin__') and kwarg_annotation.__origin__ is typing.Union:  # noqa: E501
+                    continue
+                if kwarg_annotation and kwarg_value and not isinstance(kwarg_value, kwarg_annotation):  # noqa: E501
+                    raise TypeError('{} is not a proper {}.'.format(kwarg, kwarg_annotation))
+
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def allocated(func) -> int:
+    """Size of memory blocks allocated by func result."""
+    tracemalloc.start()
+    try:
+        result = func()  # noqa: F841
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size
+
+
+def best_of(func, number: int = 1, repeat: int = 3) -> float:
+    """Best execution time of func."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+class TestMaterializationBenchmark:
+    """VeilApiResponse.response materialization benchmarks."""
+
+    def test_domain_page_schema(self):
+        """Per-class attribute schema against dir() based materialization."""
+        domain = VeilDomain(client=None)
+        data = domain_page(rows=50)
+
+        def legacy():
+            for result in data['results']:
+                inst = domain.copy()
+                legacy_update_or_set_public_attrs(inst, result)
+
+        def current():
+            VeilApiResponse(status_code=200, data=data, headers=dict(),
+                            api_object=domain).response
+
+        legacy_time = best_of(legacy)
+        current_time = best_of(current)
+        print('\n50 VeilDomain rows: dir() {:.4f}s, schema {:.4f}s, speedup x{:.1f}'.format(
+            legacy_time, current_time, legacy_time / current_time))
+        assert current_time * 5 < legacy_time
+
+    def test_domain_page_compact_memory(self):
+        """Slotted records against full VeilDomain instances memory usage."""
+        domain = VeilDomain(client=None)
+        data = domain_page(rows=2000)
+
+        def full():
+            return VeilApiResponse(status_code=200, data=data, headers=dict(),
+                                   api_object=domain).response
+
+        def compact():
+            return VeilApiResponse(status_code=200, data=data, headers=dict(),
+                                   api_object=domain).compact_response
+
+        full_size = allocated(full)
+        compact_size = allocated(compact)
+        print('\n2000 VeilDomain rows: objects {} KiB, records {} KiB, x{:.1f} less'.format(
+            full_size // 1024, compact_size // 1024, full_size / compact_size))
+        assert compact_size * 2 < full_size
+
+
+class TestArgumentCheckerBenchmark:
+    """argument_type_checker_decorator per-call overhead benchmarks."""
+
+    @staticmethod
+    def list_method(self, paginator: VeilRestPaginator = None, fields: Optional[list] = None,
+                    status: str = None, cluster: str = None):
+        """Signature like VeilApiObject.list methods."""
+        return paginator
+
+    def test_argument_checker_overhead(self):
+        """Checks compiled on decoration against per-call introspection."""
+        legacy = legacy_argument_type_checker_decorator(self.list_method)
+        current = utils.argument_type_checker_decorator(self.list_method)
+        paginator = VeilRestPaginator(limit=10)
+
+        def call(func):
+            return lambda: func(None, paginator, fields=['id'], status='ACTIVE')
+
+        legacy_time = best_of(call(legacy), number=10000)
+        current_time = best_of(call(current), number=10000)
+        utils.set_argument_type_checking(False)
+        try:
+            disabled_time = best_of(call(current), number=10000)
+        finally:
+            utils.set_argument_type_checking(True)
+        print('\nargument checker call: per-call {:.2f}us, compiled {:.2f}us, disabled {:.2f}us'.format(  # noqa: E501
+            legacy_time * 1e6, current_time * 1e6, disabled_time * 1e6))
+        assert current_time * 3 < legacy_time
+        assert disabled_time < current_time
@@ -4,6 +4,7 @@ from uuid import uuid4
 
 import pytest
 
+import veil_api_client
 from veil_api_client.base import utils
 
 pytestmark = [pytest.mark.base]
@@ -127,6 +128,28 @@ class TestAttributeDescriptors:
                           good_value='eafc39f3-ce6e-4db2-9d4e-1d93babcbe26',
                           bad_value='eafc39f3-ce6e-4db2-9d4e-1d93babcbe2')
 
+    def test_uuid_string_type_is_uuid(self, monkeypatch):
+        """Uuid string fast path, other representations and memo size."""
+        monkeypatch.setattr(utils.UuidStringType, 'memo_size', 2)
+        assert utils.UuidStringType.is_uuid('EAFC39F3-CE6E-4DB2-9D4E-1D93BABCBE26')
+        assert utils.UuidStringType.is_uuid('{eafc39f3ce6e4db29d4e1d93babcbe26}')
+        assert utils.UuidStringType.is_uuid('eafc39f3-ce6e-4db2-9d4e-1d93babcbe26')
+        assert not utils.UuidStringType.is_uuid('eafc39f3-ce6e-4db2-9d4e-1d93babcbe2')
+        assert not utils.UuidStringType.is_uuid(1)
+        assert len(utils.UuidStringType._UuidStringType__validated) <= 2
+        self.assert_value(class_argument='uuid_string_type',
+                          good_value='eafc39f3-ce6e-4db2-9d4e-1d93babcbe26',
+                          bad_value=['eafc39f3-ce6e-4db2-9d4e-1d93babcbe26'])
+
+    def test_uuid_string_type_set_trusted(self):
+        """Trusted values are set without checking."""
+        descriptor = self._instance_class_being_tested.__class__.__dict__['uuid_string_type']
+        test_val = uuid4()
+        descriptor.set_trusted(self._instance_class_being_tested, test_val)
+        assert self._instance_class_being_tested.uuid_string_type == str(test_val)
+        descriptor.set_trusted(self._instance_class_being_tested, 'trusted')
+        assert self._instance_class_being_tested.uuid_string_type == 'trusted'
+
     def test_nullable_uuid_string_type_checker(self):
         """Nullable uuid string type checker."""
         self.assert_value(class_argument='nullable_uuid_string_type',
@@ -160,6 +183,18 @@ class TestAttributeDescriptors:
         else:
             raise AssertionError()
 
+    def test_method_annotated_argument_disabled(self):
+        """Decorator argument_type_checker can be turned off."""
+        assert veil_api_client.set_argument_type_checking is utils.set_argument_type_checking
+        utils.set_argument_type_checking(False)
+        try:
+            self._instance_class_being_tested.annotated(val=1)
+            self._instance_class_being_tested.annotated(1)
+        finally:
+            utils.set_argument_type_checking(True)
+        with pytest.raises(TypeError):
+            self._instance_class_being_tested.annotated(val=1)
+
     def test_nullable_bool_type_checker(self):
         """Nullable bool type descriptor test case."""
         self.assert_value(class_argument='nullable_bool_type',
@@ -236,3 +271,20 @@ class TestVeilEntityConfiguration:
         repr_val = '{} : domain'.format(id_)
         assert repr_val in cl.__repr__()
         assert 'domain' == cl.__str__()
+
+
+class TestVeilPoolConfiguration:
+    """Connection pool configuration test cases."""
+
+    def test_init(self):
+        """Init tests."""
+        conf = utils.VeilPoolConfiguration(limit=20, ttl_dns_cache=None)
+        assert conf.connector_kwargs['limit'] == 20
+        assert conf.connector_kwargs['ttl_dns_cache'] is None
+        assert conf.connector_kwargs['keepalive_timeout'] == 15
+        conf = utils.VeilPoolConfiguration(force_close=True)
+        assert 'keepalive_timeout' not in conf.connector_kwargs
+        with pytest.raises(TypeError):
+            utils.VeilPoolConfiguration(ssl_context='bad')
+        with pytest.raises(TypeError):
+            utils.VeilPoolConfiguration(limit='bad')
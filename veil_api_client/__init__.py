@@ -11,9 +11,14 @@ from .api_objects import (DomainBackupConfiguration, DomainCloneConfiguration,
                           DomainConfiguration,
                           DomainRemoteConnectionConfiguration, DomainTcpUsb,
                           DomainUpdateConfiguration, VeilDomainExt, VeilGuestAgentCmd)
-from .base import (TagConfiguration, VeilApiObjectStatus, VeilCacheAbstractClient,
-                   VeilCacheConfiguration, VeilRestPaginator, VeilTag)
-from .base.utils import VeilEntityConfiguration
+from .base import (TagConfiguration, VeilApiObjectRecord, VeilApiObjectStatus,
+                   VeilCacheAbstractClient, VeilCacheConfiguration, VeilCacheMemoryClient,
+                   VeilListPageError, VeilRestPaginator, VeilTag)
+from .base.utils import (VeilCircuitBreakerConfiguration, VeilCompressionConfiguration,
+                         VeilConcurrencyConfiguration, VeilEntityConfiguration,
+                         VeilHedgingConfiguration, VeilPoolConfiguration,
+                         VeilRateLimitConfiguration, VeilRetryBudgetConfiguration,
+                         VeilTimeoutConfiguration, set_argument_type_checking)
 from .https_client import VeilClient, VeilClientSingleton, VeilRetryConfiguration
 
 __all__ = (
@@ -22,7 +27,12 @@ __all__ = (
     'VeilCacheConfiguration', 'TagConfiguration', 'VeilEntityConfiguration',
     'VeilGuestAgentCmd', 'DomainTcpUsb', 'VeilRetryConfiguration', 'VeilDomainExt',
     'DomainBackupConfiguration', 'VeilTag', 'VeilCacheAbstractClient',
-    'DomainUpdateConfiguration', 'VeilApiObjectStatus', 'DomainRemoteConnectionConfiguration'
+    'DomainUpdateConfiguration', 'VeilApiObjectStatus', 'DomainRemoteConnectionConfiguration',
+    'VeilPoolConfiguration', 'VeilCacheMemoryClient', 'VeilApiObjectRecord',
+    'VeilCompressionConfiguration', 'VeilRateLimitConfiguration',
+    'VeilConcurrencyConfiguration', 'VeilRetryBudgetConfiguration',
+    'VeilCircuitBreakerConfiguration', 'VeilTimeoutConfiguration',
+    'VeilHedgingConfiguration', 'VeilListPageError', 'set_argument_type_checking'
 )
 
 __author__ = 'Aleksei Deviatkin <a.devyatkin@mashtab.org>, Emile Gareev <e.gareev@mashtab.org>'
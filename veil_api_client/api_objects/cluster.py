@@ -36,5 +36,5 @@ class VeilCluster(VeilApiObject):
     async def usage(self) -> 'VeilApiResponse':
         """Get minimum statistics of resource loading."""
         url = self.api_object_url + 'usage/'
-        response = await self._get(url)
+        response = await self._get(url, method_name='usage')
         return response
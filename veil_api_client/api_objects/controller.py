@@ -31,14 +31,14 @@ class VeilController(VeilApiObject):
     async def base_version(self) -> 'VeilApiResponse':
         """Get the controller version."""
         url = self.base_url + 'base-version/'
-        response = await self._get(url)
+        response = await self._get(url, method_name='base_version')
         self.version = response.data.get('version')
         return response
 
     async def check(self) -> 'VeilApiResponse':
         """Check controller availability."""
         url = self.base_url + 'check/'
-        response = await self._get(url)
+        response = await self._get(url, method_name='check')
         return response
 
     @property
@@ -69,6 +69,6 @@ class VeilController(VeilApiObject):
     async def get_system_time(self) -> dict:
         """Get the current controller time."""
         url = self.base_url + 'system-time/'
-        time_response = await self._get(url)
+        time_response = await self._get(url, method_name='get_system_time')
         if time_response.status_code == 200:
             return time_response.data
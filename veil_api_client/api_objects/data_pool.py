@@ -44,7 +44,8 @@ class VeilDataPool(VeilApiObject):
         self.cluster_id = str(cluster_id) if cluster_id else None
         self.resource_pool_id = str(resource_pool_id) if resource_pool_id else None
 
-    async def list(self, paginator: Optional[VeilRestPaginator] = None) -> 'VeilApiResponse':  # noqa: A003, E501
+    async def list(self, paginator: Optional[VeilRestPaginator] = None,  # noqa: A003
+                   stream: bool = False) -> 'VeilApiResponse':
         """Get list of data_pools with node_id filter."""
         extra_node_param = {'node': self.node_id} if self.node_id else dict()
         extra_cluster_param = {'cluster': self.cluster_id} if self.cluster_id else dict()
@@ -55,4 +56,5 @@ class VeilDataPool(VeilApiObject):
         extra_params.update(extra_resource_pool_param)
         if not extra_params:
             extra_params = None
-        return await super().list(paginator=paginator, extra_params=extra_params)
+        return await super().list(paginator=paginator, extra_params=extra_params,
+                                  stream=stream)
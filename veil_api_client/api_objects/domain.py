@@ -592,7 +592,7 @@ class VeilDomain(VeilApiObject):
             body['fargs'] = f_args
         if timeout:
             body['timeout'] = timeout
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='guest_command')
         return response
 
     async def set_hostname(self, hostname: str = None):
@@ -600,7 +600,7 @@ class VeilDomain(VeilApiObject):
         url = self.api_object_url + 'set-hostname/'
         domain_hostname = hostname if hostname else self.verbose_name
         body = dict(hostname=domain_hostname)
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='set_hostname')
         return response
 
     async def add_to_ad(self,
@@ -627,7 +627,7 @@ class VeilDomain(VeilApiObject):
             body['newname'] = new_name
         if oupath:
             body['oupath'] = oupath
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='add_to_ad')
         return response
 
     async def rm_from_ad(self,
@@ -639,7 +639,7 @@ class VeilDomain(VeilApiObject):
         body = dict(login=login, password=password)
         if restart:
             body['restart'] = 1
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='rm_from_ad')
         return response
 
     async def prepare(self,
@@ -679,7 +679,7 @@ class VeilDomain(VeilApiObject):
             if oupath:
                 set_ad['oupath'] = oupath
             body['add_to_ad'] = set_ad
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='prepare')
         return response
 
     async def add_to_ad_group(self, computer_name: str,
@@ -720,7 +720,8 @@ class VeilDomain(VeilApiObject):
         if tcp_usb:
             body['tcp_usb'] = tcp_usb.__dict__
         extra_params = {'async': 0} if no_task else None
-        response = await self._post(url=url, json_data=body, extra_params=extra_params)
+        response = await self._post(url=url, json_data=body, extra_params=extra_params,
+                                    method_name='attach_usb')
         return response
 
     async def detach_usb(self, action_type: Optional[str] = None,
@@ -740,78 +741,85 @@ class VeilDomain(VeilApiObject):
         if remove_all:
             body['remove_all'] = 1
         extra_params = {'async': 0} if no_task else None
-        response = await self._post(url=url, json_data=body, extra_params=extra_params)
+        response = await self._post(url=url, json_data=body, extra_params=extra_params,
+                                    method_name='detach_usb')
         return response
 
     async def start(self, force: bool = False) -> 'ClientResponse':
         """Send domain action 'start'."""
         url = self.action_url('start/')
         body = dict(force=force)
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='start')
         return response
 
     async def reboot(self, force: bool = False) -> 'ClientResponse':
         """Send domain action 'reboot'."""
         url = self.action_url('reboot/')
         body = dict(force=force)
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='reboot')
         return response
 
     async def suspend(self, force: bool = False) -> 'ClientResponse':
         """Send domain action 'suspend'."""
         url = self.action_url('suspend/')
         body = dict(force=force)
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='suspend')
         return response
 
     async def reset(self, force: bool = False) -> 'ClientResponse':
         """Send domain action 'reset'."""
         url = self.action_url('reset/')
         body = dict(force=force)
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='reset')
         return response
 
     async def shutdown(self, force: bool = False) -> 'ClientResponse':
         """Send domain action 'shutdown'."""
         url = self.action_url('shutdown/')
         body = dict(force=force)
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='shutdown')
         return response
 
     async def resume(self, force: bool = False) -> 'ClientResponse':
         """Send domain action 'resume'."""
         url = self.action_url('resume/')
         body = dict(force=force)
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='resume')
         return response
 
-    async def remote_access_action(self, enable: bool = True) -> 'ClientResponse':
+    async def __remote_access(self, enable: bool, method_name: str) -> 'ClientResponse':
         """Send domain action 'remote-action'."""
         url = self.api_object_url + 'remote-access/'
         body = dict(remote_access=enable)
-        response = await self._post(url, json_data=body)
+        response = await self._post(url, json_data=body, method_name=method_name)
         return response
 
+    async def remote_access_action(self, enable: bool = True) -> 'ClientResponse':
+        """Send domain action 'remote-action'."""
+        return await self.__remote_access(enable=enable, method_name='remote_access_action')
+
     async def enable_remote_access(self) -> 'ClientResponse':
         """Enable domain remote-access."""
-        return await self.remote_access_action(enable=True)
+        return await self.__remote_access(enable=True, method_name='enable_remote_access')
 
     async def disable_remote_access(self) -> 'ClientResponse':
         """Disable domain remote-access."""
-        return await self.remote_access_action(enable=False)
+        return await self.__remote_access(enable=False, method_name='disable_remote_access')
 
     @argument_type_checker_decorator
     async def create(self, domain_configuration: DomainConfiguration) -> 'ClientResponse':
         """Run multi-create-domain on VeiL ECP."""
         url = self.base_url + 'multi-create-domain/'
-        response = await self._post(url=url, json_data=domain_configuration.notnull_attrs)
+        response = await self._post(url=url, json_data=domain_configuration.notnull_attrs,
+                                    method_name='create')
         return response
 
     @argument_type_checker_decorator
     async def clone(self, domain_configuration: DomainCloneConfiguration) -> 'ClientResponse':
         """Run clone for existing domain on VeiL ECP."""
         url = self.api_object_url + 'clone/'
-        response = await self._post(url=url, json_data=domain_configuration.notnull_attrs)
+        response = await self._post(url=url, json_data=domain_configuration.notnull_attrs,
+                                    method_name='clone')
         return response
 
     @argument_type_checker_decorator
@@ -820,7 +828,8 @@ class VeilDomain(VeilApiObject):
         """Run VeiL ECP domain update endpoint."""
         url = self.api_object_url
         response = await self._put(url=url,
-                                   json_data=domain_update_configuration.notnull_attrs)
+                                   json_data=domain_update_configuration.notnull_attrs,
+                                   method_name='update')
         return response
 
     async def update_verbose_name(self, verbose_name: str):
@@ -832,13 +841,14 @@ class VeilDomain(VeilApiObject):
         """Remove domain instance on VeiL ECP."""
         url = self.action_url('remove/')
         body = dict(full=full, force=force)
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name='remove')
         return response
 
     async def list(self, with_vdisks: int = None,  # noqa: A003
                    paginator: VeilRestPaginator = None,
                    fields: List[str] = None,
-                   params: dict = None) -> 'ClientResponse':
+                   params: dict = None,
+                   stream: bool = False) -> 'ClientResponse':
         """Get list of data_pools with node_id filter.
 
         By default get only domains with vdisks.
@@ -868,12 +878,14 @@ class VeilDomain(VeilApiObject):
                 extra_params['fields'] = ','.join(fields)
         if params:
             extra_params.update(params)
-        return await super().list(paginator=paginator, extra_params=extra_params)
+        return await super().list(paginator=paginator, extra_params=extra_params,
+                                  stream=stream)
 
     async def __multi_manager(self, action: MultiManagerAction,
                               entity_ids: List[str],
                               full: bool,
-                              force: bool) -> 'ClientResponse':
+                              force: bool,
+                              method_name: str) -> 'ClientResponse':
         """Multi manager with action.
 
         Possible actions:
@@ -888,7 +900,7 @@ class VeilDomain(VeilApiObject):
         url = self.base_url + 'multi-manager/'
         options = dict(full=full, force=force)
         body = dict(entity_ids=entity_ids, action=action.value, options=options)
-        response = await self._post(url=url, json_data=body)
+        response = await self._post(url=url, json_data=body, method_name=method_name)
         return response
 
     async def multi_start(self, entity_ids: List[str],
@@ -898,7 +910,8 @@ class VeilDomain(VeilApiObject):
         return await self.__multi_manager(action=MultiManagerAction.START,
                                           entity_ids=entity_ids,
                                           full=full,
-                                          force=force)
+                                          force=force,
+                                          method_name='multi_start')
 
     async def multi_shutdown(self, entity_ids: List[str],
                              full: bool = True,
@@ -907,7 +920,8 @@ class VeilDomain(VeilApiObject):
         return await self.__multi_manager(action=MultiManagerAction.SHUTDOWN,
                                           entity_ids=entity_ids,
                                           full=full,
-                                          force=force)
+                                          force=force,
+                                          method_name='multi_shutdown')
 
     async def multi_suspend(self, entity_ids: List[str],
                             full: bool = True,
@@ -916,7 +930,8 @@ class VeilDomain(VeilApiObject):
         return await self.__multi_manager(action=MultiManagerAction.SUSPEND,
                                           entity_ids=entity_ids,
                                           full=full,
-                                          force=force)
+                                          force=force,
+                                          method_name='multi_suspend')
 
     async def multi_reboot(self, entity_ids: List[str],
                            full: bool = True,
@@ -925,7 +940,8 @@ class VeilDomain(VeilApiObject):
         return await self.__multi_manager(action=MultiManagerAction.REBOOT,
                                           entity_ids=entity_ids,
                                           full=full,
-                                          force=force)
+                                          force=force,
+                                          method_name='multi_reboot')
 
     async def multi_resume(self, entity_ids: List[str],
                            full: bool = True,
@@ -934,7 +950,8 @@ class VeilDomain(VeilApiObject):
         return await self.__multi_manager(action=MultiManagerAction.RESUME,
                                           entity_ids=entity_ids,
                                           full=full,
-                                          force=force)
+                                          force=force,
+                                          method_name='multi_resume')
 
     async def multi_remove(self, entity_ids: List[str],
                            full: bool = True,
@@ -943,7 +960,8 @@ class VeilDomain(VeilApiObject):
         return await self.__multi_manager(action=MultiManagerAction.DELETE,
                                           entity_ids=entity_ids,
                                           full=full,
-                                          force=force)
+                                          force=force,
+                                          method_name='multi_remove')
 
     async def multi_migrate(self, entity_ids: List[str],
                             full: bool = True,
@@ -952,20 +970,21 @@ class VeilDomain(VeilApiObject):
         return await self.__multi_manager(action=MultiManagerAction.MIGRATE,
                                           entity_ids=entity_ids,
                                           full=full,
-                                          force=force)
+                                          force=force,
+                                          method_name='multi_migrate')
 
     async def backup(self, configuration: DomainBackupConfiguration):
         """Create domain backup."""
         url = ''.join([self.base_url, 'backup/'])
         data = configuration.notnull_attrs
         data['domain'] = self.api_object_id
-        return await self._post(url=url, json_data=data)
+        return await self._post(url=url, json_data=data, method_name='backup')
 
     async def show_backup(self, file_id: str):
         """A serialized VM representation from a VeiL ECP or OVA backup."""  # noqa: D401
         url = ''.join([self.base_url, 'show-backup/'])
         data = {'file': file_id}
-        return await self._post(url=url, json_data=data)
+        return await self._post(url=url, json_data=data, method_name='show_backup')
 
     async def automated_restore(self, file_id: str, node_id: str, datapool_id: str = None):
         """Automatically restore VM from backup."""
@@ -973,41 +992,41 @@ class VeilDomain(VeilApiObject):
         data = {'file': file_id, 'node': node_id}
         if datapool_id:
             data['datapool'] = datapool_id
-        return await self._post(url=url, json_data=data)
+        return await self._post(url=url, json_data=data, method_name='automated_restore')
 
     async def attach_veil_utils_iso(self) -> 'ClientResponse':
         """Mount veil utils image to domain."""
         url = self.api_object_url + 'attach-veil-utils-iso/'
-        return await self._post(url=url)
+        return await self._post(url=url, method_name='attach_veil_utils_iso')
 
     async def change_template(self) -> 'ClientResponse':
         """Change template for domain and template's thin clones."""
         url = self.api_object_url + 'change-template/'
-        response = await self._post(url=url)
+        response = await self._post(url=url, method_name='change_template')
         return response
 
     async def spice(self) -> 'ClientResponse':
         """Spice connection url endpoint."""
         url = self.api_object_url + 'spice/'
-        response = await self._get(url=url)
+        response = await self._get(url=url, method_name='spice')
         return response
 
     async def vnc(self) -> 'ClientResponse':
         """VNC connection url endpoint."""
         url = self.api_object_url + 'vnc/'
-        response = await self._get(url=url)
+        response = await self._get(url=url, method_name='vnc')
         return response
 
     async def convert_to_template(self) -> 'ClientResponse':
         """Convert VM to template url endpoint."""
         url = self.api_object_url + 'template/'
         data = {'template': True}
-        response = await self._put(url=url, json_data=data)
+        response = await self._put(url=url, json_data=data, method_name='convert_to_template')
         return response
 
     async def convert_to_vm(self) -> 'ClientResponse':
         """Convert template to VM url endpoint."""
         url = self.api_object_url + 'template/'
         data = {'template': False}
-        response = await self._put(url=url, json_data=data)
+        response = await self._put(url=url, json_data=data, method_name='convert_to_vm')
         return response
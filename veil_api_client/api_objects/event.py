@@ -37,7 +37,8 @@ class VeilEvent(VeilApiObject):
                    event_type: str = None,
                    paginator: VeilRestPaginator = None,
                    extra_params: dict = None,
-                   extra_headers: dict = None):
+                   extra_headers: dict = None,
+                   stream: bool = False):
         """List of events on ECP VeiL."""
         params = dict()
         if not extra_headers:
@@ -49,4 +50,4 @@ class VeilEvent(VeilApiObject):
         if extra_params:
             params.update(extra_params)
         return await super().list(paginator=paginator, extra_params=params,
-                                  extra_headers=extra_headers)
+                                  extra_headers=extra_headers, stream=stream)
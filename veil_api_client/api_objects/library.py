@@ -54,7 +54,8 @@ class VeilLibrary(VeilApiObject):
                    domain: str = None,
                    datapool: str = None,
                    paginator: VeilRestPaginator = None,
-                   extra_params: dict = None):
+                   extra_params: dict = None,
+                   stream: bool = False):
         """List of files on ECP VeiL."""
         params = dict()
         if domain:
@@ -63,4 +64,5 @@ class VeilLibrary(VeilApiObject):
             params['datapool'] = datapool
         if extra_params:
             params.update(extra_params)
-        return await super().list(paginator=paginator, extra_params=params)
+        return await super().list(paginator=paginator, extra_params=params,
+                                  stream=stream)
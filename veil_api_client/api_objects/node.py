@@ -55,20 +55,22 @@ class VeilNode(VeilApiObject):
     async def usage(self) -> 'ClientResponse':
         """Get minimum resource load statistics on a node."""
         url = self.api_object_url + 'usage/'
-        response = await self._get(url)
+        response = await self._get(url, method_name='usage')
         return response
 
-    async def list(self, paginator: Optional[VeilRestPaginator] = None) -> 'ClientResponse':  # noqa: A003,E501
+    async def list(self, paginator: Optional[VeilRestPaginator] = None,  # noqa: A003
+                   stream: bool = False) -> 'ClientResponse':
         """Get list of nodes with cluster_id filter."""
         extra_cluster_param = {'cluster': self.cluster_id} if self.cluster_id else dict()
         extra_resource_pool_param = {'resource_pool': self.resource_pool_id} if self.resource_pool_id else dict()  # noqa: E501
         extra_params = dict()
         extra_params.update(extra_cluster_param)
         extra_params.update(extra_resource_pool_param)
-        return await super().list(paginator=paginator, extra_params=extra_params)
+        return await super().list(paginator=paginator, extra_params=extra_params,
+                                  stream=stream)
 
     async def usb_devices(self):
         """Get list of usb devices."""
         url = self.api_object_url + 'usb-devices/'
-        response = await self._get(url)
+        response = await self._get(url, method_name='usb_devices')
         return response
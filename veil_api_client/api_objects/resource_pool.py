@@ -61,7 +61,8 @@ class VeilResourcePool(VeilApiObject):
         self.node_id = str(node_id) if node_id else None
         self.cluster_id = str(cluster_id) if cluster_id else None
 
-    async def list(self, paginator: VeilRestPaginator = None) -> 'VeilApiResponse':  # noqa: A003, E501
+    async def list(self, paginator: VeilRestPaginator = None,  # noqa: A003
+                   stream: bool = False) -> 'VeilApiResponse':
         """Get list of resource-pools with filters."""
         extra_node_param = {'node': self.node_id} if self.node_id else dict()
         extra_cluster_param = {'cluster': self.cluster_id} if self.cluster_id else dict()
@@ -70,4 +71,5 @@ class VeilResourcePool(VeilApiObject):
         extra_params.update(extra_node_param)
         if not extra_params:
             extra_params = None
-        return await super().list(paginator=paginator, extra_params=extra_params)
+        return await super().list(paginator=paginator, extra_params=extra_params,
+                                  stream=stream)
@@ -1,15 +1,27 @@
 # -*- coding: utf-8 -*-
 """Base package objects."""
-from .api_cache import VeilCacheAbstractClient, VeilCacheConfiguration
+from .api_cache import VeilCacheAbstractClient, VeilCacheConfiguration, VeilCacheMemoryClient
 from .api_object import (TagConfiguration, VeilApiObject, VeilApiObjectStatus,
-                         VeilRestPaginator, VeilTag, VeilTask)
+                         VeilListPageError, VeilRestPaginator, VeilTag, VeilTask)
+from .api_record import VeilApiObjectRecord
 from .api_response import VeilApiResponse
-from .utils import VeilEntityConfiguration, VeilRetryConfiguration
+from .api_stream import VeilApiResponseStream
+from .utils import (VeilCircuitBreakerConfiguration, VeilCompressionConfiguration,
+                    VeilConcurrencyConfiguration, VeilEntityConfiguration,
+                    VeilHedgingConfiguration, VeilPoolConfiguration,
+                    VeilRateLimitConfiguration, VeilRetryBudgetConfiguration,
+                    VeilRetryConfiguration, VeilTimeoutConfiguration,
+                    set_argument_type_checking)
 
 __all__ = (
     'VeilRestPaginator', 'VeilCacheConfiguration', 'VeilApiResponse',
     'VeilTag', 'VeilTask', 'TagConfiguration',
     'VeilEntityConfiguration', 'VeilApiObject',
     'VeilRetryConfiguration', 'VeilCacheAbstractClient',
-    'VeilApiObjectStatus'
+    'VeilApiObjectStatus', 'VeilPoolConfiguration', 'VeilCacheMemoryClient',
+    'VeilApiObjectRecord', 'VeilApiResponseStream', 'VeilCompressionConfiguration',
+    'VeilRateLimitConfiguration', 'VeilConcurrencyConfiguration',
+    'VeilRetryBudgetConfiguration', 'VeilCircuitBreakerConfiguration',
+    'VeilTimeoutConfiguration', 'VeilHedgingConfiguration', 'VeilListPageError',
+    'set_argument_type_checking'
 )
@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 """Veil api cache drivers."""
 import functools
+import json
 import logging
+import time
 from abc import ABCMeta, abstractmethod
-from asyncio import iscoroutinefunction
-from typing import Optional
+from asyncio import ensure_future, iscoroutinefunction
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from .utils import IntType, VeilAbstractConfiguration, VeilRetryConfiguration
 
@@ -31,6 +34,234 @@ class VeilCacheAbstractClient(metaclass=ABCMeta):
         """Abstract method for VeiLClient."""
         pass  # pragma: no cover
 
+    async def invalidate(self, urls: List[str], url_prefixes: List[str]) -> None:
+        """Remove cached responses of urls (and all urls starting with url_prefixes).
+
+        Note:
+            VeilClient calls it after each POST and PUT request. Override me.
+        """
+        return None
+
+
+class VeilCacheMemoryClient(VeilCacheAbstractClient):
+    """Bundled in-process cache client with LRU eviction and per-entry ttl.
+
+    Only successful GET responses are cached. Cached values are stored as is, so
+    the cache hit costs neither network nor serialization.
+    Cached response data is shared by all responses of the request and must not be changed.
+    If stale_ttl is set, expired value is returned immediately for stale_ttl seconds
+    while a single background task refreshes it.
+    Expired value is revalidated with If-None-Match/If-Modified-Since headers if the
+    response had ETag/Last-Modified validators, so 304 response refreshes it without a body.
+
+    Attributes:
+        max_entries: max num of cached responses.
+        max_size: max approximate size of cached responses (bytes).
+    """
+
+    __CACHEABLE_METHODS = frozenset(('get',))
+    __CACHEABLE_STATUSES = frozenset((200,))
+    __NOT_MODIFIED_STATUS = 304
+    __VALIDATOR_HEADERS = {'etag': 'If-None-Match', 'last-modified': 'If-Modified-Since'}
+
+    max_entries = IntType('max_entries')
+    max_size = IntType('max_size')
+
+    def __init__(self, max_entries: int = 1024, max_size: int = 64 * 1024 * 1024) -> None:
+        """Please see help(VeilCacheMemoryClient) for more info."""
+        self.max_entries = max_entries
+        self.max_size = max_size
+        # key -> (fresh until, stale until, approximate size, value)
+        self.__entries = OrderedDict()
+        # key -> background refresh task
+        self.__refreshing = dict()
+        self.__size = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.invalidations = 0
+        self.revalidations = 0
+
+    @staticmethod
+    def cache_key(method_name: str, url: str, headers: dict, params: dict) -> tuple:
+        """Build a hashable cache key of the request."""
+        return (method_name, url,
+                tuple(sorted((key, str(value)) for key, value in params.items())),
+                tuple(sorted((key, str(value)) for key, value in headers.items())))
+
+    @staticmethod
+    def value_size(value) -> int:
+        """Approximate size of the cached value (bytes).
+
+        Note:
+            body_size of response data received by VeilClient is the response body length.
+        """
+        body_size = value.get('body_size') if isinstance(value, dict) else None
+        if isinstance(body_size, int):
+            return body_size
+        return len(json.dumps(value, default=str))
+
+    @classmethod
+    def conditional_headers(cls, value) -> Dict[str, str]:
+        """Build conditional request headers from cached response validators."""
+        conditional_headers = dict()
+        response_headers = value.get('headers') if isinstance(value, dict) else None
+        if not isinstance(response_headers, dict):
+            return conditional_headers
+        for name, header_value in response_headers.items():
+            request_header = cls.__VALIDATOR_HEADERS.get(name.lower())
+            if request_header:
+                conditional_headers[request_header] = header_value
+        return conditional_headers
+
+    def peek(self, key: tuple):
+        """Return cached value even if it`s expired without counters and LRU update."""
+        entry = self.__entries.get(key)
+        return entry[3] if entry else None
+
+    def lookup(self, key: tuple) -> Tuple[Any, bool]:
+        """Return cached value and stale flag.
+
+        Note:
+            If there is no value or it`s older than stale_ttl - value will be None.
+        """
+        entry = self.__entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+        fresh_until, stale_until, _, value = entry
+        now = time.monotonic()
+        if stale_until <= now:
+            self.__remove(key)
+            self.misses += 1
+            return None, False
+        self.__entries.move_to_end(key)
+        if fresh_until <= now:
+            self.stale_hits += 1
+            return value, True
+        self.hits += 1
+        return value, False
+
+    def set(self, key: tuple, value, ttl: int, stale_ttl: int = 0) -> None:  # noqa: A003
+        """Save value to the cache and evict least recently used values."""
+        size = self.value_size(value)
+        if ttl <= 0 or size > self.max_size:
+            return
+        if key in self.__entries:
+            self.__remove(key)
+        fresh_until = time.monotonic() + ttl
+        self.__entries[key] = (fresh_until, fresh_until + max(stale_ttl, 0), size, value)
+        self.__size += size
+        while len(self.__entries) > self.max_entries or self.__size > self.max_size:
+            self.__remove(next(iter(self.__entries)))
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        self.__entries.clear()
+        self.__size = 0
+
+    async def invalidate(self, urls: List[str], url_prefixes: List[str]) -> None:
+        """Remove cached responses of urls (and all urls starting with url_prefixes)."""
+        url_prefixes = tuple(url_prefixes)
+        for key in list(self.__entries):
+            url = key[1]
+            if url in urls or (url_prefixes and url.startswith(url_prefixes)):
+                self.__remove(key)
+                self.invalidations += 1
+
+    def __remove(self, key: tuple) -> None:
+        """Remove cached value."""
+        _, _, size, _ = self.__entries.pop(key)
+        self.__size -= size
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters."""
+        return dict(hits=self.hits,
+                    stale_hits=self.stale_hits,
+                    misses=self.misses,
+                    evictions=self.evictions,
+                    refreshes=self.refreshes,
+                    invalidations=self.invalidations,
+                    revalidations=self.revalidations,
+                    entries=len(self.__entries),
+                    size=self.__size)
+
+    async def __fetch(self, key: tuple, ttl: int, stale_ttl: int, previous_result,
+                      veil_api_client_request_cor, veil_api_client, method_name, url: str,
+                      headers: dict, *args, **kwargs):
+        """Execute (conditional) request and cache successful response."""
+        conditional_headers = self.conditional_headers(previous_result)
+        if conditional_headers:
+            headers = dict(headers, **conditional_headers)
+        result_dict = await veil_api_client_request_cor(veil_api_client, method_name, url,
+                                                        headers, *args, **kwargs)
+        if not isinstance(result_dict, dict):
+            return result_dict  # pragma: no cover
+        status_code = result_dict.get('status_code')
+        if status_code == self.__NOT_MODIFIED_STATUS and conditional_headers:
+            logger.debug('Response for %s is not modified.', url)
+            self.revalidations += 1
+            result_dict = previous_result
+            status_code = result_dict.get('status_code')
+        if status_code in self.__CACHEABLE_STATUSES:
+            self.set(key, result_dict, ttl, stale_ttl)
+        return result_dict
+
+    async def __refresh(self, key: tuple, *args, **kwargs) -> None:
+        """Refresh stale value in background."""
+        try:
+            await self.__fetch(key, *args, **kwargs)
+        except Exception as ex_msg:
+            logger.warning('Cache value refresh failed: %s', ex_msg)
+        finally:
+            self.__refreshing.pop(key, None)
+
+    def __start_refresh(self, key: tuple, *args, **kwargs) -> None:
+        """Run single background refresh of the value."""
+        if key in self.__refreshing:
+            return
+        self.refreshes += 1
+        self.__refreshing[key] = ensure_future(self.__refresh(key, *args, **kwargs))
+
+    async def get_from_cache(self,
+                             veil_api_client_request_cor,
+                             veil_api_client,
+                             method_name,
+                             url: str,
+                             headers: dict,
+                             params: dict,
+                             ssl: bool,
+                             json_data: Optional[dict] = None,
+                             retry_opts: Optional[VeilRetryConfiguration] = None,
+                             ttl: int = 0,
+                             *args,
+                             stale_ttl: int = 0,
+                             **kwargs):
+        """Return response from the cache or execute request and cache the response."""
+        if method_name not in self.__CACHEABLE_METHODS:
+            return await veil_api_client_request_cor(veil_api_client, method_name, url,
+                                                     headers, params, ssl, json_data,
+                                                     retry_opts, *args, **kwargs)
+        key = self.cache_key(method_name=method_name, url=url, headers=headers, params=params)
+        # expired value still can be revalidated
+        previous_result = self.peek(key)
+        cached_result, stale = self.lookup(key)
+        request_args = (veil_api_client_request_cor, veil_api_client, method_name, url,
+                        headers, params, ssl, json_data, retry_opts) + args
+        if stale:
+            logger.debug('Stale response for %s found in the cache.', url)
+            self.__start_refresh(key, ttl, stale_ttl, previous_result, *request_args, **kwargs)
+            return cached_result
+        if cached_result is not None:
+            logger.debug('Response for %s found in the cache.', url)
+            return cached_result
+        return await self.__fetch(key, ttl, stale_ttl, previous_result, *request_args,
+                                  **kwargs)
+
 
 class VeilCacheConfiguration(VeilAbstractConfiguration):
     """VeilApiClient cache options.
@@ -39,16 +270,22 @@ class VeilCacheConfiguration(VeilAbstractConfiguration):
         cache_client: user custom cache class that can write and
             read request data from itself.
         ttl: cache value time to live (int).
+        stale_ttl: max time (int) after ttl expiration when the stale value can be returned
+            while it`s refreshed in background (stale-while-revalidate).
+            Cache client should accept stale_ttl keyword argument if it`s set.
     """
 
     ttl = IntType
+    stale_ttl = IntType('stale_ttl')
 
-    def __init__(self, cache_client: VeilCacheAbstractClient, ttl: int) -> None:
+    def __init__(self, cache_client: VeilCacheAbstractClient, ttl: int,
+                 stale_ttl: int = 0) -> None:
         """Please see help(VeilCacheConfiguration) for more info."""
         if cache_client and not isinstance(cache_client, VeilCacheAbstractClient):
             raise TypeError('cache_client must be VeilCacheAbstractClient descendant.')
         self.cache_client = cache_client
         self.ttl = ttl
+        self.stale_ttl = stale_ttl
 
     async def get_from_cache(self,
                              coroutine_function,
@@ -63,6 +300,9 @@ class VeilCacheConfiguration(VeilAbstractConfiguration):
                              *args, **kwargs):
         """Get response from a cache."""
         if self.cache_client and self.ttl > 0:
+            # Custom cache clients written before stale_ttl knows nothing about it.
+            if self.stale_ttl > 0:
+                kwargs['stale_ttl'] = self.stale_ttl
             return await self.cache_client.get_from_cache(coroutine_function,
                                                           client,
                                                           method_name,
@@ -87,6 +327,11 @@ class VeilCacheConfiguration(VeilAbstractConfiguration):
                                             *args, **kwargs)
         raise NotImplementedError('coroutine_function should be a coroutine function.')
 
+    async def invalidate(self, urls: List[str], url_prefixes: List[str]) -> None:
+        """Remove cached responses of changed entities."""
+        if self.cache_client and self.ttl > 0:
+            await self.cache_client.invalidate(urls=urls, url_prefixes=url_prefixes)
+
 
 def cached_response(func):
     """Cache VeilApiResponse if cache_opts are properly determined."""
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """Base api object."""
 import sys
+from asyncio import FIRST_COMPLETED, Semaphore, ensure_future, wait
 from enum import Enum
 from typing import List, Optional
 from uuid import UUID
@@ -12,10 +13,12 @@ except ImportError:  # pragma: no cover
 
 from .api_cache import VeilCacheConfiguration
 from .api_response import VeilApiResponse
+from .api_stream import VeilApiResponseStream
 from .utils import (HexColorType, NullableIntType, NullableStringType,
-                    StringType, UuidStringType, VeilAbstractConfiguration,
+                    StringType, TypeChecker, UuidStringType, VeilAbstractConfiguration,
                     VeilEntityConfiguration, VeilEntityConfigurationType,
-                    VeilRetryConfiguration, argument_type_checker_decorator)
+                    VeilRetryConfiguration, VeilTimeoutConfiguration,
+                    argument_type_checker_decorator)
 
 
 class VeilRestPaginator(VeilAbstractConfiguration):
@@ -44,6 +47,97 @@ class VeilRestPaginator(VeilAbstractConfiguration):
         self.offset = offset
 
 
+class VeilListPageError(Exception):
+    """Unsuccessful page response of VeilListIterator.
+
+    Attributes:
+        response: failed page VeilApiResponse.
+    """
+
+    def __init__(self, response: VeilApiResponse) -> None:
+        """Please see help(VeilListPageError) for more info."""
+        message = 'Page request failed with status code {}.'.format(response.status_code)
+        super().__init__(message)
+        self.response = response
+
+
+class VeilListIterator:
+    """Async iterator over all entities of VeilApiObject.list pages.
+
+    Pages are requested by offset. The next page is requested while the current page
+    entities are processed, so there are no more than 2 pages in memory.
+
+    Attributes:
+        list_cor: VeilApiObject.list bound method.
+        paginator: VeilRestPaginator with name and ordering. Offset is used as a start.
+        page_size: num of entities per page.
+        list_kwargs: additional list method arguments.
+        response: last page VeilApiResponse.
+    Note:
+        Unsuccessful page response raises VeilListPageError,
+        entities of the previous pages are already yielded.
+    """
+
+    def __init__(self, list_cor,
+                 paginator: Optional[VeilRestPaginator] = None,
+                 page_size: int = 100,
+                 **list_kwargs) -> None:
+        """Please see help(VeilListIterator) for more info."""
+        if not isinstance(page_size, int) or page_size <= 0:
+            raise TypeError('{} is not a proper page size.'.format(page_size))
+        self.__list_cor = list_cor
+        self.__name = paginator.name if paginator else None
+        self.__ordering = paginator.ordering if paginator else None
+        self.__offset = paginator.offset or 0 if paginator else 0
+        self.__page_size = page_size
+        self.__list_kwargs = list_kwargs
+        self.__page = iter(())
+        self.__next_page = None
+        self.__started = False
+        self.response = None
+
+    def __aiter__(self) -> 'VeilListIterator':
+        """Return async iterator."""
+        return self
+
+    def __request_page(self) -> None:
+        """Request next page in background."""
+        paginator = VeilRestPaginator(name=self.__name,
+                                      ordering=self.__ordering,
+                                      limit=self.__page_size,
+                                      offset=self.__offset)
+        self.__offset += self.__page_size
+        self.__next_page = ensure_future(self.__list_cor(paginator=paginator,
+                                                         **self.__list_kwargs))
+
+    async def __anext__(self) -> 'VeilApiObject':
+        """Return next entity."""
+        if not self.__started:
+            self.__started = True
+            self.__request_page()
+        while True:
+            api_object = next(self.__page, None)
+            if api_object is not None:
+                return api_object
+            if self.__next_page is None:
+                raise StopAsyncIteration
+            self.response = await self.__next_page
+            self.__next_page = None
+            if not self.response.success:
+                raise VeilListPageError(self.response)
+            page = self.response.response
+            if page and (self.response.paginator_next or self.__offset < self.response.paginator_count):  # noqa: E501
+                self.__request_page()
+            self.__page = iter(page)
+
+    async def aclose(self) -> None:
+        """Cancel requested page if iteration was stopped before the end."""
+        if self.__next_page is not None:
+            self.__next_page.cancel()
+            self.__next_page = None
+        self.__page = iter(())
+
+
 class VeilApiObjectStatus(str, Enum):
     """Veil api object possible statuses."""
 
@@ -56,6 +150,48 @@ class VeilApiObjectStatus(str, Enum):
     success = 'SUCCESS'
 
 
+class VeilApiObjectSchema:
+    """Public attributes of VeilApiObject class.
+
+    Attributes:
+        properties: names of class properties.
+        methods: names of class callable attributes.
+        class_attrs: public non-callable class attributes (properties included).
+        descriptors: type checking descriptors of class attributes.
+    """
+
+    def __init__(self, api_object_class) -> None:
+        """Please see help(VeilApiObjectSchema) for more info."""
+        self.properties = set()
+        self.methods = set()
+        self.class_attrs = dict()
+        self.descriptors = dict()
+        for klass in reversed(api_object_class.__mro__):
+            for attr, attr_value in vars(klass).items():
+                if isinstance(attr_value, TypeChecker):
+                    self.descriptors[attr] = attr_value
+        for attr in dir(api_object_class):
+            if attr.startswith('_'):
+                continue
+            try:
+                attr_value = getattr(api_object_class, attr)
+            except AttributeError:
+                # Type checking descriptors has value only on instance.
+                continue
+            if callable(attr_value):
+                self.methods.add(attr)
+                continue
+            if isinstance(attr_value, property):
+                self.properties.add(attr)
+            self.class_attrs[attr] = attr_value
+        self.properties = frozenset(self.properties)
+        self.methods = frozenset(self.methods)
+
+    def is_settable(self, attr: str) -> bool:
+        """Attribute is not private, not a property and not a method."""
+        return not attr.startswith('_') and attr not in self.properties and attr not in self.methods  # noqa: E501
+
+
 class VeilApiObject:
     """Base VeiL Api Object.
 
@@ -69,6 +205,11 @@ class VeilApiObject:
     """
 
     api_object_id = UuidStringType('api_object_id')
+    # VeilApiObject class -> VeilApiObjectSchema
+    __schemas = dict()
+    # timeouts of entity requests and entity methods requests (see set_timeouts)
+    __timeout_opts = None
+    __method_timeouts = dict()
 
     def __init__(self, client,
                  api_object_prefix: str,
@@ -97,95 +238,169 @@ class VeilApiObject:
         original_str = super().__str__()
         return '{} - {}'.format(original_str, self.__api_object_prefix)
 
+    @classmethod
+    def schema(cls) -> 'VeilApiObjectSchema':
+        """Return public attributes schema computed once per class."""
+        schema = cls.__schemas.get(cls)
+        if schema is None:
+            schema = VeilApiObjectSchema(cls)
+            cls.__schemas[cls] = schema
+        return schema
+
     def update_public_attrs(self, attrs_dict: dict) -> None:
         """Update public class attributes ignoring property."""
-        public_attrs = dict()
-        for attr in attrs_dict:
-            if attr not in self.public_attrs:
-                continue
-            public_attrs[attr] = attrs_dict[attr]
-        self.update_or_set_public_attrs(public_attrs)
+        public_attrs = self.public_attrs
+        attrs = {attr: attrs_dict[attr] for attr in attrs_dict if attr in public_attrs}
+        self.update_or_set_public_attrs(attrs)
+
+    def update_or_set_public_attrs(self, attrs_dict: dict, trusted: bool = False) -> None:
+        """Update or set class public attributes ignoring property.
 
-    def update_or_set_public_attrs(self, attrs_dict: dict) -> None:
-        """Update or set class public attributes ignoring property."""
+        Values from trusted source (VeiL ECP response) are set without type checking.
+        """
+        schema = self.schema()
+        descriptors = schema.descriptors if trusted else None
         for attr in attrs_dict:
-            if attr.startswith('_'):
-                continue
-            if hasattr(self.__class__, attr) and callable(getattr(self.__class__, attr)):
+            if not schema.is_settable(attr):
                 continue
+            value = attrs_dict[attr]
             if attr == 'id':
                 # id not in public attrs, but we need to set api_object_id if it`s not set earlier.  # noqa: E501
-                self.__setattr__('api_object_id', attrs_dict[attr])
+                attr = 'api_object_id'
+            if descriptors and attr in descriptors:
+                descriptors[attr].set_trusted(self, value)
                 continue
-            if attr in self.public_attrs and isinstance(self.public_attrs[attr], property):
-                continue
-            self.__setattr__(attr, attrs_dict[attr])
+            self.__setattr__(attr, value)
 
     def copy(self):
         """Return new class instance with preconfigured parameters."""
         return self.__class__(client=self._client, api_object_id=self.api_object_id)
 
+    def set_timeouts(self, timeout_opts: Optional[VeilTimeoutConfiguration] = None,
+                     **method_timeouts) -> 'VeilApiObject':
+        """Set timeouts of entity requests and of requests sent by entity methods.
+
+        Note:
+            methods like is_ok or enable_remote_access use timeouts of the method they call.
+
+        Example:
+            controller = client.controller()
+            controller.set_timeouts(check=VeilTimeoutConfiguration(total=1))
+            domain = client.domain().set_timeouts(list=VeilTimeoutConfiguration(total=600))
+        """
+        for opts in (timeout_opts,) + tuple(method_timeouts.values()):
+            if opts is not None and not isinstance(opts, VeilTimeoutConfiguration):
+                raise TypeError('{} is not a VeilTimeoutConfiguration.'.format(opts))
+        for method_name in method_timeouts:
+            method = getattr(self.__class__, method_name, None)
+            if method_name.startswith('_') or not callable(method):
+                raise TypeError('{} has no method {}.'.format(self.__class__.__name__,
+                                                              method_name))
+        self.__timeout_opts = timeout_opts
+        self.__method_timeouts = method_timeouts
+        return self
+
+    def __request_timeout(self, timeout_opts: Optional[VeilTimeoutConfiguration],
+                          method_name: Optional[str]
+                          ) -> Optional[VeilTimeoutConfiguration]:
+        """Return timeouts of the request sent by _get, _post or _put."""
+        if timeout_opts:
+            return timeout_opts
+        if method_name in self.__method_timeouts:
+            return self.__method_timeouts[method_name]
+        return self.__timeout_opts
+
     async def _get(self, url: str, extra_params: Optional[dict] = None,
                    extra_headers: Optional[dict] = None,
                    retry_opts: Optional[VeilRetryConfiguration] = None,
-                   cache_opts: Optional[VeilCacheConfiguration] = None) -> 'ClientResponse':
+                   cache_opts: Optional[VeilCacheConfiguration] = None,
+                   timeout_opts: Optional[VeilTimeoutConfiguration] = None,
+                   method_name: Optional[str] = None,
+                   stream: bool = False
+                   ) -> 'ClientResponse':
         """Layer for calling a client GET method.
 
         Note:
             retry_opts will override self.retry_opts
+            timeout_opts will override timeouts set by set_timeouts
+            method_name is the entity method whose timeouts are used
+            stream - return VeilApiResponseStream (see list_stream)
         """
         if not retry_opts:
             retry_opts = self.retry_opts
         if not cache_opts:
             cache_opts = self.cache_opts
+        timeout_opts = self.__request_timeout(timeout_opts, method_name)
+        if stream:
+            return await self._client.stream(api_object=self,
+                                             url=url,
+                                             extra_params=extra_params,
+                                             extra_headers=extra_headers,
+                                             retry_opts=retry_opts,
+                                             timeout_opts=timeout_opts)
         return await self._client.get(api_object=self,
                                       url=url,
                                       extra_params=extra_params,
                                       extra_headers=extra_headers,
                                       retry_opts=retry_opts,
-                                      cache_opts=cache_opts)
+                                      cache_opts=cache_opts,
+                                      timeout_opts=timeout_opts)
 
     async def _post(self, url: str,
                     json_data: Optional[dict] = None,
                     extra_params: Optional[dict] = None,
                     retry_opts: Optional[VeilRetryConfiguration] = None,
-                    cache_opts: Optional[VeilCacheConfiguration] = None) -> 'ClientResponse':
+                    cache_opts: Optional[VeilCacheConfiguration] = None,
+                    timeout_opts: Optional[VeilTimeoutConfiguration] = None,
+                    method_name: Optional[str] = None
+                    ) -> 'ClientResponse':
         """Layer for calling a client POST method.
 
         Note:
             retry_opts will override self.retry_opts
+            timeout_opts will override timeouts set by set_timeouts
+            method_name is the entity method whose timeouts are used
         """
         if not retry_opts:
             retry_opts = self.retry_opts
         if not cache_opts:
             cache_opts = self.cache_opts
+        timeout_opts = self.__request_timeout(timeout_opts, method_name)
         return await self._client.post(api_object=self,
                                        url=url,
                                        json_data=json_data,
                                        extra_params=extra_params,
                                        retry_opts=retry_opts,
-                                       cache_opts=cache_opts)
+                                       cache_opts=cache_opts,
+                                       timeout_opts=timeout_opts)
 
     async def _put(self, url: str,
                    json_data: Optional[dict] = None,
                    extra_params: Optional[dict] = None,
                    retry_opts: Optional[VeilRetryConfiguration] = None,
-                   cache_opts: Optional[VeilCacheConfiguration] = None) -> 'ClientResponse':
+                   cache_opts: Optional[VeilCacheConfiguration] = None,
+                   timeout_opts: Optional[VeilTimeoutConfiguration] = None,
+                   method_name: Optional[str] = None
+                   ) -> 'ClientResponse':
         """Layer for calling a client PUT method.
 
         Note:
             retry_opts will override self.retry_opts
+            timeout_opts will override timeouts set by set_timeouts
+            method_name is the entity method whose timeouts are used
         """
         if not retry_opts:
             retry_opts = self.retry_opts
         if not cache_opts:
             cache_opts = self.cache_opts
+        timeout_opts = self.__request_timeout(timeout_opts, method_name)
         return await self._client.put(api_object=self,
                                       url=url,
                                       json_data=json_data,
                                       extra_params=extra_params,
                                       retry_opts=retry_opts,
-                                      cache_opts=cache_opts)
+                                      cache_opts=cache_opts,
+                                      timeout_opts=timeout_opts)
 
     @property
     def api_entity_class(self):
@@ -203,16 +418,11 @@ class VeilApiObject:
     @property
     def public_attrs(self) -> dict:
         """Return dictionary of class public attributes and properties."""
-        result_dict = dict()
-        for attr in dir(self):
-            if attr.startswith('_'):
-                continue
-            if hasattr(self.__class__, attr) and callable(getattr(self.__class__, attr)):
+        schema = self.schema()
+        result_dict = dict(schema.class_attrs)
+        for attr, attr_value in self.__dict__.items():
+            if attr.startswith('_') or attr in schema.methods or attr in result_dict:
                 continue
-            if hasattr(self.__class__, attr):
-                attr_value = getattr(self.__class__, attr)
-            else:
-                attr_value = self.__getattribute__(attr)
             result_dict[attr] = attr_value
         return result_dict
 
@@ -278,19 +488,111 @@ class VeilApiObject:
 
     @argument_type_checker_decorator  # noqa: A003
     async def list(self, paginator: VeilRestPaginator = None,
-                   extra_params: dict = None, extra_headers: dict = None):
+                   extra_params: dict = None, extra_headers: dict = None,
+                   stream: bool = False):
         """List all objects of Veil api object class."""
         params = paginator.notnull_attrs if paginator else dict()
         if extra_params:
             params.update(extra_params)
         return await self._get(self.base_url, extra_params=params,
-                               extra_headers=extra_headers)
+                               extra_headers=extra_headers, method_name='list',
+                               stream=stream)
+
+    async def list_stream(self, **list_kwargs) -> VeilApiResponseStream:
+        """Send list() request and return async iterator over streamed response entities.
+
+        Entities are parsed and yielded as soon as they are received, count and next
+        are available when stream is finished.
+
+        Example:
+            stream = await client.domain().list_stream(fields=['__all__'])
+            async with stream:
+                async for domain in stream:
+                    print(domain.verbose_name)
+            print(stream.paginator_count)
+        """
+        return await self.list(stream=True, **list_kwargs)
+
+    def iter_all(self, paginator: Optional[VeilRestPaginator] = None,
+                 page_size: int = 100,
+                 **list_kwargs) -> 'VeilListIterator':
+        """Async iterator over all entities of the list() pages.
+
+        Raises VeilListPageError with the failed page response on unsuccessful page.
+        Example:
+            async for domain in client.domain().iter_all(page_size=500, fields=['__all__']):
+                print(domain.verbose_name)
+        """
+        return VeilListIterator(self.list, paginator=paginator, page_size=page_size,
+                                **list_kwargs)
+
+    async def list_all(self, paginator: Optional[VeilRestPaginator] = None,
+                       page_size: int = 100,
+                       concurrency: int = 4,
+                       **list_kwargs) -> 'VeilApiResponse':
+        """Get all list() pages concurrently and return them as a single response.
+
+        Paginator name and ordering are used for every page, limit is set by page_size.
+        1. Request first page and read paginator_count.
+        2. Request remaining pages by offset (no more than concurrency at once).
+        3. Merge page results in order. Entities shifted between pages are deduplicated by id.
+        Note:
+            If any page request is failed - failed page response will be returned
+            and other page requests will be cancelled.
+            Response count is paginator_count of the first page.
+        """
+        if not isinstance(page_size, int) or page_size <= 0:
+            raise TypeError('{} is not a proper page size.'.format(page_size))
+        if not isinstance(concurrency, int) or concurrency <= 0:
+            raise TypeError('{} is not a proper concurrency.'.format(concurrency))
+        name = paginator.name if paginator else None
+        ordering = paginator.ordering if paginator else None
+        semaphore = Semaphore(concurrency)
+
+        async def get_page(offset: int) -> 'VeilApiResponse':
+            page_paginator = VeilRestPaginator(name=name, ordering=ordering,
+                                               limit=page_size, offset=offset)
+            async with semaphore:
+                return await self.list(paginator=page_paginator, **list_kwargs)
+
+        first_page = await get_page(0)
+        if not first_page.success:
+            return first_page
+        offsets = range(page_size, first_page.paginator_count, page_size)
+        tasks = [ensure_future(get_page(offset)) for offset in offsets]
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                for task in done:
+                    page = task.result()
+                    if not page.success:
+                        return page
+        finally:
+            # the first failure cancels remaining pages
+            for task in pending:
+                task.cancel()
+        pages = [first_page] + [task.result() for task in tasks]
+        results = list()
+        known_ids = set()
+        for page in pages:
+            for result in page.paginator_results:
+                result_id = result.get('id') if isinstance(result, dict) else None
+                if result_id is not None:
+                    if result_id in known_ids:
+                        continue
+                    known_ids.add(result_id)
+                results.append(result)
+        data = dict(count=first_page.paginator_count, next=None, previous=None,
+                    results=results)
+        return VeilApiResponse(status_code=first_page.status_code, data=data,
+                               headers=first_page.headers, api_object=self)
 
     async def info(self):
         """Get api object instance and update public attrs."""
-        response = await self._get(self.api_object_url)
+        response = await self._get(self.api_object_url, method_name='info')
         if response.status_code == 200 and response.data:
-            self.update_or_set_public_attrs(response.data)
+            self.update_or_set_public_attrs(response.data, trusted=True)
         return response
 
     async def tags_list(self, paginator: VeilRestPaginator = None):
@@ -343,38 +645,38 @@ class VeilTask(VeilApiObject):
         Probably don`t need.
         """
         url = self.base_url + 'check/'
-        response = await self._put(url)
+        response = await self._put(url, method_name='check')
         return response
 
     async def count(self) -> 'VeilApiResponse':
         """Task counters endpoint."""
         url = self.base_url + 'count/'
-        response = await self._get(url)
+        response = await self._get(url, method_name='count')
         return response
 
     async def cancel(self) -> 'VeilApiResponse':
         """Exit tasks endpoint."""
         url = self.api_object_url + 'cancel/'
         body = dict(force=True)
-        response = await self._put(url, json_data=body)
+        response = await self._put(url, json_data=body, method_name='cancel')
         return response
 
     async def jid(self) -> 'VeilApiResponse':
         """Endpoint of receiving jid of a separate task."""
         url = self.api_object_url + 'jid/'
-        response = await self._get(url)
+        response = await self._get(url, method_name='jid')
         return response
 
     async def release_locks(self) -> 'VeilApiResponse':
         """Endpoint to reset locks from tasks."""
         url = self.api_object_url + 'release-locks/'
-        response = await self._put(url)
+        response = await self._put(url, method_name='release_locks')
         return response
 
     async def response(self) -> 'VeilApiResponse':
         """Endpoint of receiving a response from the node."""
         url = self.api_object_url + 'response/'
-        response = await self._get(url)
+        response = await self._get(url, method_name='response')
         return response
 
     @property
@@ -434,7 +736,8 @@ class VeilTask(VeilApiObject):
     async def list(self, paginator: VeilRestPaginator = None,
                    extra_params: dict = None,
                    parent: str = None,
-                   status: VeilApiObjectStatus = None):
+                   status: VeilApiObjectStatus = None,
+                   stream: bool = False):
         """List all tasks/subtasks of Veil api object class."""
         params = dict()
         if extra_params:
@@ -443,7 +746,8 @@ class VeilTask(VeilApiObject):
             params['parent'] = parent
         if status:
             params['status'] = status.value
-        return await super().list(paginator=paginator, extra_params=params)
+        return await super().list(paginator=paginator, extra_params=params,
+                                  stream=stream)
 
 
 class TagConfiguration(VeilAbstractConfiguration):
@@ -504,7 +808,8 @@ class VeilTag(VeilApiObject):
     async def create(self, tag_configuration: TagConfiguration) -> 'ClientResponse':
         """Run tag create on VeiL ECP."""
         response = await self._post(url=self.base_url,
-                                    json_data=tag_configuration.notnull_attrs)
+                                    json_data=tag_configuration.notnull_attrs,
+                                    method_name='create')
         return response
 
     async def update(self,
@@ -521,20 +826,21 @@ class VeilTag(VeilApiObject):
             TagConfiguration(colour=colour, verbose_name='empty')
             update_dict['colour'] = colour
         response = await self._put(url=self.api_object_url,
-                                   json_data=update_dict)
+                                   json_data=update_dict, method_name='update')
         return response
 
     async def remove(self) -> 'ClientResponse':
         """Remove tag instance on VeiL ECP."""
         url = self.action_url('remove/')
-        response = await self._post(url=url)
+        response = await self._post(url=url, method_name='remove')
         return response
 
     @argument_type_checker_decorator
     async def add_entity(self, entity_configuration: VeilEntityConfiguration):
         """Add a Tag to a VeiL Entity."""
         url = self.action_url('add-entity/')
-        response = await self._post(url=url, json_data=entity_configuration.notnull_attrs)
+        response = await self._post(url=url, json_data=entity_configuration.notnull_attrs,
+                                    method_name='add_entity')
         return response
 
     @staticmethod
@@ -548,21 +854,22 @@ class VeilTag(VeilApiObject):
         """Add a Tag to a VeiL Entities."""
         url = self.action_url('add-entities/')
         data = self.convert_entities(entities_conf)
-        response = await self._post(url=url, json_data=data)
+        response = await self._post(url=url, json_data=data, method_name='add_entities')
         return response
 
     @argument_type_checker_decorator
     async def remove_entity(self, entity_configuration: VeilEntityConfiguration):
         """Remove a Tag from a VeiL Entity."""
         url = self.action_url('remove-entity/')
-        response = await self._post(url=url, json_data=entity_configuration.notnull_attrs)
+        response = await self._post(url=url, json_data=entity_configuration.notnull_attrs,
+                                    method_name='remove_entity')
         return response
 
     async def remove_entities(self, entities_conf: List[VeilEntityConfiguration]):
         """Remove a Tag from a VeiL Entities."""
         url = self.action_url('remove-entities/')
         data = self.convert_entities(entities_conf)
-        response = await self._post(url=url, json_data=data)
+        response = await self._post(url=url, json_data=data, method_name='remove_entities')
         return response
 
     @argument_type_checker_decorator  # noqa: A003
@@ -571,7 +878,8 @@ class VeilTag(VeilApiObject):
                    entity_class: Optional[str] = None,
                    paginator: VeilRestPaginator = None,
                    extra_params: dict = None,
-                   name: Optional[str] = None):
+                   name: Optional[str] = None,
+                   stream: bool = False):
         """List of tags on ECP VeiL."""
         params = dict()
         if entity_uuid:
@@ -582,4 +890,5 @@ class VeilTag(VeilApiObject):
             params.update(extra_params)
         if name:
             params['name'] = name
-        return await super().list(paginator=paginator, extra_params=params)
+        return await super().list(paginator=paginator, extra_params=params,
+                                  stream=stream)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Compact read-only records of VeiL api objects."""
+from collections import OrderedDict
+
+
+class VeilApiObjectRecord:
+    """Read-only slotted record with public attributes of VeilApiObject.
+
+    Records don't have per-instance __dict__ and don't hold client, retry or cache
+    references - all records of one response share a single template api object.
+    Use upgrade() to get a full VeilApiObject instance.
+
+    Attributes:
+        _api_object: template VeilApiObject instance shared by records.
+        _fields: names of record attributes.
+    """
+
+    __slots__ = ('_api_object',)
+    _fields = tuple()
+    # (VeilApiObject class, sorted fields) -> record class, least recently used first
+    __record_types = OrderedDict()
+    __MAX_RECORD_TYPES = 256
+
+    def __init__(self, api_object, values: dict) -> None:
+        """Please see help(VeilApiObjectRecord) for more info."""
+        object.__setattr__(self, '_api_object', api_object)
+        for field in self._fields:
+            object.__setattr__(self, field, values.get(field))
+
+    def __setattr__(self, name, value):
+        """Forbid changes - records are read-only."""
+        raise AttributeError('{} is read-only.'.format(self.__class__.__name__))
+
+    def __delattr__(self, name):
+        """Forbid changes - records are read-only."""
+        raise AttributeError('{} is read-only.'.format(self.__class__.__name__))
+
+    def __repr__(self):
+        """Show the same info as VeilApiObject repr."""
+        return '<{} : {} : {}>'.format(self.__class__.__name__,
+                                       getattr(self, 'api_object_id', None),
+                                       getattr(self, 'verbose_name', None))
+
+    @classmethod
+    def record_type(cls, api_object_class, fields: tuple):
+        """Return record class with fields slots created once per fields set.
+
+        Note:
+            record fields are sorted, num of cached record classes is limited.
+        """
+        fields = tuple(sorted(fields))
+        key = (api_object_class, fields)
+        record_types = cls.__record_types
+        record_class = record_types.get(key)
+        if record_class is None:
+            record_class = type(api_object_class.__name__ + 'Record', (cls,),
+                                {'__slots__': fields, '_fields': fields})
+            record_types[key] = record_class
+            if len(record_types) > cls.__MAX_RECORD_TYPES:
+                record_types.popitem(last=False)
+        else:
+            record_types.move_to_end(key)
+        return record_class
+
+    @classmethod
+    def from_results(cls, api_object, results: list) -> list:
+        """Build records for entity dictionaries the same way as VeilApiObject.copy() does.
+
+        Configuration attributes (retry_opts, cache_opts) are not copied to records.
+        Fields named as record attributes (upgrade, as_dict, etc) are skipped.
+        """
+        template = api_object.copy()
+        schema = template.schema()
+        defaults = {attr: value for attr, value in vars(template).items()
+                    if schema.is_settable(attr) and attr not in ('retry_opts', 'cache_opts')
+                    and not hasattr(cls, attr)}
+        fields = list(defaults)
+        known_fields = set(fields)
+        for result in results:
+            for attr in result:
+                if attr in known_fields or attr == 'id' or hasattr(cls, attr):
+                    continue
+                if schema.is_settable(attr):
+                    known_fields.add(attr)
+                    fields.append(attr)
+        record_class = cls.record_type(template.__class__, tuple(fields))
+        records = list()
+        for result in results:
+            values = dict(defaults)
+            for attr, value in result.items():
+                # id value is not set, VeilApiObject sets api_object_id from it
+                values['api_object_id' if attr == 'id' else attr] = value
+            records.append(record_class(template, values))
+        return records
+
+    def as_dict(self) -> dict:
+        """Record attributes dictionary."""
+        return {field: getattr(self, field) for field in self._fields}
+
+    def upgrade(self):
+        """Return full VeilApiObject instance with record attributes.
+
+        Record values are from VeiL ECP response, so they are set as trusted.
+        """
+        inst = self._api_object.copy()
+        values = self.as_dict()
+        # id is set to api_object_id by update_or_set_public_attrs, record id field is None
+        values.pop('id', None)
+        inst.update_or_set_public_attrs(values, trusted=True)
+        return inst
@@ -1,10 +1,70 @@
 # -*- coding: utf-8 -*-
 """Veil api response."""
 import logging
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable
+
+from .api_record import VeilApiObjectRecord
 
 logger = logging.getLogger('veil-api-client.response')
 logger.addHandler(logging.NullHandler())
 
+# numpy module, None - not imported yet, False - not installed (see _numpy)
+numpy = None
+
+
+def _numpy():
+    """Import numpy on the first columns() call - it`s slow to import."""
+    global numpy
+    if numpy is None:
+        try:
+            import numpy as numpy_module
+        except ImportError:
+            numpy_module = False
+        numpy = numpy_module
+    return numpy or None
+
+
+class VeilApiObjectSequence(Sequence):
+    """Read-only sequence of VeilApiObject entities materialized on demand.
+
+    Attributes:
+        api_object: calling VeilApiObject instance to copy.
+        results: list of entity dictionaries from response data.
+    """
+
+    def __init__(self, api_object, results: list) -> None:
+        """Please see help(VeilApiObjectSequence) for more info."""
+        self.api_object = api_object
+        self.results = results
+        self.__instances = [None] * len(results)
+
+    def __repr__(self):
+        """Show only materialized entities count."""
+        return '<{}: {} of {} materialized>'.format(self.__class__.__name__,
+                                                    self.materialized, len(self))
+
+    def __len__(self):
+        """Count of entities in response."""
+        return len(self.results)
+
+    def __getitem__(self, index):
+        """Materialize entity (or slice of entities) on first access."""
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        inst = self.__instances[index]
+        if inst is None:
+            inst = self.api_object.copy()
+            inst.update_or_set_public_attrs(self.results[index], trusted=True)
+            self.__instances[index] = inst
+        return inst
+
+    @property
+    def materialized(self) -> int:
+        """Count of already materialized entities."""
+        return len(self.__instances) - self.__instances.count(None)
+
 
 class VeilApiResponse:
     """VeiL api response object.
@@ -17,7 +77,12 @@ class VeilApiResponse:
     Properties:
         paginator_results: value of results key from response data. May presents only in list() queries.
         value: value of single-count entity from response data. May present in info() query.
-        response: list with calling VeilApiObject entities instances.
+        response: list with calling VeilApiObject entities instances. Built once on first access.
+        lazy_response: sequence of calling VeilApiObject entities materialized on demand.
+        compact_response: list with read-only slotted records of calling VeilApiObject entities.
+
+    Methods:
+        columns: columnar view of paginator results.
         task: VeilTask if response status_code is 202.
         success: success flag of response.
         error_code: VeiL error code from response. If there are several errors - only 1st will be returned.
@@ -33,6 +98,9 @@ class VeilApiResponse:
         self.data = data
         self.headers = headers
         self.__api_object = api_object
+        self.__lazy_response = None
+        self.__response = None
+        self.__compact_response = None
         if status_code not in self.__SUCCESS_STATUSES:
             logger.warning('request status code is %s', status_code)
             logger.warning('response data: %s', data)
@@ -83,6 +151,19 @@ class VeilApiResponse:
         else:
             return self.data
 
+    @property
+    def lazy_response(self) -> VeilApiObjectSequence:
+        """Sequence with calling VeilApiObject entities instances.
+
+        Entities are materialized on first access by index, so taking
+        a few entities from a large page does not copy the whole page.
+        """
+        data = self.data
+        if self.__lazy_response is None or self.__lazy_response[0] is not data:
+            self.__lazy_response = (data, VeilApiObjectSequence(self.__api_object,
+                                                                self.__response_results()))
+        return self.__lazy_response[1]
+
     @property
     def response(self) -> list:
         """List with calling VeilApiObject entities instances.
@@ -90,20 +171,71 @@ class VeilApiResponse:
         1. Determine calling VeilApiObject instance to copy.
         2. Determine response type (paginator or info).
         3. Return list with 1-M elements.
+        List is built once and reused until data is replaced.
         :return:
         """
-        api_object_list = list()
-        if self.__api_object:
-            if self.paginator_results:
-                for result in self.paginator_results:
-                    inst = self.__api_object.copy()
-                    inst.update_or_set_public_attrs(result)
-                    api_object_list.append(inst)
-            elif isinstance(self.value, dict) and self.value.get('count', None) != 0:
-                inst = self.__api_object.copy()
-                inst.update_or_set_public_attrs(self.value)
-                api_object_list.append(inst)
-        return api_object_list
+        data = self.data
+        if self.__response is None or self.__response[0] is not data:
+            self.__response = (data, list(self.lazy_response))
+        return self.__response[1]
+
+    @property
+    def compact_response(self) -> list:
+        """List with VeilApiObjectRecord of calling VeilApiObject entities.
+
+        Records have the same public attributes as entities, but take much less memory.
+        Use record.upgrade() to get a full VeilApiObject instance.
+        """
+        data = self.data
+        if self.__compact_response is None or self.__compact_response[0] is not data:
+            results = self.__response_results()
+            records = VeilApiObjectRecord.from_results(self.__api_object, results) if results else list()  # noqa: E501
+            self.__compact_response = (data, records)
+        return self.__compact_response[1]
+
+    def columns(self, names: Iterable[str]) -> Dict[str, Sequence]:
+        """Columnar view of paginator results without VeilApiObject instances.
+
+        Columns are built in one pass over paginator_results. Integer columns are
+        array('q'), numeric columns with floats or missing values are array('d') with nan
+        for missing values. With NumPy installed numeric columns are numpy arrays.
+        Non-numeric columns are lists.
+        """
+        names = tuple(names)
+        values = {name: list() for name in names}
+        for result in self.paginator_results:
+            for name in names:
+                values[name].append(result.get(name))
+        return {name: self.__column(values[name]) for name in names}
+
+    @staticmethod
+    def __column(values: list) -> Sequence:
+        """Convert column values to typed array if possible."""
+        typecode = 'q'
+        for value in values:
+            if value is None or isinstance(value, float):
+                typecode = 'd'
+            elif not isinstance(value, int):
+                return values
+        if typecode == 'd':
+            values = [float('nan') if value is None else value for value in values]
+        numpy_module = _numpy()
+        if numpy_module is not None:
+            dtype = numpy_module.int64 if typecode == 'q' else numpy_module.float64
+            return numpy_module.array(values, dtype=dtype)
+        return array(typecode, values)
+
+    def __response_results(self) -> list:
+        """Entity dictionaries for paginator or info response."""
+        if not self.__api_object:
+            return list()
+        paginator_results = self.paginator_results
+        if paginator_results:
+            return paginator_results
+        value = self.value
+        if isinstance(value, dict) and value.get('count', None) != 0:
+            return [value]
+        return list()
 
     @property
     def task(self):
@@ -111,7 +243,7 @@ class VeilApiResponse:
         if self.status_code != 202 or not isinstance(self.data, dict) or not self.data.get('_task'):  # noqa: E501
             return
         task_inst = self.__api_object.task
-        task_inst.update_or_set_public_attrs(self.data['_task'])
+        task_inst.update_or_set_public_attrs(self.data['_task'], trusted=True)
         return task_inst
 
     @property
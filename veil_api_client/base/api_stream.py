@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""Streaming parsing of VeiL list() responses."""
+import json
+import re
+from collections import deque
+
+from .api_response import VeilApiResponse
+
+
+class VeilResultsParser:
+    """Incremental parser of the top-level results array of VeiL list() response.
+
+    Every complete element of the results array is parsed as soon as it is fed.
+    Other response data (count, next, previous) is available after close().
+
+    Attributes:
+        loads: function that parses json bytes.
+        key: name of top-level key with array to parse incrementally.
+    """
+
+    __TOKEN_RE = re.compile(rb'["{}\[\],]')
+    __STRING_RE = re.compile(rb'["\\]')
+
+    def __init__(self, loads=json.loads, key: str = 'results') -> None:
+        """Please see help(VeilResultsParser) for more info."""
+        self.loads = loads
+        self.key = key.encode('utf-8')
+        self.__buffer = bytearray()
+        # not yet moved to envelope data outside of results array
+        self.__envelope = bytearray()
+        self.__envelope_start = 0
+        self.__pos = 0
+        self.__depth = 0
+        self.__in_string = False
+        self.__string_start = 0
+        self.__last_string = None
+        self.__in_results = False
+        self.__results_found = False
+        self.__item_start = 0
+
+    def feed(self, chunk: bytes) -> list:
+        """Parse next chunk and return list of complete results elements."""
+        buffer = self.__buffer
+        buffer.extend(chunk)
+        items = list()
+        pos = self.__pos
+        while True:
+            if self.__in_string:
+                match = self.__STRING_RE.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == b'\\':
+                    if match.end() >= len(buffer):
+                        # escaped char is in the next chunk
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                pos = match.end()
+                self.__in_string = False
+                if self.__depth == 1:
+                    self.__last_string = bytes(buffer[self.__string_start + 1:match.start()])
+                continue
+            match = self.__TOKEN_RE.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            token = match.group()
+            pos = match.end()
+            if token == b'"':
+                self.__in_string = True
+                self.__string_start = match.start()
+            elif token in (b'{', b'['):
+                self.__depth += 1
+                if token == b'[' and self.__depth == 2 and not self.__results_found and self.__last_string == self.key:  # noqa: E501
+                    # results array is replaced by empty array in envelope
+                    self.__envelope.extend(buffer[self.__envelope_start:pos])
+                    self.__in_results = self.__results_found = True
+                    self.__item_start = pos
+            elif token in (b'}', b']'):
+                if self.__in_results and self.__depth == 2:
+                    self.__add_item(items, buffer[self.__item_start:match.start()])
+                    self.__in_results = False
+                    self.__envelope_start = match.start()
+                self.__depth -= 1
+            elif self.__in_results and self.__depth == 2:
+                self.__add_item(items, buffer[self.__item_start:match.start()])
+                self.__item_start = pos
+        self.__pos = pos
+        self.__trim()
+        return items
+
+    def close(self):
+        """Return response data without parsed results elements."""
+        self.__envelope.extend(self.__buffer[self.__envelope_start:])
+        self.__buffer = bytearray()
+        self.__envelope_start = self.__pos = 0
+        envelope = bytes(self.__envelope).strip()
+        return self.loads(envelope) if envelope else None
+
+    def __add_item(self, items: list, item: bytearray) -> None:
+        """Parse results element if it is not empty."""
+        item = bytes(item).strip()
+        if item:
+            items.append(self.loads(item))
+
+    def __trim(self) -> None:
+        """Remove processed data from buffer."""
+        if self.__in_results:
+            keep = self.__item_start
+        else:
+            keep = self.__string_start if self.__in_string else self.__pos
+            self.__envelope.extend(self.__buffer[self.__envelope_start:keep])
+            self.__envelope_start = keep
+        if not keep:
+            return
+        del self.__buffer[:keep]
+        self.__pos -= keep
+        self.__envelope_start -= keep
+        self.__item_start -= keep
+        self.__string_start -= keep
+
+
+class VeilApiResponseStream:
+    """Async iterator over list() entities parsed from response stream.
+
+    Entities are yielded as soon as they are received. Response data without
+    results (count, next, previous) is available when stream is finished.
+
+    Attributes:
+        status_code: http response status code.
+        headers: response headers.
+        chunk_size: size of response content chunk to read.
+
+    Properties:
+        finished: stream is fully read and closed.
+        response: VeilApiResponse without results. Will be None until stream is finished.
+        success: success flag of response.
+        paginator_count: value of count from response data.
+        paginator_next: value of next from response data.
+        paginator_previous: value of previous from response data.
+    """
+
+    def __init__(self, api_object, status_code: int, headers: dict,
+                 data=None, content=None, loads=json.loads, close=None,
+                 chunk_size: int = 64 * 1024) -> None:
+        """Please see help(VeilApiResponseStream) for more info.
+
+        Note:
+            If content (aiohttp.StreamReader) is not passed, data is a complete response data.
+            close is a coroutine function that releases response connection.
+        """
+        self.status_code = status_code
+        self.headers = headers
+        self.chunk_size = chunk_size
+        self.__api_object = api_object
+        self.__content = content
+        self.__close = close
+        self.__parser = VeilResultsParser(loads=loads) if content is not None else None
+        self.__rows = deque()
+        self.__response = None
+        if content is None:
+            self.__response = VeilApiResponse(status_code=status_code, data=data,
+                                              headers=headers, api_object=api_object)
+
+    def __aiter__(self) -> 'VeilApiResponseStream':
+        """Return async iterator."""
+        return self
+
+    async def __anext__(self):
+        """Return next entity parsed from response stream."""
+        while not self.__rows:
+            if self.__content is None:
+                raise StopAsyncIteration
+            chunk = await self.__content.read(self.chunk_size)
+            if not chunk:
+                data = self.__parser.close()
+                await self.aclose()
+                self.__response = VeilApiResponse(status_code=self.status_code, data=data,
+                                                  headers=self.headers,
+                                                  api_object=self.__api_object)
+                raise StopAsyncIteration
+            self.__rows.extend(self.__parser.feed(chunk))
+        inst = self.__api_object.copy()
+        inst.update_or_set_public_attrs(self.__rows.popleft(), trusted=True)
+        return inst
+
+    async def __aenter__(self) -> 'VeilApiResponseStream':
+        """Async context manager enter."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Async context manager exit - release response connection."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop reading and release response connection."""
+        self.__content = None
+        self.__rows.clear()
+        if self.__close is not None:
+            close, self.__close = self.__close, None
+            await close()
+
+    @property
+    def finished(self) -> bool:
+        """Stream is fully read and closed."""
+        return self.__response is not None
+
+    @property
+    def response(self) -> VeilApiResponse:
+        """Return VeilApiResponse without results. Will be None until stream is finished."""
+        return self.__response
+
+    @property
+    def success(self) -> bool:
+        """Determine that requests response goes well."""
+        return self.__response.success if self.__response else self.status_code == 200
+
+    @property
+    def paginator_count(self) -> int:
+        """Value of count from response data. Will be 0 until stream is finished."""
+        return self.__response.paginator_count if self.__response else 0
+
+    @property
+    def paginator_next(self) -> str:
+        """Value of next from response data. Will be None until stream is finished."""
+        return self.__response.paginator_next if self.__response else None
+
+    @property
+    def paginator_previous(self) -> str:
+        """Value of previous from response data. Will be None until stream is finished."""
+        return self.__response.paginator_previous if self.__response else None
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 """Utilities."""
 import functools
+import gzip
 import inspect
 import re
+import ssl
 import typing
+import zlib
 from abc import ABCMeta, abstractmethod
 from uuid import UUID
 
@@ -13,6 +16,11 @@ try:
 except ImportError:  # pragma: no cover
     ClientResponse = None
 
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
 from .api_response import VeilApiResponse
 
 
@@ -35,6 +43,10 @@ class TypeChecker:
         """Return attribute value."""
         return instance.__dict__[self.name]
 
+    def set_trusted(self, instance, value):
+        """Set attribute value from trusted source (VeiL ECP response) without checking."""
+        instance.__dict__[self.name] = value
+
 
 class StringType(TypeChecker):
     """Descriptor for string checking."""
@@ -158,22 +170,57 @@ class HexColorType(NullableStringType):
         else:
             raise TypeError('{val} is not a proper hex-color str.'.format(val=value))
 
+    def set_trusted(self, instance, value):
+        """Set attribute value from trusted source replacing empty value with default color."""
+        super().set_trusted(instance, value or '#c0ffee')
+
 
 class UuidStringType(NullableStringType):
-    """Check that string is a uuid-representation."""
+    """Check that string is a uuid-representation.
 
-    def __set__(self, instance, value):
-        """Check that attribute value can be converted to UUID."""
-        try:
-            if value and isinstance(value, UUID):
-                value = str(value)
-            elif value:
+    Canonical uuid strings are checked by regex, other representations by UUID.
+    Recently validated values are memorized.
+    """
+
+    regex = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z',
+                       re.IGNORECASE)
+    memo_size = 4096
+    __validated = set()
+
+    @classmethod
+    def is_uuid(cls, value) -> bool:
+        """Check that value can be converted to UUID."""
+        if not isinstance(value, str):
+            try:
                 UUID(value)
+            except (ValueError, AttributeError):
+                return False
+            return True
+        if value in cls.__validated:
+            return True
+        if not cls.regex.match(value):
+            try:
+                UUID(value)
+            except ValueError:
+                return False
+        if len(cls.__validated) >= cls.memo_size:
+            cls.__validated.clear()
+        cls.__validated.add(value)
+        return True
 
-        except (ValueError, AttributeError):
+    def __set__(self, instance, value):
+        """Check that attribute value can be converted to UUID."""
+        if value and isinstance(value, UUID):
+            value = str(value)
+        elif value and not self.is_uuid(value):
             raise TypeError('{val} is not a uuid string.'.format(val=value))
-        else:
-            super().__set__(instance, value)
+        super().__set__(instance, value)
+
+    def set_trusted(self, instance, value):
+        """Set attribute value from trusted source converting UUID to string."""
+        if isinstance(value, UUID):
+            value = str(value)
+        super().set_trusted(instance, value)
 
 
 class NullableUuidStringType(UuidStringType):
@@ -204,29 +251,50 @@ class VeilUrlStringType(StringType):
             raise TypeError('{val} is not a proper VeiL server url.'.format(val=value))
 
 
+# Runtime argument type checking of argument_type_checker_decorator wrapped functions.
+_argument_type_checking = True
+
+
+def set_argument_type_checking(enabled: bool) -> None:
+    """Turn on or turn off argument_type_checker_decorator runtime checks."""
+    global _argument_type_checking
+    _argument_type_checking = bool(enabled)
+
+
 def argument_type_checker_decorator(func):
-    """Compare function argument type annotations with value types."""
+    """Compare function argument type annotations with value types.
+
+    Annotations are inspected once on decoration.
+    """
+    annotations = func.__annotations__
+    if not annotations:
+        return func
+    # (arg index, arg annotation) for positional arguments
+    args_checks = tuple((idx, annotations[arg_name])
+                        for idx, arg_name in enumerate(inspect.getfullargspec(func).args)
+                        if annotations.get(arg_name))
+    # kwarg name -> kwarg annotation. Union annotations are not checked.
+    kwargs_checks = {kwarg: kwarg_annotation for kwarg, kwarg_annotation in annotations.items()
+                     if kwarg_annotation and getattr(kwarg_annotation, '__origin__', None) is not typing.Union}  # noqa: E501
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        arguments = inspect.getfullargspec(func).args
-        annotations = func.__annotations__
-
-        if annotations:
-            for idx, arg_name in enumerate(arguments):
-                arg_annotation = annotations.get(arg_name)
-                arg_value = args[idx] if len(args) > idx else None
-                if arg_annotation and arg_value and not isinstance(arg_value, arg_annotation):
-                    raise TypeError('{arg} is not a proper {arg_type}.'.format(arg=arg_value, arg_type=arg_annotation))  # noqa: E501
-
-            for kwarg in kwargs:
-                kwarg_annotation = annotations.get(kwarg)
-                kwarg_value = kwargs[kwarg]
-                if hasattr(kwarg_annotation, '__origin__') and kwarg_annotation.__origin__ is typing.Union:  # noqa: E501
-                    continue
-                if kwarg_annotation and kwarg_value and not isinstance(kwarg_value, kwarg_annotation):  # noqa: E501
-                    raise TypeError(
-                        '{kwarg} is not a proper {arg_type}.'.format(kwarg=kwarg, arg_type=kwarg_annotation))  # noqa: E501
+        if not _argument_type_checking:
+            return func(*args, **kwargs)
+        args_count = len(args)
+        for idx, arg_annotation in args_checks:
+            if idx >= args_count:
+                break
+            arg_value = args[idx]
+            if arg_value and not isinstance(arg_value, arg_annotation):
+                raise TypeError('{arg} is not a proper {arg_type}.'.format(arg=arg_value, arg_type=arg_annotation))  # noqa: E501
+
+        for kwarg in kwargs:
+            kwarg_annotation = kwargs_checks.get(kwarg)
+            kwarg_value = kwargs[kwarg]
+            if kwarg_annotation and kwarg_value and not isinstance(kwarg_value, kwarg_annotation):  # noqa: E501
+                raise TypeError(
+                    '{kwarg} is not a proper {arg_type}.'.format(kwarg=kwarg, arg_type=kwarg_annotation))  # noqa: E501
 
         return func(*args, **kwargs)
     return wrapper
@@ -318,6 +386,10 @@ class VeilEntityConfigurationType(TypeChecker):
         else:
             raise TypeError('{val} is not a {val_type}'.format(val=value, val_type=self.value_type))  # noqa: E501
 
+    def set_trusted(self, instance, value):
+        """Set attribute value from trusted source converting it to VeilEntityConfiguration."""
+        self.__set__(instance, value)
+
 
 class VeilRetryConfiguration(VeilAbstractConfiguration):
     """Retry configuration class for veil api client.
@@ -329,14 +401,20 @@ class VeilRetryConfiguration(VeilAbstractConfiguration):
         timeout_increase_step: timeout increase step.
         status_codes: collection of response status codes witch must be repeated.
         exceptions: collection of aiohttp exceptions witch must be repeated.
+        jitter: full, decorrelated or None (exponential timeout without jitter).
+        deadline: total time of all attempts and timeouts between them (None - unlimited).
     """
 
+    JITTER_MODES = ('full', 'decorrelated')
+
     num_of_attempts = IntType('num_of_attempts')
     timeout = IntType('timeout')
     max_timeout = IntType('max_timeout')
     timeout_increase_step = IntType('timeout_increase_step')
     status_codes = NullableSetType('status_codes')
     exceptions = NullableSetType('exceptions')
+    jitter = NullableStringType('jitter')
+    deadline = TypeChecker('deadline', (int, float, type(None)))
 
     def __init__(self,
                  num_of_attempts: int = 0,
@@ -344,12 +422,408 @@ class VeilRetryConfiguration(VeilAbstractConfiguration):
                  max_timeout: int = 30,
                  timeout_increase_step: int = 2,
                  status_codes: typing.Optional[set] = None,
-                 exceptions: typing.Optional[set] = None
+                 exceptions: typing.Optional[set] = None,
+                 jitter: typing.Optional[str] = 'full',
+                 deadline: typing.Optional[float] = None
                  ) -> None:
         """Please see help(VeilRetryConfiguration) for more info."""
+        if jitter is not None and jitter not in self.JITTER_MODES:
+            raise ValueError('jitter should be one of {} or None.'.format(self.JITTER_MODES))
+        if deadline is not None and deadline <= 0:
+            raise ValueError('deadline should be positive.')
         self.num_of_attempts = num_of_attempts
         self.timeout = timeout
         self.max_timeout = max_timeout
         self.timeout_increase_step = timeout_increase_step
         self.status_codes = status_codes
         self.exceptions = exceptions
+        self.jitter = jitter
+        self.deadline = deadline
+
+
+class VeilPoolConfiguration(VeilAbstractConfiguration):
+    """Connection pool configuration class for veil api client.
+
+    Attributes:
+        limit: total number of simultaneous connections (0 - unlimited).
+        limit_per_host: number of simultaneous connections to a single host (0 - unlimited).
+        keepalive_timeout: idle keep-alive connection lifetime (seconds).
+        use_dns_cache: cache resolved host addresses.
+        ttl_dns_cache: resolved address time to live (None - cache forever).
+        force_close: close connections after each request (disables keep-alive).
+        ssl_context: ssl.SSLContext reused for all TLS handshakes of the client.
+    """
+
+    limit = IntType('limit')
+    limit_per_host = IntType('limit_per_host')
+    keepalive_timeout = IntType('keepalive_timeout')
+    use_dns_cache = BoolType('use_dns_cache')
+    ttl_dns_cache = NullableIntType('ttl_dns_cache')
+    force_close = BoolType('force_close')
+
+    def __init__(self,
+                 limit: int = 100,
+                 limit_per_host: int = 0,
+                 keepalive_timeout: int = 15,
+                 use_dns_cache: bool = True,
+                 ttl_dns_cache: typing.Optional[int] = 10,
+                 force_close: bool = False,
+                 ssl_context: typing.Optional[ssl.SSLContext] = None
+                 ) -> None:
+        """Please see help(VeilPoolConfiguration) for more info."""
+        if ssl_context is not None and not isinstance(ssl_context, ssl.SSLContext):
+            raise TypeError('{val} is not a ssl.SSLContext.'.format(val=ssl_context))
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.use_dns_cache = use_dns_cache
+        self.ttl_dns_cache = ttl_dns_cache
+        self.force_close = force_close
+        self.ssl_context = ssl_context
+
+    @property
+    def connector_kwargs(self) -> dict:
+        """Return aiohttp.TCPConnector arguments."""
+        connector_kwargs = dict(limit=self.limit,
+                                limit_per_host=self.limit_per_host,
+                                use_dns_cache=self.use_dns_cache,
+                                ttl_dns_cache=self.ttl_dns_cache,
+                                force_close=self.force_close)
+        # aiohttp forbids keepalive_timeout together with force_close.
+        if not self.force_close:
+            connector_kwargs['keepalive_timeout'] = self.keepalive_timeout
+        return connector_kwargs
+
+
+class VeilRateLimitConfiguration(VeilAbstractConfiguration):
+    """Token-bucket rate limit configuration class for veil api client.
+
+    Attributes:
+        read_rate: GET requests per second (None - unlimited).
+        read_burst: max GET requests sent without waiting.
+        write_rate: POST and PUT requests per second (None - unlimited).
+        write_burst: max POST and PUT requests sent without waiting.
+    """
+
+    read_rate = TypeChecker('read_rate', (int, float, type(None)))
+    read_burst = IntType('read_burst')
+    write_rate = TypeChecker('write_rate', (int, float, type(None)))
+    write_burst = IntType('write_burst')
+
+    def __init__(self,
+                 read_rate: typing.Optional[float] = None,
+                 read_burst: int = 10,
+                 write_rate: typing.Optional[float] = None,
+                 write_burst: int = 5
+                 ) -> None:
+        """Please see help(VeilRateLimitConfiguration) for more info."""
+        for rate in (read_rate, write_rate):
+            if rate is not None and rate <= 0:
+                raise ValueError('rate should be positive.')
+        for burst in (read_burst, write_burst):
+            if burst < 1:
+                raise ValueError('burst should be at least 1.')
+        self.read_rate = read_rate
+        self.read_burst = read_burst
+        self.write_rate = write_rate
+        self.write_burst = write_burst
+
+
+class VeilTimeoutConfiguration(VeilAbstractConfiguration):
+    """Request timeouts configuration class for veil api client.
+
+    Attributes:
+        total: max time of the request including retries (seconds, None - session timeout).
+        connect: max time of connection to controller (seconds).
+        read: max time between response data chunks (seconds).
+    """
+
+    total = TypeChecker('total', (int, float, type(None)))
+    connect = TypeChecker('connect', (int, float, type(None)))
+    read = TypeChecker('read', (int, float, type(None)))
+
+    def __init__(self,
+                 total: typing.Optional[float] = None,
+                 connect: typing.Optional[float] = None,
+                 read: typing.Optional[float] = None
+                 ) -> None:
+        """Please see help(VeilTimeoutConfiguration) for more info."""
+        for timeout in (total, connect, read):
+            if timeout is not None and timeout <= 0:
+                raise ValueError('timeout should be positive.')
+        self.total = total
+        self.connect = connect
+        self.read = read
+
+
+class VeilRetryBudgetConfiguration(VeilAbstractConfiguration):
+    """Retry budget configuration class for veil api client.
+
+    Retries of all client requests are limited by min_retries plus ratio
+    of successful requests within the sliding window.
+
+    Attributes:
+        ratio: allowed retries per successful request.
+        window: sliding window length (seconds).
+        min_retries: retries allowed within the window regardless of successful requests.
+    """
+
+    ratio = TypeChecker('ratio', (int, float))
+    window = TypeChecker('window', (int, float))
+    min_retries = IntType('min_retries')
+
+    def __init__(self,
+                 ratio: float = 0.1,
+                 window: float = 10,
+                 min_retries: int = 10
+                 ) -> None:
+        """Please see help(VeilRetryBudgetConfiguration) for more info."""
+        if ratio < 0:
+            raise ValueError('ratio should not be negative.')
+        if window <= 0:
+            raise ValueError('window should be positive.')
+        if min_retries < 0:
+            raise ValueError('min_retries should not be negative.')
+        self.ratio = ratio
+        self.window = window
+        self.min_retries = min_retries
+
+
+class VeilCircuitBreakerConfiguration(VeilAbstractConfiguration):
+    """Circuit breaker configuration class for veil api client.
+
+    After failure_threshold consecutive failures (5xx, 418, connection errors and timeouts)
+    requests are not sent for recovery_timeout seconds and fail with a synthetic response.
+    Then up to half_open_requests probe requests decide whether the circuit is closed again.
+
+    Attributes:
+        failure_threshold: num of consecutive failures to open the circuit.
+        recovery_timeout: time before probe requests (seconds).
+        half_open_requests: num of simultaneous probe requests.
+        per_entity: separate circuit for every entity prefix (domains/, tasks/, etc).
+    """
+
+    failure_threshold = IntType('failure_threshold')
+    recovery_timeout = TypeChecker('recovery_timeout', (int, float))
+    half_open_requests = IntType('half_open_requests')
+    per_entity = BoolType('per_entity')
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30,
+                 half_open_requests: int = 1,
+                 per_entity: bool = False
+                 ) -> None:
+        """Please see help(VeilCircuitBreakerConfiguration) for more info."""
+        if failure_threshold < 1 or half_open_requests < 1:
+            raise ValueError('failure_threshold and half_open_requests should be at least 1.')
+        if recovery_timeout <= 0:
+            raise ValueError('recovery_timeout should be positive.')
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_requests = half_open_requests
+        self.per_entity = per_entity
+
+
+class VeilHedgingConfiguration(VeilAbstractConfiguration):
+    """Hedged GET requests configuration class for veil api client.
+
+    If GET response is not received within percentile of recent latencies,
+    the second identical request is sent and the first response is used.
+
+    Attributes:
+        percentile: percentile of recent latencies used as hedging delay.
+        min_delay: min hedging delay (seconds).
+        budget: max share of hedged requests within the window.
+        window: num of recent requests for latency and budget calculation.
+        min_samples: num of requests before hedging is started.
+    """
+
+    percentile = TypeChecker('percentile', (int, float))
+    min_delay = TypeChecker('min_delay', (int, float))
+    budget = TypeChecker('budget', (int, float))
+    window = IntType('window')
+    min_samples = IntType('min_samples')
+
+    def __init__(self,
+                 percentile: float = 95,
+                 min_delay: float = 0.01,
+                 budget: float = 0.05,
+                 window: int = 200,
+                 min_samples: int = 20
+                 ) -> None:
+        """Please see help(VeilHedgingConfiguration) for more info."""
+        if not 0 < percentile < 100:
+            raise ValueError('percentile should be between 0 and 100.')
+        if not 0 < budget <= 1:
+            raise ValueError('budget should be between 0 and 1.')
+        if not 1 <= min_samples <= window:
+            raise ValueError('min_samples should be between 1 and window.')
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.budget = budget
+        self.window = window
+        self.min_samples = min_samples
+
+
+class VeilConcurrencyConfiguration(VeilAbstractConfiguration):
+    """Adaptive (AIMD) concurrency limit configuration class for veil api client.
+
+    Limit grows by 1 per limit of successful requests while latency is stable
+    and is multiplied by decrease_factor on latency growth, 5xx, 418 and timeouts.
+
+    Attributes:
+        initial_limit: initial num of simultaneous requests.
+        min_limit: min num of simultaneous requests.
+        max_limit: max num of simultaneous requests.
+        latency_tolerance: latency growth (relative to min recent latency) treated as overload.
+        decrease_factor: limit multiplier on overload.
+        window: num of recent requests for min latency calculation.
+    """
+
+    initial_limit = IntType('initial_limit')
+    min_limit = IntType('min_limit')
+    max_limit = IntType('max_limit')
+    latency_tolerance = TypeChecker('latency_tolerance', (int, float))
+    decrease_factor = TypeChecker('decrease_factor', float)
+    window = IntType('window')
+
+    def __init__(self,
+                 initial_limit: int = 20,
+                 min_limit: int = 1,
+                 max_limit: int = 200,
+                 latency_tolerance: float = 2.0,
+                 decrease_factor: float = 0.5,
+                 window: int = 100
+                 ) -> None:
+        """Please see help(VeilConcurrencyConfiguration) for more info."""
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError('limits should be 1 <= min_limit <= initial_limit <= max_limit.')
+        if not 0 < decrease_factor < 1:
+            raise ValueError('decrease_factor should be between 0 and 1.')
+        if latency_tolerance <= 1:
+            raise ValueError('latency_tolerance should be greater than 1.')
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.window = window
+
+
+class _BrotliDecompressor:
+    """Brotli decompressor with zlib.decompressobj interface."""
+
+    def __init__(self) -> None:
+        """Please see help(_BrotliDecompressor) for more info."""
+        self.__decompressor = brotli.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress next chunk."""
+        return self.__decompressor.process(data)
+
+    def flush(self) -> bytes:
+        """Brotli returns all data on process."""
+        return b''
+
+
+class _DeflateDecompressor:
+    """Deflate decompressor of zlib wrapped (RFC 1950) or raw (RFC 1951) data.
+
+    Some servers send raw deflate data without zlib header.
+    """
+
+    def __init__(self) -> None:
+        """Please see help(_DeflateDecompressor) for more info."""
+        # auto detection of gzip and zlib headers
+        self.__decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        # data received before the header is checked
+        self.__head = b''
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress next chunk."""
+        if self.__head is None:
+            return self.__decompressor.decompress(data)
+        self.__head += data
+        try:
+            decompressed = self.__decompressor.decompress(data)
+        except zlib.error:
+            self.__decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            decompressed = self.__decompressor.decompress(self.__head)
+            self.__head = None
+            return decompressed
+        # zlib header is valid after the first 2 bytes
+        if len(self.__head) >= 2:
+            self.__head = None
+        return decompressed
+
+    def flush(self) -> bytes:
+        """Return the rest of decompressed data."""
+        return self.__decompressor.flush()
+
+
+class VeilCompressionConfiguration(VeilAbstractConfiguration):
+    """Compression configuration class for veil api client.
+
+    Attributes:
+        accept_encodings: accepted response encodings (gzip, deflate, br). Empty - identity.
+        compress_requests: compress request json bodies with gzip.
+        compress_threshold: minimal size of request body to compress (bytes).
+        compress_level: gzip compression level (1-9).
+    """
+
+    ENCODINGS = ('gzip', 'deflate', 'br')
+    # Content-Encoding aliases of the same encoding
+    ENCODING_ALIASES = {'x-gzip': 'gzip'}
+
+    compress_requests = BoolType('compress_requests')
+    compress_threshold = IntType('compress_threshold')
+    compress_level = IntType('compress_level')
+
+    def __init__(self,
+                 accept_encodings: typing.Iterable[str] = ('gzip', 'deflate'),
+                 compress_requests: bool = False,
+                 compress_threshold: int = 64 * 1024,
+                 compress_level: int = 6
+                 ) -> None:
+        """Please see help(VeilCompressionConfiguration) for more info."""
+        accept_encodings = tuple(accept_encodings)
+        for encoding in accept_encodings:
+            if encoding not in self.ENCODINGS:
+                raise ValueError('{val} is not one of {encodings}.'.format(
+                    val=encoding, encodings=', '.join(self.ENCODINGS)))
+        if 'br' in accept_encodings and brotli is None:
+            raise RuntimeError('Please install `brotli`')  # pragma: no cover
+        self.accept_encodings = accept_encodings
+        self.compress_requests = compress_requests
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+    @property
+    def accept_encoding(self) -> str:
+        """Return Accept-Encoding header value."""
+        return ', '.join(self.accept_encodings) if self.accept_encodings else 'identity'
+
+    @classmethod
+    def decompressor(cls, content_encoding: typing.Optional[str]):
+        """Return decompressor for response Content-Encoding or None if data is not encoded.
+
+        Note:
+            ValueError is raised for unsupported encoding, so encoded data is never
+            parsed as json.
+        """
+        encoding = (content_encoding or '').strip().lower()
+        encoding = cls.ENCODING_ALIASES.get(encoding, encoding)
+        if not encoding or encoding == 'identity':
+            return None
+        if encoding == 'gzip':
+            return zlib.decompressobj(zlib.MAX_WBITS | 32)
+        if encoding == 'deflate':
+            return _DeflateDecompressor()
+        if encoding == 'br' and brotli is not None:
+            return _BrotliDecompressor()
+        raise ValueError('Unsupported Content-Encoding: {}.'.format(content_encoding))
+
+    def compress(self, body: bytes) -> bytes:
+        """Compress request body with gzip."""
+        return gzip.compress(body, compresslevel=self.compress_level)
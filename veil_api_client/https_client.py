@@ -1,11 +1,18 @@
 # -*- coding: utf-8 -*-
 """Veil https api client."""
 import asyncio
+import functools
 import json
 import logging
+import math
+import random
+import re
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
 from types import TracebackType
-from typing import Dict, Optional, Type
-from urllib.parse import urlencode
+from typing import Dict, Optional, Tuple, Type
+from urllib.parse import urlencode, urlsplit
 from uuid import UUID, uuid4
 
 try:
@@ -13,6 +20,11 @@ try:
 except ImportError:  # pragma: no cover
     ujson = None
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 try:
     import aiohttp
 except ImportError:  # pragma: no cover
@@ -21,9 +33,15 @@ except ImportError:  # pragma: no cover
 from .api_objects import (VeilCluster, VeilController, VeilDataPool,
                           VeilDomainExt, VeilEvent, VeilLibrary, VeilNode, VeilResourcePool,
                           VeilVDisk)
-from .base import VeilRetryConfiguration, VeilTag, VeilTask
+from .base import VeilApiObject, VeilRetryConfiguration, VeilTag, VeilTask
 from .base.api_cache import VeilCacheConfiguration, cached_response
-from .base.utils import (IntType, NullableDictType, VeilJwtTokenType,
+from .base.api_stream import VeilApiResponseStream
+from .base.utils import (IntType, NullableDictType, VeilCircuitBreakerConfiguration,
+                         VeilCompressionConfiguration,
+                         VeilConcurrencyConfiguration, VeilHedgingConfiguration,
+                         VeilJwtTokenType, VeilPoolConfiguration,
+                         VeilRateLimitConfiguration, VeilRetryBudgetConfiguration,
+                         VeilTimeoutConfiguration,
                          VeilUrlStringType, veil_api_response)
 
 
@@ -43,9 +61,18 @@ class _RequestContext:
         timeout_increase_step: timeout increase step.
         status_codes: collection of response status codes witch must be repeated.
         exceptions: collection of aiohttp exceptions witch must be repeated.
+        jitter: full, decorrelated or None (exponential timeout without jitter).
+        deadline: total time of all attempts and timeouts between them.
+        rate_limiter: _TokenBucket awaited before every attempt.
+        token_taken: rate limiter token of the first attempt is already taken.
+        retry_budget: _RetryBudget shared by all client requests.
+        client_timeout: aiohttp.ClientTimeout of every attempt (session timeout if not set).
         kwargs: additional aiohttp.request arguments, such as headers and etc.
     """
 
+    # Retry-After header of these responses is respected
+    RETRY_AFTER_STATUSES = frozenset((418, 429, 503))
+
     def __init__(self,
                  request: aiohttp.ClientRequest,
                  url: str,
@@ -55,16 +82,28 @@ class _RequestContext:
                  timeout_increase_step: int,
                  status_codes: set,
                  exceptions: set,
+                 jitter: Optional[str] = None,
+                 deadline: Optional[float] = None,
+                 rate_limiter: Optional['_TokenBucket'] = None,
+                 token_taken: bool = False,
+                 retry_budget: Optional['_RetryBudget'] = None,
+                 client_timeout: Optional['aiohttp.ClientTimeout'] = None,
                  **kwargs
                  ) -> None:
         """Please see help(_RequestContext) for more info."""
         self._request = request
         self._url = url
+        self._rate_limiter = rate_limiter
+        self._token_taken = token_taken
+        self._retry_budget = retry_budget
 
         self._num_of_attempts = num_of_attempts
         self._timeout = timeout
         self._max_timeout = max_timeout
         self._timeout_increase_step = timeout_increase_step
+        self._jitter = jitter
+        self._deadline = deadline
+        self._last_timeout = timeout
 
         if status_codes is None:
             status_codes = set()
@@ -74,6 +113,8 @@ class _RequestContext:
             exceptions = set()
         self._exceptions = exceptions
 
+        if client_timeout is not None:
+            kwargs['timeout'] = client_timeout
         self._kwargs = kwargs
 
         self._current_attempt = 0
@@ -85,32 +126,116 @@ class _RequestContext:
         timeout = self._timeout * (self._timeout_increase_step ** (self._current_attempt - 1))
         return min(timeout, self._max_timeout)
 
+    @property
+    def _backoff(self) -> float:
+        """Timeout before the next attempt with jitter."""
+        if self._jitter == 'full':
+            return random.uniform(0, self._exp_timeout)
+        if self._jitter == 'decorrelated':
+            self._last_timeout = min(self._max_timeout,
+                                     random.uniform(self._timeout, self._last_timeout * 3))
+            return self._last_timeout
+        return self._exp_timeout
+
+    @staticmethod
+    def _retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+        """Parse Retry-After header (seconds or http-date)."""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
     def _bad_code(self, code: int) -> bool:
         """Check that request status_code is bad."""
         return 500 <= code <= 599 or code in self._status_codes
 
+    def _retry_exception(self, exception: Exception) -> bool:
+        """Check that request exception must be repeated."""
+        return any(isinstance(exception, exc) for exc in self._exceptions)
+
+    def _withdraw(self) -> bool:
+        """Take a retry from the client retry budget."""
+        return self._retry_budget is None or self._retry_budget.withdraw()
+
+    def _attempt_kwargs(self, deadline_at: Optional[float]) -> dict:
+        """Limit attempt total timeout by the time left until the deadline.
+
+        Note:
+            aiohttp treats zero total timeout as no timeout, so expired deadline raises.
+        """
+        if deadline_at is None:
+            return self._kwargs
+        time_left = deadline_at - time.monotonic()
+        if time_left <= 0:
+            raise asyncio.TimeoutError('Request deadline is exceeded.')
+        timeout = self._kwargs.get('timeout')
+        if timeout is not None and timeout.total is not None and timeout.total < time_left:
+            return self._kwargs
+        kwargs = dict(self._kwargs)
+        if timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=time_left,
+                                                      connect=timeout.connect,
+                                                      sock_read=timeout.sock_read,
+                                                      sock_connect=timeout.sock_connect)
+        else:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=time_left)
+        return kwargs
+
     async def _execute_request(self) -> aiohttp.ClientResponse:
-        """Run client request on aiohttp."""
-        try:
+        """Run client request on aiohttp with retries."""
+        deadline_at = time.monotonic() + self._deadline if self._deadline else None
+        while True:
             self._current_attempt += 1
-
             if self._current_attempt > 1:
                 logger.debug('Request %s attempt', self._current_attempt)
-
-            response = await self._request(self._url, **self._kwargs)
+            if self._rate_limiter is not None and not (self._token_taken and self._current_attempt == 1):  # noqa: E501
+                await self._rate_limiter.acquire()
+            can_retry = self._current_attempt < self._num_of_attempts
+            # rate limiter or Retry-After waiting could exceed the deadline
+            attempt_kwargs = self._attempt_kwargs(deadline_at)
+            try:
+                response = await self._request(self._url, **attempt_kwargs)
+            except Exception as e:
+                if not can_retry or not self._retry_exception(e):
+                    raise
+                timeout = self._backoff
+                if deadline_at is not None and time.monotonic() + timeout >= deadline_at:
+                    raise
+                if not self._withdraw():
+                    # retry budget is exhausted - fail fast
+                    raise
+                await asyncio.sleep(timeout)
+                continue
             code = response.status
-            if self._current_attempt < self._num_of_attempts and self._bad_code(code):
-                await asyncio.sleep(self._exp_timeout)
-                return await self._execute_request()
-            self._response = response
-            return response
-        except Exception as e:
-            if self._current_attempt < self._num_of_attempts:
-                for exc in self._exceptions:
-                    if isinstance(e, exc):
-                        await asyncio.sleep(self._exp_timeout)
-                        return await self._execute_request()
-            raise e
+            bad_code = self._bad_code(code)
+            retry_after = None
+            if code in self.RETRY_AFTER_STATUSES:
+                retry_after = self._retry_after(response)
+            if not bad_code and retry_after is None and self._retry_budget is not None:
+                self._retry_budget.deposit()
+            if not can_retry or not (bad_code or retry_after is not None):
+                self._response = response
+                return response
+            timeout = self._backoff if retry_after is None else retry_after
+            if timeout > self._max_timeout or (deadline_at is not None and time.monotonic() + timeout >= deadline_at):  # noqa: E501
+                # the next attempt can`t be sent in time
+                self._response = response
+                return response
+            if not self._withdraw():
+                # retry budget is exhausted - fail fast
+                self._response = response
+                return response
+            # connection is returned to the pool while waiting
+            response.release()
+            await asyncio.sleep(timeout)
 
     async def __aenter__(self) -> aiohttp.ClientResponse:
         return await self._execute_request()
@@ -121,6 +246,494 @@ class _RequestContext:
                 self._response.close()
 
 
+class _RequestCoalescer:
+    """Single-flight execution of identical concurrent requests.
+
+    The first caller runs the request, callers with the same key await its result.
+
+    Attributes:
+        requests: num of requests passed through the coalescer.
+        deduplicated: num of requests that reused the result of an in-flight request.
+    """
+
+    def __init__(self) -> None:
+        """Please see help(_RequestCoalescer) for more info."""
+        self._in_flight = dict()
+        self.requests = 0
+        self.deduplicated = 0
+
+    @staticmethod
+    def __items_key(items: Optional[dict]) -> Optional[tuple]:
+        """Build a hashable key of dict items."""
+        if items is None:
+            return None
+        return tuple(sorted((key, str(value)) for key, value in items.items()))
+
+    @classmethod
+    def request_key(cls,
+                    method_name: str,
+                    url: str,
+                    headers: dict,
+                    params: dict,
+                    retry_opts: Optional[VeilRetryConfiguration] = None,
+                    timeout_opts: Optional[VeilTimeoutConfiguration] = None) -> tuple:
+        """Build a hashable key of the request.
+
+        Requests with different retry or timeout options are not joined,
+        so each caller keeps its own deadline and retry policy.
+        """
+        return (method_name, url, cls.__items_key(params), cls.__items_key(headers),
+                cls.__items_key(retry_opts.notnull_attrs if retry_opts else None),
+                cls.__items_key(timeout_opts.notnull_attrs if timeout_opts else None))
+
+    async def execute(self, key: tuple, coroutine_function, *args, **kwargs):
+        """Run coroutine_function or join an identical in-flight call."""
+        self.requests += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coroutine_function(*args, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.deduplicated += 1
+            logger.debug('Request joined to in-flight request %s', key[1])
+        # one cancelled caller shouldn`t cancel the request for the others.
+        return await asyncio.shield(task)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return coalescer counters."""
+        return dict(requests=self.requests,
+                    deduplicated=self.deduplicated,
+                    in_flight=len(self._in_flight))
+
+
+class _TokenBucket:
+    """Async token-bucket rate limiter.
+
+    Waiting callers are served in FIFO order.
+
+    Attributes:
+        rate: tokens added per second.
+        burst: bucket capacity.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Please see help(_TokenBucket) for more info."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waiting = 0
+        self.acquired = 0
+        self.delayed = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def _refill(self) -> None:
+        """Add tokens for the time passed since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait for a token."""
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - started
+        self.acquired += 1
+        if waited > 0.001:
+            self.delayed += 1
+        self.wait_time += waited
+        self.max_wait_time = max(self.max_wait_time, waited)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Return limiter counters."""
+        return dict(rate=self.rate, burst=self.burst, queue_depth=self.waiting,
+                    acquired=self.acquired, delayed=self.delayed,
+                    wait_time=self.wait_time, max_wait_time=self.max_wait_time)
+
+
+class _RetryBudget:
+    """Retry budget shared by all requests of the client.
+
+    Retries within the sliding window are limited by min_retries
+    plus ratio of successful requests within the window.
+
+    Attributes:
+        ratio: allowed retries per successful request.
+        window: sliding window length (seconds).
+        min_retries: retries allowed regardless of successful requests.
+    """
+
+    def __init__(self, ratio: float, window: float, min_retries: int) -> None:
+        """Please see help(_RetryBudget) for more info."""
+        self.ratio = ratio
+        self.window = window
+        self.min_retries = min_retries
+        self._successes = deque()
+        self._retries = deque()
+        self.retried = 0
+        self.exhausted = 0
+
+    def _expire(self) -> None:
+        """Remove events older than the window."""
+        expired = time.monotonic() - self.window
+        for events in (self._successes, self._retries):
+            while events and events[0] < expired:
+                events.popleft()
+
+    @property
+    def balance(self) -> int:
+        """Num of retries available now."""
+        self._expire()
+        allowed = self.min_retries + int(self.ratio * len(self._successes))
+        return max(0, allowed - len(self._retries))
+
+    def deposit(self) -> None:
+        """Register successful request."""
+        self._successes.append(time.monotonic())
+
+    def withdraw(self) -> bool:
+        """Take a retry if the budget is not exhausted."""
+        if self.balance < 1:
+            self.exhausted += 1
+            logger.debug('Retry budget is exhausted.')
+            return False
+        self._retries.append(time.monotonic())
+        self.retried += 1
+        return True
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Return budget counters."""
+        balance = self.balance
+        return dict(ratio=self.ratio, window=self.window, balance=balance,
+                    successes=len(self._successes), retries=len(self._retries),
+                    retried=self.retried, exhausted=self.exhausted)
+
+
+class _CircuitBreaker:
+    """Circuit breaker of controller (or entity prefix) requests.
+
+    States:
+        closed - requests are sent.
+        open - requests are not sent until recovery_timeout is passed.
+        half_open - limited num of probe requests are sent.
+
+    Attributes:
+        opts: VeilCircuitBreakerConfiguration instance.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    # VeiL ECP is updating
+    FAILURE_STATUSES = frozenset((418,))
+
+    def __init__(self, opts: VeilCircuitBreakerConfiguration) -> None:
+        """Please see help(_CircuitBreaker) for more info."""
+        self.opts = opts
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def retry_after(self) -> float:
+        """Time left before probe requests (seconds)."""
+        return max(0.0, self.opened_at + self.opts.recovery_timeout - time.monotonic())
+
+    def allow(self) -> Tuple[bool, Optional[int]]:
+        """Check that request can be sent.
+
+        Returns:
+            allowed flag and probe token (None if the request is not a half-open probe).
+        """
+        if self.state == self.OPEN and not self.retry_after:
+            self.state = self.HALF_OPEN
+            logger.debug('Circuit breaker is half-open.')
+        if self.state == self.CLOSED:
+            return True, None
+        if self.state == self.HALF_OPEN and self.probes < self.opts.half_open_requests:
+            self.probes += 1
+            # every half-open state follows a new opening
+            return True, self.opened
+        self.rejected += 1
+        return False, None
+
+    def record(self, success: Optional[bool], probe: Optional[int] = None) -> None:
+        """Register request result. None - request was cancelled.
+
+        Note:
+            only probes (see allow) of the current half-open state free probe slots
+            and can change the state of not closed breaker.
+        """
+        current_probe = probe is not None and probe == self.opened
+        if current_probe and self.state == self.HALF_OPEN:
+            self.probes -= 1
+        if success is None:
+            return
+        if self.state != self.CLOSED and not current_probe:
+            # late result of the request sent before the breaker was opened
+            return
+        if success:
+            if self.state != self.CLOSED:
+                logger.debug('Circuit breaker is closed.')
+            self.state = self.CLOSED
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.opts.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning('Circuit breaker is open after %s failures.', self.failures)
+                self.opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.probes = 0
+
+    def is_failure(self, status_code: int) -> bool:
+        """Check that response status means that controller is unavailable."""
+        return status_code >= 500 or status_code in self.FAILURE_STATUSES
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Return breaker counters."""
+        return dict(state=self.state, failures=self.failures, retry_after=self.retry_after if self.state == self.OPEN else 0.0,  # noqa: E501
+                    opened=self.opened, rejected=self.rejected)
+
+
+class _Hedger:
+    """Hedging delay and budget of GET requests.
+
+    Attributes:
+        opts: VeilHedgingConfiguration instance.
+    """
+
+    def __init__(self, opts: VeilHedgingConfiguration) -> None:
+        """Please see help(_Hedger) for more info."""
+        self.opts = opts
+        self._latencies = deque(maxlen=opts.window)
+        # True for hedged requests within the window
+        self._hedges = deque(maxlen=opts.window)
+        self._hedges_count = 0
+        self._delay = None
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.rejected = 0
+
+    @property
+    def delay(self) -> Optional[float]:
+        """Time before the second request. None - not enough latency samples."""
+        return self._delay
+
+    def record(self, latency: float) -> None:
+        """Register latency of received response."""
+        self._latencies.append(latency)
+        if len(self._latencies) >= self.opts.min_samples:
+            latencies = sorted(self._latencies)
+            index = max(0, math.ceil(len(latencies) * self.opts.percentile / 100) - 1)
+            self._delay = max(self.opts.min_delay, latencies[index])
+
+    def register(self, hedged: bool) -> None:
+        """Register request in the budget window."""
+        self.requests += 1
+        if len(self._hedges) == self._hedges.maxlen and self._hedges[0]:
+            self._hedges_count -= 1
+        self._hedges.append(hedged)
+        if hedged:
+            self._hedges_count += 1
+            self.hedged += 1
+
+    def allow(self) -> bool:
+        """Check that hedged request fits into the budget."""
+        if self._hedges_count + 1 <= self.opts.budget * len(self._hedges):
+            return True
+        self.rejected += 1
+        return False
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Return hedging counters."""
+        return dict(delay=self._delay, requests=self.requests, hedged=self.hedged,
+                    hedge_wins=self.hedge_wins, rejected=self.rejected)
+
+
+class _AdaptiveLimiter:
+    """Adaptive AIMD concurrency limiter.
+
+    Callers above the limit wait in FIFO order.
+
+    Attributes:
+        opts: VeilConcurrencyConfiguration instance.
+        limit: current limit of simultaneous requests.
+        in_flight: num of running requests.
+    """
+
+    # VeiL ECP is updating or overloaded
+    OVERLOAD_STATUSES = frozenset((418, 429))
+
+    def __init__(self, opts: VeilConcurrencyConfiguration) -> None:
+        """Please see help(_AdaptiveLimiter) for more info."""
+        self.opts = opts
+        self.limit = float(opts.initial_limit)
+        self.in_flight = 0
+        self._waiters = deque()
+        self._latencies = deque(maxlen=opts.window)
+        self._last_decrease = 0.0
+        self.last_latency = None
+        self.increases = 0
+        self.decreases = 0
+
+    async def acquire(self) -> float:
+        """Wait for a free slot and return request start time."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return time.monotonic()
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # released slot is handed over to the waiter
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.cancel()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        return time.monotonic()
+
+    def release(self, started: float, overloaded: bool) -> None:
+        """Free the slot and adjust the limit by request latency and result."""
+        self.in_flight -= 1
+        latency = time.monotonic() - started
+        self.last_latency = latency
+        min_latency = min(self._latencies) if self._latencies else latency
+        self._latencies.append(latency)
+        if overloaded or latency > min_latency * self.opts.latency_tolerance:
+            # requests started before the last decrease shouldn`t decrease the limit again
+            if started >= self._last_decrease:
+                self.limit = max(self.opts.min_limit, self.limit * self.opts.decrease_factor)
+                self._last_decrease = time.monotonic()
+                self.decreases += 1
+        elif self.in_flight + 1 >= int(self.limit) and self.limit < self.opts.max_limit:
+            # additive increase by 1 per limit of requests when the limit is reached
+            self.limit = min(self.opts.max_limit, self.limit + 1 / self.limit)
+            self.increases += 1
+        self._wake_up()
+
+    def cancel(self) -> None:
+        """Free the slot of cancelled request without adjusting the limit."""
+        self.in_flight -= 1
+        self._wake_up()
+
+    def _wake_up(self) -> None:
+        """Hand over free slots to waiters."""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Return limiter counters."""
+        return dict(limit=int(self.limit), in_flight=self.in_flight, queued=len(self._waiters),
+                    min_latency=min(self._latencies) if self._latencies else None,
+                    last_latency=self.last_latency,
+                    increases=self.increases, decreases=self.decreases)
+
+
+class _JsonCodec:
+    """JSON serializer and raw bytes parser.
+
+    Attributes:
+        name: codec name - orjson, ujson or json.
+        serializer: codec name of dumps if it differs from name.
+        dumps: serialize object to str (aiohttp json_serialize).
+        loads: parse object from raw response bytes.
+    """
+
+    NAMES = ('orjson', 'ujson', 'json')
+
+    def __init__(self, name: str, serializer: Optional[str] = None) -> None:
+        """Please see help(_JsonCodec) for more info."""
+        if name not in self.NAMES:
+            raise ValueError('json codec should be one of {}.'.format(', '.join(self.NAMES)))
+        if name == 'orjson':
+            if orjson is None:
+                raise RuntimeError('Please install `orjson`')  # pragma: no cover
+            self.dumps = self.__orjson_dumps
+            self.loads = orjson.loads
+        elif name == 'ujson':
+            if ujson is None:
+                raise RuntimeError('Please install `ujson`')  # pragma: no cover
+            self.dumps = ujson.dumps
+            self.loads = ujson.loads
+        else:
+            self.dumps = json.dumps
+            self.loads = self.__json_loads
+        if serializer and serializer != name:
+            self.dumps = _JsonCodec(serializer).dumps
+        self.name = name
+
+    @staticmethod
+    def __orjson_dumps(obj) -> str:
+        """Orjson serializes to bytes, but aiohttp expects str."""
+        return orjson.dumps(obj).decode('utf-8')
+
+    @staticmethod
+    def __json_loads(raw_data: bytes):
+        """Parse utf-8 bytes with stdlib json."""
+        return json.loads(raw_data.decode('utf-8'))
+
+
+class _DecodedStreamReader:
+    """Response content reader that decompresses data and counts wire bytes.
+
+    Attributes:
+        content: aiohttp.StreamReader of response.
+        decompressor: decompressor of response Content-Encoding or None.
+        stats: client compression counters.
+    """
+
+    def __init__(self, content, decompressor, stats: dict) -> None:
+        """Please see help(_DecodedStreamReader) for more info."""
+        self.content = content
+        self.decompressor = decompressor
+        self.stats = stats
+
+    async def read(self, size: int) -> bytes:
+        """Read and decompress next chunk. Empty bytes at the end of response."""
+        while True:
+            chunk = await self.content.read(size)
+            self.stats['response_wire_bytes'] += len(chunk)
+            if self.decompressor is None:
+                data = chunk
+            elif chunk:
+                data = self.decompressor.decompress(chunk)
+            else:
+                data = self.decompressor.flush()
+            self.stats['response_bytes'] += len(data)
+            # compressed chunk may not contain complete decompressed data
+            if data or not chunk:
+                return data
+
+
 class VeilClient:
     """VeilClient class.
 
@@ -139,15 +752,27 @@ class VeilClient:
         extra_params: additional user params.
         cookies: additional user cookies (probably useless).
         ujson_: ujson using instead of default aiohttp.ClientSession serializer.
+        json_codec: orjson, ujson or json codec for requests and responses. Overrides ujson_.
+            If not set responses are parsed by json.
         retry_opts: VeilRetryConfiguration instance.
         cache_opts: VeilCacheConfiguration instance.
         url_max_length: maximum url length (protocol + domain + query params)
+        pool_opts: VeilPoolConfiguration instance.
+        coalesce_requests: share one in-flight request between identical concurrent GETs.
+        compression_opts: VeilCompressionConfiguration instance.
+        rate_limit_opts: VeilRateLimitConfiguration instance.
+        concurrency_opts: VeilConcurrencyConfiguration instance. Disabled by default.
+        retry_budget_opts: VeilRetryBudgetConfiguration instance. Disabled by default.
+        circuit_breaker_opts: VeilCircuitBreakerConfiguration instance. Disabled by default.
+        timeout_opts: VeilTimeoutConfiguration instance - default timeouts of requests.
+        hedging_opts: VeilHedgingConfiguration instance. Disabled by default.
     """
 
     __TRANSFER_PROTOCOL_PREFIX = 'https://'
     __AUTH_HEADER_KEY = 'Authorization'
     __USER_AGENT_VAL = 'veil-api-client/2.2'
     __IDEMPOTENCY_BODY_KEY = 'idempotency_key'
+    __JSON_CONTENT_TYPE_RE = re.compile(r'^application/(?:[\w.+-]+?\+)?json')
     __extra_headers = NullableDictType('__extra_headers')
     __extra_params = NullableDictType('__extra_params')
     __cookies = NullableDictType('__cookies')
@@ -167,12 +792,20 @@ class VeilClient:
                  retry_opts: Optional[VeilRetryConfiguration] = None,
                  cache_opts: Optional[VeilCacheConfiguration] = None,
                  url_max_length: Optional[int] = None,
+                 pool_opts: Optional[VeilPoolConfiguration] = None,
+                 coalesce_requests: bool = False,
+                 json_codec: Optional[str] = None,
+                 compression_opts: Optional[VeilCompressionConfiguration] = None,
+                 rate_limit_opts: Optional[VeilRateLimitConfiguration] = None,
+                 concurrency_opts: Optional[VeilConcurrencyConfiguration] = None,
+                 retry_budget_opts: Optional[VeilRetryBudgetConfiguration] = None,
+                 circuit_breaker_opts: Optional[VeilCircuitBreakerConfiguration] = None,
+                 timeout_opts: Optional[VeilTimeoutConfiguration] = None,
+                 hedging_opts: Optional[VeilHedgingConfiguration] = None,
                  ) -> None:
         """Please see help(VeilClient) for more info."""
         if aiohttp is None:
             raise RuntimeError('Please install `aiohttp`')  # pragma: no cover
-        if ujson is None and ujson_:
-            raise RuntimeError('Please install `ujson`')  # pragma: no cover
 
         self.server_address = server_address
         self.token = token
@@ -180,14 +813,21 @@ class VeilClient:
         self.__ssl_enabled = ssl_enabled
         self.__extra_headers = extra_headers
         self.__extra_params = extra_params
+        # headers and params are rebuilt only when token or extra values are changed
+        self.__headers_cache = None
+        self.__params_cache = None
 
         __timeout = aiohttp.ClientTimeout(total=timeout)
 
         self.__timeout = __timeout
         self.__cookies = cookies
 
-        # ujson is much faster but less compatible
-        self.__json_serialize = ujson.dumps if ujson_ else json.dumps
+        # orjson and ujson are much faster but less compatible
+        if json_codec:
+            self.__json_codec = _JsonCodec(json_codec)
+        else:
+            # ujson_ changes only request serialization
+            self.__json_codec = _JsonCodec('json', serializer='ujson' if ujson_ else None)
 
         if not retry_opts:
             retry_opts = VeilRetryConfiguration()
@@ -199,6 +839,51 @@ class VeilClient:
         self.__cache_opts = cache_opts
 
         self.__url_max_length = url_max_length
+
+        # connection pool options used for every new aiohttp.ClientSession
+        if not pool_opts:
+            pool_opts = VeilPoolConfiguration()
+        self.__pool_opts = pool_opts
+
+        # single-flight layer for identical concurrent GET requests
+        self.__coalescer = _RequestCoalescer() if coalesce_requests else None
+
+        # responses are decompressed by client to count wire bytes
+        if not compression_opts:
+            compression_opts = VeilCompressionConfiguration()
+        self.__compression_opts = compression_opts
+        self.__compression_stats = dict(request_bytes=0, request_wire_bytes=0,
+                                        compressed_requests=0,
+                                        response_bytes=0, response_wire_bytes=0)
+
+        # separate token buckets for read (GET) and write (POST, PUT) requests
+        if not rate_limit_opts:
+            rate_limit_opts = VeilRateLimitConfiguration()
+        self.__read_limiter = _TokenBucket(rate=rate_limit_opts.read_rate,
+                                           burst=rate_limit_opts.read_burst) if rate_limit_opts.read_rate else None  # noqa: E501
+        self.__write_limiter = _TokenBucket(rate=rate_limit_opts.write_rate,
+                                            burst=rate_limit_opts.write_burst) if rate_limit_opts.write_rate else None  # noqa: E501
+
+        # adaptive limit of simultaneous requests to controller
+        self.__concurrency_limiter = _AdaptiveLimiter(concurrency_opts) if concurrency_opts else None  # noqa: E501
+
+        # retries of all requests are limited by share of successful requests
+        self.__retry_budget = None
+        if retry_budget_opts:
+            self.__retry_budget = _RetryBudget(ratio=retry_budget_opts.ratio,
+                                               window=retry_budget_opts.window,
+                                               min_retries=retry_budget_opts.min_retries)
+
+        # controller (or entity prefix) -> _CircuitBreaker
+        self.__circuit_breaker_opts = circuit_breaker_opts
+        self.__circuit_breakers = dict()
+
+        # request timeouts (session timeout is used if not set)
+        self.__timeout_opts = timeout_opts
+
+        # second GET request is sent if response is late
+        self.__hedger = _Hedger(hedging_opts) if hedging_opts else None
+
         self.__client_session = self.new_client_session
 
     async def __aenter__(self) -> 'VeilClient':
@@ -220,8 +905,114 @@ class VeilClient:
     def new_client_session(self) -> 'aiohttp.ClientSession':
         """Return new ClientSession instance."""
         # TODO: DeprecationWarning: The object should be created from async function
-        return aiohttp.ClientSession(timeout=self.__timeout, cookies=self.__cookies,
-                                     json_serialize=self.__json_serialize)
+        connector = aiohttp.TCPConnector(**self.__pool_opts.connector_kwargs)
+        return aiohttp.ClientSession(connector=connector,
+                                     timeout=self.__timeout, cookies=self.__cookies,
+                                     json_serialize=self.__json_codec.dumps,
+                                     auto_decompress=False)
+
+    @property
+    def pool_stats(self) -> Dict[str, int]:
+        """Return current connection pool statistics.
+
+        Note:
+            in_use - connections acquired by running requests.
+            idle - keep-alive connections ready for reuse.
+            waiting - requests waiting for a free connection.
+        """
+        connector = getattr(self.__session, 'connector', None)
+        if connector is None or connector.closed:
+            return dict(limit=self.__pool_opts.limit,
+                        limit_per_host=self.__pool_opts.limit_per_host,
+                        in_use=0, idle=0, waiting=0)
+        # aiohttp.BaseConnector doesn`t provide public counters.
+        acquired = getattr(connector, '_acquired', ())
+        idle_conns = getattr(connector, '_conns', dict())
+        waiters = getattr(connector, '_waiters', dict())
+        return dict(limit=connector.limit,
+                    limit_per_host=connector.limit_per_host,
+                    in_use=len(acquired),
+                    idle=sum(len(conns) for conns in idle_conns.values()),
+                    waiting=sum(len(waiter) for waiter in waiters.values()))
+
+    @property
+    def coalescing_stats(self) -> Dict[str, int]:
+        """Return counters of coalesced GET requests."""
+        if self.__coalescer is None:
+            return dict(requests=0, deduplicated=0, in_flight=0)
+        return self.__coalescer.stats
+
+    @property
+    def rate_limit_stats(self) -> Dict[str, Optional[dict]]:
+        """Return read and write rate limiters statistics.
+
+        Note:
+            queue_depth - requests waiting for a token.
+            delayed - requests that waited for a token.
+            wait_time, max_wait_time - total and max time of waiting (seconds).
+            None - requests are not limited.
+        """
+        return dict(read=self.__read_limiter.stats if self.__read_limiter else None,
+                    write=self.__write_limiter.stats if self.__write_limiter else None)
+
+    @property
+    def hedging_stats(self) -> Optional[Dict[str, float]]:
+        """Return hedged requests statistics.
+
+        Note:
+            delay - current hedging delay (seconds), None until enough latency samples.
+            hedged - num of second requests, hedge_wins - num of second requests that won.
+            rejected - num of second requests rejected by the budget.
+            None - requests are not hedged.
+        """
+        return self.__hedger.stats if self.__hedger else None
+
+    @property
+    def circuit_breaker_stats(self) -> Dict[str, dict]:
+        """Return circuit breakers statistics by entity prefix (or server address).
+
+        Note:
+            state - closed, open or half_open.
+            failures - num of consecutive failures.
+            retry_after - time left before probe requests (seconds).
+            opened - num of circuit openings, rejected - num of requests not sent.
+        """
+        return {key: breaker.stats for key, breaker in self.__circuit_breakers.items()}
+
+    @property
+    def retry_budget_stats(self) -> Optional[Dict[str, float]]:
+        """Return retry budget statistics.
+
+        Note:
+            balance - retries available now.
+            successes, retries - successful requests and retries within the window.
+            retried - total retries, exhausted - retries rejected by the budget.
+            None - retries are not limited by budget.
+        """
+        return self.__retry_budget.stats if self.__retry_budget else None
+
+    @property
+    def concurrency_stats(self) -> Optional[Dict[str, float]]:
+        """Return adaptive concurrency limiter statistics.
+
+        Note:
+            limit - current limit of simultaneous requests.
+            in_flight - running requests, queued - requests waiting for a free slot.
+            min_latency, last_latency - min recent and last request latency (seconds).
+            None - concurrency is not limited.
+        """
+        return self.__concurrency_limiter.stats if self.__concurrency_limiter else None
+
+    @property
+    def compression_stats(self) -> Dict[str, int]:
+        """Return request and response bytes counters.
+
+        Note:
+            *_wire_bytes - body bytes sent or received over network.
+            *_bytes - body bytes before compression or after decompression.
+            Request bodies are counted only if compress_requests is enabled.
+        """
+        return dict(self.__compression_stats)
 
     @property
     def base_url(self) -> str:
@@ -235,11 +1026,20 @@ class VeilClient:
 
     @property
     def __params(self) -> Dict:
-        """Return base params extended by user extra params."""
-        params = self.__base_params
-        if self.__extra_params and isinstance(self.__extra_params, dict):
-            params.update(self.__extra_params)
-        return params
+        """Return base params extended by user extra params.
+
+        Note:
+            params are built once and shared between requests - don`t change them.
+        """
+        extra_params = self.__extra_params
+        # extra params can be changed in place
+        snapshot = self.__snapshot(extra_params)
+        if self.__params_cache is None or self.__params_cache[0] != snapshot:
+            params = self.__base_params
+            if extra_params and isinstance(extra_params, dict):
+                params.update(extra_params)
+            self.__params_cache = (snapshot, params)
+        return self.__params_cache[1]
 
     @property
     def __base_headers(self) -> Dict[str, str]:
@@ -256,17 +1056,56 @@ class VeilClient:
             'Connection': 'keep-alive',
             'Cache-Control': 'max-age=0',
             'Accept-Language': 'en',
+            'Accept-Encoding': self.__compression_opts.accept_encoding,
             self.__AUTH_HEADER_KEY: '{}'.format(self.token),
         }
         return headers_dict
 
     @property
     def __headers(self) -> Dict[str, str]:
-        """Return base_headers extended by user extra_headers."""
-        headers = self.__base_headers
-        if self.__extra_headers and isinstance(self.__extra_headers, dict):
-            headers.update(self.__extra_headers)
-        return headers
+        """Return base_headers extended by user extra_headers.
+
+        Note:
+            headers are built once per token and shared between requests - don`t change them.
+        """
+        token = self.token
+        extra_headers = self.__extra_headers
+        # extra headers can be changed in place
+        snapshot = self.__snapshot(extra_headers)
+        headers_cache = self.__headers_cache
+        if headers_cache is None or headers_cache[0] is not token or headers_cache[1] != snapshot:  # noqa: E501
+            headers = self.__base_headers
+            if extra_headers and isinstance(extra_headers, dict):
+                headers.update(extra_headers)
+            headers_cache = self.__headers_cache = (token, snapshot, headers)
+        return headers_cache[2]
+
+    @staticmethod
+    def __snapshot(extra: Optional[dict]) -> Optional[tuple]:
+        """Return comparable copy of user extra headers or params."""
+        if not isinstance(extra, dict):
+            return None
+        return tuple(sorted(extra.items()))
+
+    @staticmethod
+    def __merged(base: dict, extra: Optional[dict]) -> dict:
+        """Return base dict or its copy extended by per-call extra values."""
+        if not extra:
+            return base
+        merged = base.copy()
+        merged.update(extra)
+        return merged
+
+    @classmethod
+    def __stripped(cls, params: dict) -> dict:
+        """Return params or their copy without trailing commas in values.
+
+        Note:
+            VeiL can`t decode requests witch contain extra commas.
+        """
+        stripped_params = {argument: value[:-1] for argument, value in params.items()
+                           if isinstance(value, str) and value.endswith(',')}
+        return cls.__merged(params, stripped_params)
 
     @property
     def __session(self) -> 'aiohttp.ClientSession':
@@ -282,8 +1121,16 @@ class VeilClient:
                           params: dict,
                           ssl: bool,
                           retry_opts: VeilRetryConfiguration,
-                          json_data: Optional[dict] = None):
-        """Create new _RequestContext instance."""
+                          json_data: Optional[dict] = None,
+                          method_name: str = 'get',
+                          timeout_opts: Optional[VeilTimeoutConfiguration] = None,
+                          token_taken: bool = False):
+        """Create new _RequestContext instance.
+
+        Note:
+            timeout_opts.total limits the request with all retries (and retry_opts.deadline).
+            token_taken - rate limiter token of the first attempt is taken by the caller.
+        """
         # protocol + domain + query args
         if self.__url_max_length:
             full_url = '{url}?{params}'.format(url=url, params=urlencode(params))
@@ -299,30 +1146,79 @@ class VeilClient:
                         json_data[key] = str(value)
                 except ValueError:
                     json_data[key] = value
+        body = None
+        if json_data is not None and self.__compression_opts.compress_requests:
+            body = self.__json_codec.dumps(json_data).encode('utf-8')
+            self.__compression_stats['request_bytes'] += len(body)
+            if len(body) >= self.__compression_opts.compress_threshold:
+                body = self.__compression_opts.compress(body)
+                headers = self.__merged(headers, {'Content-Encoding': 'gzip'})
+                self.__compression_stats['compressed_requests'] += 1
+            self.__compression_stats['request_wire_bytes'] += len(body)
+            json_data = None
+        client_timeout = None
+        deadline = retry_opts.deadline
+        if not timeout_opts:
+            timeout_opts = self.__timeout_opts
+        if timeout_opts:
+            client_timeout = aiohttp.ClientTimeout(total=timeout_opts.total or self.__timeout.total,  # noqa: E501
+                                                   connect=timeout_opts.connect,
+                                                   sock_read=timeout_opts.read)
+            if timeout_opts.total and (deadline is None or timeout_opts.total < deadline):
+                deadline = timeout_opts.total
         return _RequestContext(request=request, url=url, headers=headers, params=params,
-                               ssl=ssl, json=json_data,
+                               ssl=ssl, json=json_data, data=body,
+                               client_timeout=client_timeout,
                                num_of_attempts=retry_opts.num_of_attempts,
                                timeout=retry_opts.timeout,
                                max_timeout=retry_opts.max_timeout,
                                timeout_increase_step=retry_opts.timeout_increase_step,
                                status_codes=retry_opts.status_codes,
-                               exceptions=retry_opts.exceptions)
+                               exceptions=retry_opts.exceptions,
+                               jitter=retry_opts.jitter,
+                               deadline=deadline,
+                               retry_budget=self.__retry_budget,
+                               rate_limiter=self.__rate_limiter(method_name),
+                               token_taken=token_taken)
 
-    @staticmethod
-    async def __fetch_response_data(response: aiohttp.ClientResponse) -> Dict[str, str]:
-        """Collect all response attributes."""
+    def __rate_limiter(self, method_name: str) -> Optional[_TokenBucket]:
+        """Return token bucket of read or write requests."""
+        return self.__read_limiter if method_name == 'get' else self.__write_limiter
+
+    async def __fetch_response_data(self, response: aiohttp.ClientResponse) -> Dict[str, str]:
+        """Collect all response attributes.
+
+        Raw response bytes are parsed by json codec without decoding to str.
+        """
         if isinstance(response, aiohttp.ClientResponse):
             # Collect response data
             async with response:
                 status_code = response.status
                 headers = response.headers
-                # If VeiL ECP is not fully turned on, the responses may be of the wrong type
-                try:
-                    data = await response.json()
-                except aiohttp.ContentTypeError:
+                body_size = 0
+                if status_code == 304:
+                    # Not modified response has no body - cached one will be used.
+                    data = dict()
+                elif not self.__JSON_CONTENT_TYPE_RE.match(response.content_type):
+                    # If VeiL ECP is not fully turned on, responses may be of the wrong type
                     logger.debug('VeiL response has wrong content type.')
                     data = dict()
-            return dict(status_code=status_code, headers=dict(headers), data=data)
+                else:
+                    raw_data = self.__decoded(response, await response.read()).strip()
+                    body_size = len(raw_data)
+                    data = self.__json_codec.loads(raw_data) if raw_data else None
+            # body_size is used by VeilCacheMemoryClient instead of the data serialization
+            return dict(status_code=status_code, headers=dict(headers), data=data,
+                        body_size=body_size)
+
+    def __decoded(self, response: aiohttp.ClientResponse, raw_data: bytes) -> bytes:
+        """Decompress response body and count wire bytes."""
+        self.__compression_stats['response_wire_bytes'] += len(raw_data)
+        decompressor = self.__compression_opts.decompressor(response.headers.get('Content-Encoding'))  # noqa: E501
+        if decompressor is not None:
+            raw_data = decompressor.decompress(raw_data) + decompressor.flush()
+        self.__compression_stats['response_bytes'] += len(raw_data)
+        return raw_data
 
     async def __api_retry_request(self, method_name: str,
                                   url: str,
@@ -330,20 +1226,29 @@ class VeilClient:
                                   params: dict,
                                   ssl: bool,
                                   json_data: Optional[dict] = None,
-                                  retry_opts: Optional[VeilRetryConfiguration] = None) -> Dict[str, str]:  # noqa: E501
-        """Log parameters and execute passed aiohttp method with retry options."""
-        # VeiL can`t decode requests witch contain extra commas
-        for argument, value in params.items():
-            if isinstance(value, str) and value[-1] == ',':
-                params[argument] = value[:-1]
+                                  retry_opts: Optional[VeilRetryConfiguration] = None,
+                                  timeout_opts: Optional[VeilTimeoutConfiguration] = None,
+                                  token_taken: bool = False,
+                                  stream: bool = False
+                                  ) -> Dict[str, str]:
+        """Log parameters and execute passed aiohttp method with retry options.
+
+        Note:
+            if stream is set response content is not read (see __open_stream).
+        """
+        params = self.__stripped(params)
         # If request retry_opts are not defined - use Class attr value.
         if not retry_opts:
             retry_opts = self.__retry_opts
         # log request
-        logger.debug('ssl: %s, url: %s, header: %s, params: %s, json: %s', self.__ssl_enabled,
-                     url, self.__headers, params, json_data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('ssl: %s, url: %s, header: %s, params: %s, json: %s',
+                         self.__ssl_enabled, url, headers, params, json_data)
         # determine aiohttp.client method to call
         aiohttp_request_method = getattr(self.__session, method_name)
+        # reuse preconfigured ssl.SSLContext instead of the aiohttp default one
+        if ssl and self.__pool_opts.ssl_context:
+            ssl = self.__pool_opts.ssl_context
         # create aiohttp.request witch can be retried.
         aiohttp_request = self.__request_context(request=aiohttp_request_method,
                                                  url=url,
@@ -351,11 +1256,157 @@ class VeilClient:
                                                  params=params,
                                                  ssl=ssl,
                                                  json_data=json_data,
-                                                 retry_opts=retry_opts)
+                                                 retry_opts=retry_opts,
+                                                 method_name=method_name,
+                                                 timeout_opts=timeout_opts,
+                                                 token_taken=token_taken)
+        if stream:
+            return await self.__open_stream(aiohttp_request)
         # execute request and fetch response data
         async with aiohttp_request as aiohttp_response:
             return await self.__fetch_response_data(aiohttp_response)
 
+    async def __open_stream(self, aiohttp_request: _RequestContext) -> Dict[str, str]:
+        """Execute request and return response data with not read decoded response content.
+
+        Note:
+            content and close function are returned only for 200 json response,
+            other responses are fetched and closed.
+        """
+        aiohttp_response = await aiohttp_request.__aenter__()
+
+        async def close():
+            await aiohttp_request.__aexit__(None, None, None)
+
+        if aiohttp_response.status != 200 or not self.__JSON_CONTENT_TYPE_RE.match(aiohttp_response.content_type):  # noqa: E501
+            try:
+                return await self.__fetch_response_data(aiohttp_response)
+            finally:
+                await close()
+        try:
+            decompressor = self.__compression_opts.decompressor(
+                aiohttp_response.headers.get('Content-Encoding'))
+        except ValueError:
+            await close()
+            raise
+        return dict(status_code=aiohttp_response.status,
+                    headers=dict(aiohttp_response.headers),
+                    content=_DecodedStreamReader(content=aiohttp_response.content,
+                                                 decompressor=decompressor,
+                                                 stats=self.__compression_stats),
+                    close=close)
+
+    def __circuit_breaker(self, url: str) -> Optional[_CircuitBreaker]:
+        """Return circuit breaker of the controller or of the url entity prefix."""
+        if not self.__circuit_breaker_opts:
+            return None
+        key = self.server_address
+        if self.__circuit_breaker_opts.per_entity:
+            path = urlsplit(url).path.lstrip('/')
+            if path.startswith('api/'):
+                path = path[4:]
+            key = path.split('/', 1)[0] + '/'
+        breaker = self.__circuit_breakers.get(key)
+        if breaker is None:
+            breaker = _CircuitBreaker(self.__circuit_breaker_opts)
+            self.__circuit_breakers[key] = breaker
+        return breaker
+
+    def __circuit_open_response(self, breaker: _CircuitBreaker) -> Dict[str, str]:
+        """Synthetic response of the request rejected by circuit breaker."""
+        detail = 'VeiL ECP {} is unavailable. Circuit breaker is open.'.format(self.server_address)  # noqa: E501
+        return dict(status_code=503,
+                    headers={'Retry-After': str(int(breaker.retry_after) + 1)},
+                    data={'errors': [{'code': '50000', 'detail': detail}]})
+
+    async def __guarded_request(self, breaker: _CircuitBreaker, request_function,
+                                **kwargs) -> Dict[str, str]:
+        """Execute request_function if circuit breaker allows it."""
+        allowed, probe = breaker.allow()
+        if not allowed:
+            return self.__circuit_open_response(breaker)
+        success = None
+        try:
+            response_data = await request_function(**kwargs)
+            success = not breaker.is_failure(response_data['status_code'])
+            return response_data
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            success = False
+            raise
+        finally:
+            breaker.record(success, probe)
+
+    async def __hedged_request(self, request_function, **kwargs) -> Dict[str, str]:
+        """Send the second request if the first response is late and return the first response.
+
+        The late request is cancelled and its connection is released.
+        """
+        hedger = self.__hedger
+        started = time.monotonic()
+        primary = asyncio.ensure_future(request_function(**kwargs))
+        tasks = {primary}
+        try:
+            if hedger.delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedger.delay)
+                if not done and hedger.allow():
+                    # the hedge is counted in the budget even if both requests fail
+                    hedger.register(hedged=True)
+                    logger.debug('Hedged request to %s is sent.', kwargs.get('url'))
+                    secondary = asyncio.ensure_future(request_function(**kwargs))
+                    tasks.add(secondary)
+                    done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    winner = done.pop()
+                    if winner.exception() is not None:
+                        # the other request can still succeed
+                        winner = secondary if winner is primary else primary
+                    response_data = await winner
+                    if winner is secondary:
+                        hedger.hedge_wins += 1
+                    # latency seen by the caller including the hedge delay
+                    hedger.record(time.monotonic() - started)
+                    return response_data
+            response_data = await primary
+            hedger.register(hedged=False)
+            hedger.record(time.monotonic() - started)
+            return response_data
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # the loser exception shouldn`t be reported as never retrieved
+                    task.exception()
+
+    async def __limited_request(self, request_function, **kwargs) -> Dict[str, str]:
+        """Execute request_function within adaptive concurrency limit."""
+        limiter = self.__concurrency_limiter
+        rate_limiter = self.__rate_limiter(kwargs['method_name'])
+        started = await limiter.acquire()
+        overloaded = False
+        cancelled = False
+        try:
+            if rate_limiter is not None:
+                # rate limiter queue time isn`t a request latency
+                await rate_limiter.acquire()
+                started = time.monotonic()
+            response_data = await request_function(token_taken=rate_limiter is not None,
+                                                   **kwargs)
+            status_code = response_data['status_code'] if response_data else 0
+            overloaded = status_code >= 500 or status_code in limiter.OVERLOAD_STATUSES
+            return response_data
+        except asyncio.CancelledError:
+            # cancelled requests (and hedged request losers) don`t change the limit
+            cancelled = True
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            overloaded = True
+            raise
+        finally:
+            if cancelled:
+                limiter.cancel()
+            else:
+                limiter.release(started=started, overloaded=overloaded)
+
     @veil_api_response
     @cached_response
     async def api_request(self,
@@ -365,33 +1416,75 @@ class VeilClient:
                           params: dict,
                           ssl: bool,
                           json_data: Optional[dict] = None,
-                          retry_opts: Optional[VeilRetryConfiguration] = None
+                          retry_opts: Optional[VeilRetryConfiguration] = None,
+                          timeout_opts: Optional[VeilTimeoutConfiguration] = None
                           ):
         """Api_retry interface.
 
         Note:
             Override me to extend standard behaviour.
         """
-        return await self.__api_retry_request(method_name=method_name,
-                                              url=url,
-                                              headers=headers,
-                                              params=params,
-                                              ssl=ssl,
-                                              json_data=json_data,
-                                              retry_opts=retry_opts)
+        # coalesced requests share the slot of adaptive concurrency limit
+        request_function = self.__api_retry_request
+        if self.__concurrency_limiter:
+            request_function = functools.partial(self.__limited_request, request_function)
+        if self.__hedger is not None and method_name == 'get':
+            request_function = functools.partial(self.__hedged_request, request_function)
+        breaker = self.__circuit_breaker(url)
+        if breaker is not None:
+            # requests are not sent to unavailable controller
+            request_function = functools.partial(self.__guarded_request, breaker,
+                                                 request_function)
+        # POST and PUT are not idempotent and must never be coalesced.
+        if self.__coalescer is not None and method_name == 'get':
+            key = self.__coalescer.request_key(method_name=method_name,
+                                               url=url,
+                                               headers=headers,
+                                               params=params,
+                                               retry_opts=retry_opts,
+                                               timeout_opts=timeout_opts)
+            return await self.__coalescer.execute(key,
+                                                  request_function,
+                                                  method_name=method_name,
+                                                  url=url,
+                                                  headers=headers,
+                                                  params=params,
+                                                  ssl=ssl,
+                                                  json_data=json_data,
+                                                  retry_opts=retry_opts,
+                                                  timeout_opts=timeout_opts)
+        return await request_function(method_name=method_name,
+                                      url=url,
+                                      headers=headers,
+                                      params=params,
+                                      ssl=ssl,
+                                      json_data=json_data,
+                                      retry_opts=retry_opts,
+                                      timeout_opts=timeout_opts)
+
+    @staticmethod
+    async def __invalidate_cache(api_object, cache_opts: VeilCacheConfiguration) -> None:
+        """Remove cached responses of the entity changed by POST or PUT request.
+
+        Note:
+            Entity url with all nested urls and entity collection url will be removed.
+        """
+        if not isinstance(cache_opts, VeilCacheConfiguration):
+            return
+        if not isinstance(api_object, VeilApiObject):
+            return
+        url_prefixes = [api_object.api_object_url] if api_object.api_object_id else list()
+        await cache_opts.invalidate(urls=[api_object.base_url], url_prefixes=url_prefixes)
 
     async def get(self, api_object, url: str,
                   extra_params: Optional[dict] = None,
                   extra_headers: Optional[dict] = None,
                   retry_opts: Optional[VeilRetryConfiguration] = None,
-                  cache_opts: Optional[VeilCacheConfiguration] = None) -> Dict[str, str]:
+                  cache_opts: Optional[VeilCacheConfiguration] = None,
+                  timeout_opts: Optional[VeilTimeoutConfiguration] = None) -> Dict[str, str]:
         """Send GET request to VeiL ECP."""
-        params = self.__params
-        if extra_params:
-            params.update(extra_params)
-        headers = self.__headers
-        if extra_headers:
-            headers.update(extra_headers)
+        params = self.__merged(self.__params, extra_params)
+        headers = self.__merged(self.__headers, extra_headers)
         if not cache_opts:
             cache_opts = self.__cache_opts
         logger.debug('%s GET request.', api_object.__class__.__name__)
@@ -402,54 +1495,97 @@ class VeilClient:
                                       params=params,
                                       ssl=self.__ssl_enabled,
                                       retry_opts=retry_opts,
-                                      cache_opts=cache_opts)
+                                      cache_opts=cache_opts,
+                                      timeout_opts=timeout_opts)
+
+    async def stream(self, api_object, url: str,
+                     extra_params: Optional[dict] = None,
+                     extra_headers: Optional[dict] = None,
+                     retry_opts: Optional[VeilRetryConfiguration] = None,
+                     chunk_size: int = 64 * 1024,
+                     timeout_opts: Optional[VeilTimeoutConfiguration] = None
+                     ) -> VeilApiResponseStream:
+        """Send GET request to VeiL ECP and return stream of list() results.
+
+        Note:
+            Streamed responses are not cached, not coalesced and not hedged.
+            Request is retried only until response headers are received.
+            Concurrency limit slot is released when response headers are received.
+        """
+        params = self.__merged(self.__params, extra_params)
+        headers = self.__merged(self.__headers, extra_headers)
+        logger.debug('%s GET stream request.', api_object.__class__.__name__)
+        request_function = self.__api_retry_request
+        if self.__concurrency_limiter:
+            request_function = functools.partial(self.__limited_request, request_function)
+        breaker = self.__circuit_breaker(url)
+        if breaker is not None:
+            request_function = functools.partial(self.__guarded_request, breaker,
+                                                 request_function)
+        response_data = await request_function(method_name='get',
+                                               url=url,
+                                               headers=headers,
+                                               params=params,
+                                               ssl=self.__ssl_enabled,
+                                               retry_opts=retry_opts,
+                                               timeout_opts=timeout_opts,
+                                               stream=True)
+        response_data.pop('body_size', None)
+        return VeilApiResponseStream(api_object=api_object,
+                                     loads=self.__json_codec.loads,
+                                     chunk_size=chunk_size,
+                                     **response_data)
 
     async def post(self, api_object,
                    url: str,
                    json_data: Optional[dict] = None,
                    extra_params: Optional[dict] = None,
                    retry_opts: Optional[VeilRetryConfiguration] = None,
-                   cache_opts: Optional[VeilCacheConfiguration] = None) -> Dict[str, str]:
+                   cache_opts: Optional[VeilCacheConfiguration] = None,
+                   timeout_opts: Optional[VeilTimeoutConfiguration] = None) -> Dict[str, str]:
         """Send POST request to VeiL ECP."""
         if isinstance(json_data, dict):
             json_data[self.__IDEMPOTENCY_BODY_KEY] = '{}'.format(uuid4())
-        params = self.__params
-        if extra_params:
-            params.update(extra_params)
+        params = self.__merged(self.__params, extra_params)
         if not cache_opts:
             cache_opts = self.__cache_opts
         logger.debug('%s POST request.', api_object.__class__.__name__)
-        return await self.api_request(api_object=api_object,
-                                      method_name='post', url=url,
-                                      headers=self.__headers,
-                                      params=params,
-                                      ssl=self.__ssl_enabled,
-                                      json_data=json_data,
-                                      retry_opts=retry_opts,
-                                      cache_opts=cache_opts)
+        response = await self.api_request(api_object=api_object,
+                                          method_name='post', url=url,
+                                          headers=self.__headers,
+                                          params=params,
+                                          ssl=self.__ssl_enabled,
+                                          json_data=json_data,
+                                          retry_opts=retry_opts,
+                                          cache_opts=cache_opts,
+                                          timeout_opts=timeout_opts)
+        await self.__invalidate_cache(api_object=api_object, cache_opts=cache_opts)
+        return response
 
     async def put(self, api_object,
                   url: str,
                   json_data: Optional[dict] = None,
                   extra_params: Optional[dict] = None,
                   retry_opts: Optional[VeilRetryConfiguration] = None,
-                  cache_opts: Optional[VeilCacheConfiguration] = None) -> Dict[str, str]:
+                  cache_opts: Optional[VeilCacheConfiguration] = None,
+                  timeout_opts: Optional[VeilTimeoutConfiguration] = None) -> Dict[str, str]:
         """Send PUT request to VeiL ECP."""
-        params = self.__params
-        if extra_params:
-            params.update(extra_params)
+        params = self.__merged(self.__params, extra_params)
         if not cache_opts:
             cache_opts = self.__cache_opts
         logger.debug('%s PUT request.', api_object.__class__.__name__)
-        return await self.api_request(api_object=api_object,
-                                      method_name='put',
-                                      url=url,
-                                      headers=self.__headers,
-                                      params=params,
-                                      ssl=self.__ssl_enabled,
-                                      json_data=json_data,
-                                      retry_opts=retry_opts,
-                                      cache_opts=cache_opts)
+        response = await self.api_request(api_object=api_object,
+                                          method_name='put',
+                                          url=url,
+                                          headers=self.__headers,
+                                          params=params,
+                                          ssl=self.__ssl_enabled,
+                                          json_data=json_data,
+                                          retry_opts=retry_opts,
+                                          cache_opts=cache_opts,
+                                          timeout_opts=timeout_opts)
+        await self.__invalidate_cache(api_object=api_object, cache_opts=cache_opts)
+        return response
 
     def domain(self,
                domain_id: Optional[str] = None,
@@ -583,24 +1719,66 @@ class VeilClientSingleton:
     def __init__(self, timeout: int = 5 * 60,
                  cache_opts: Optional[VeilCacheConfiguration] = None,
                  retry_opts: Optional[VeilRetryConfiguration] = None,
-                 url_max_length: Optional[int] = None) -> None:
+                 url_max_length: Optional[int] = None,
+                 pool_opts: Optional[VeilPoolConfiguration] = None,
+                 coalesce_requests: bool = False,
+                 json_codec: Optional[str] = None,
+                 compression_opts: Optional[VeilCompressionConfiguration] = None,
+                 rate_limit_opts: Optional[VeilRateLimitConfiguration] = None,
+                 concurrency_opts: Optional[VeilConcurrencyConfiguration] = None,
+                 retry_budget_opts: Optional[VeilRetryBudgetConfiguration] = None,
+                 circuit_breaker_opts: Optional[VeilCircuitBreakerConfiguration] = None,
+                 timeout_opts: Optional[VeilTimeoutConfiguration] = None,
+                 hedging_opts: Optional[VeilHedgingConfiguration] = None
+                 ) -> None:
         """Please see help(VeilClientSingleton) for more info."""
         self.__TIMEOUT = timeout
         self.__CACHE_OPTS = cache_opts
         self.__RETRY_OPTS = retry_opts
         self.__URL_MAX_LENGTH = url_max_length
+        self.__POOL_OPTS = pool_opts
+        self.__COALESCE_REQUESTS = coalesce_requests
+        self.__JSON_CODEC = json_codec
+        self.__COMPRESSION_OPTS = compression_opts
+        self.__RATE_LIMIT_OPTS = rate_limit_opts
+        self.__CONCURRENCY_OPTS = concurrency_opts
+        self.__RETRY_BUDGET_OPTS = retry_budget_opts
+        self.__CIRCUIT_BREAKER_OPTS = circuit_breaker_opts
+        self.__TIMEOUT_OPTS = timeout_opts
+        self.__HEDGING_OPTS = hedging_opts
 
     def add_client(self, server_address: str, token: str,
                    timeout: Optional[int] = None,
                    cache_opts: Optional[VeilCacheConfiguration] = None,
                    retry_opts: Optional[VeilRetryConfiguration] = None,
-                   url_max_length: Optional[int] = None) -> 'VeilClient':
+                   url_max_length: Optional[int] = None,
+                   pool_opts: Optional[VeilPoolConfiguration] = None,
+                   coalesce_requests: Optional[bool] = None,
+                   json_codec: Optional[str] = None,
+                   compression_opts: Optional[VeilCompressionConfiguration] = None,
+                   rate_limit_opts: Optional[VeilRateLimitConfiguration] = None,
+                   concurrency_opts: Optional[VeilConcurrencyConfiguration] = None,
+                   retry_budget_opts: Optional[VeilRetryBudgetConfiguration] = None,
+                   circuit_breaker_opts: Optional[VeilCircuitBreakerConfiguration] = None,
+                   timeout_opts: Optional[VeilTimeoutConfiguration] = None,
+                   hedging_opts: Optional[VeilHedgingConfiguration] = None
+                   ) -> 'VeilClient':
         """Create new instance of VeilClient if it is not initialized on same address.
 
         Attributes:
             server_address: VeiL server address (without protocol).
             token: VeiL auth token.
             timeout: aiohttp.ClientSession total timeout.
+            pool_opts: VeilPoolConfiguration instance.
+            coalesce_requests: coalesce identical concurrent GET requests.
+            json_codec: orjson, ujson or json.
+            compression_opts: VeilCompressionConfiguration instance.
+            rate_limit_opts: VeilRateLimitConfiguration instance.
+            concurrency_opts: VeilConcurrencyConfiguration instance.
+            retry_budget_opts: VeilRetryBudgetConfiguration instance.
+            circuit_breaker_opts: VeilCircuitBreakerConfiguration instance.
+            timeout_opts: VeilTimeoutConfiguration instance.
+            hedging_opts: VeilHedgingConfiguration instance.
         """
         if not timeout:
             timeout = self.__TIMEOUT
@@ -610,6 +1788,26 @@ class VeilClientSingleton:
             retry_opts = self.__RETRY_OPTS
         if not url_max_length:
             url_max_length = self.__URL_MAX_LENGTH
+        if not pool_opts:
+            pool_opts = self.__POOL_OPTS
+        if coalesce_requests is None:
+            coalesce_requests = self.__COALESCE_REQUESTS
+        if not json_codec:
+            json_codec = self.__JSON_CODEC
+        if not compression_opts:
+            compression_opts = self.__COMPRESSION_OPTS
+        if not rate_limit_opts:
+            rate_limit_opts = self.__RATE_LIMIT_OPTS
+        if not concurrency_opts:
+            concurrency_opts = self.__CONCURRENCY_OPTS
+        if not retry_budget_opts:
+            retry_budget_opts = self.__RETRY_BUDGET_OPTS
+        if not circuit_breaker_opts:
+            circuit_breaker_opts = self.__CIRCUIT_BREAKER_OPTS
+        if not timeout_opts:
+            timeout_opts = self.__TIMEOUT_OPTS
+        if not hedging_opts:
+            hedging_opts = self.__HEDGING_OPTS
         # create a new client if not exist before.
         if server_address not in self.__client_instances:
             instance = VeilClient(server_address=server_address, token=token,
@@ -618,7 +1816,17 @@ class VeilClientSingleton:
                                   ujson_=True,
                                   cache_opts=cache_opts,
                                   retry_opts=retry_opts,
-                                  url_max_length=url_max_length)
+                                  url_max_length=url_max_length,
+                                  pool_opts=pool_opts,
+                                  coalesce_requests=coalesce_requests,
+                                  json_codec=json_codec,
+                                  compression_opts=compression_opts,
+                                  rate_limit_opts=rate_limit_opts,
+                                  concurrency_opts=concurrency_opts,
+                                  retry_budget_opts=retry_budget_opts,
+                                  circuit_breaker_opts=circuit_breaker_opts,
+                                  timeout_opts=timeout_opts,
+                                  hedging_opts=hedging_opts)
             self.__client_instances[server_address] = instance
         return self.__client_instances[server_address]
 